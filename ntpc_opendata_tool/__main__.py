@@ -0,0 +1,11 @@
+"""
+套件執行入口
+
+讓 ``python -m ntpc_opendata_tool`` 直接啟動 MCP 服務器，
+取代先前在 server.py 內修改 sys.path 的啟動方式。
+"""
+from ntpc_opendata_tool.server import logger, mcp, SERVER_UUID
+
+if __name__ == "__main__":
+    logger.info("MCP 服務器 UUID: %s", SERVER_UUID)
+    mcp.run()
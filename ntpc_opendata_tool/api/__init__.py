@@ -11,6 +11,15 @@ from ntpc_opendata_tool.api.traffic import TrafficAPI
 from ntpc_opendata_tool.api.bike import BikeAPI
 from ntpc_opendata_tool.api.misc_traffic import MiscTrafficAPI
 
+# 共用的 API 單例：兩個服務器入口共用同一組實例與同一個
+# OpenDataClient，整個行程只維護一份連線池
+client = OpenDataClient()
+bus_api = BusAPI(client)
+traffic_api = TrafficAPI(client)
+parking_api = ParkingAPI(client)
+bike_api = BikeAPI(client)
+misc_traffic_api = MiscTrafficAPI(client)
+
 __all__ = [
     'OpenDataClient',
     'APIError',
@@ -18,5 +27,11 @@ __all__ = [
     'ParkingAPI',
     'TrafficAPI',
     'BikeAPI',
-    'MiscTrafficAPI'
+    'MiscTrafficAPI',
+    'client',
+    'bus_api',
+    'traffic_api',
+    'parking_api',
+    'bike_api',
+    'misc_traffic_api',
 ] 
\ No newline at end of file
@@ -5,8 +5,10 @@
 """
 import logging
 import math
+import time
 from typing import Dict, List, Any, Optional, Union
 from ntpc_opendata_tool.api.client import OpenDataClient, APIError
+from ntpc_opendata_tool.utils.geo import GridIndex, haversine_distance
 from ntpc_opendata_tool.models.bike import (
     YouBikeStation, BikeRackDistrict, BikeRackMRT, BikeLane,
     parse_youbike_stations, parse_bike_rack_districts, parse_bike_rack_mrt, parse_bike_lanes
@@ -28,6 +30,9 @@ class BikeAPI:
             client: OpenDataClient 實例，如未提供則自動創建
         """
         self.client = client or OpenDataClient()
+        # 近鄰查詢用的站點網格索引，依 _INDEX_TTL 週期重建
+        self._station_index: Optional[GridIndex] = None
+        self._station_index_time = 0.0
     
     def _process_response(self, response: Any) -> List[Dict[str, Any]]:
         """處理 API 回應
@@ -58,7 +63,7 @@ class BikeAPI:
         """
         try:
             params = {"area": area} if area else None
-            logger.info(f"查詢 YouBike2.0 站點資訊: {area if area else '所有區域'}")
+            logger.info("查詢 YouBike2.0 站點資訊: %s", area if area else '所有區域')
             
             response = self.client.get_by_resource_id(
                 self.client.RESOURCE_IDS["youbike"],
@@ -67,7 +72,7 @@ class BikeAPI:
             data = self._process_response(response)
             return parse_youbike_stations(data)
         except APIError as e:
-            logger.error(f"查詢 YouBike 站點資訊失敗: {e.message}")
+            logger.error("查詢 YouBike 站點資訊失敗: %s", e.message)
             raise
     
     def get_bike_racks(self, area: Optional[str] = None, near_mrt: bool = False) -> List[Union[BikeRackDistrict, BikeRackMRT]]:
@@ -88,7 +93,7 @@ class BikeAPI:
             
             resource_id = self.client.RESOURCE_IDS["bike_racks_mrt"] if near_mrt else self.client.RESOURCE_IDS["bike_racks_districts"]
             
-            logger.info(f"查詢{'捷運站週邊' if near_mrt else ''}自行車架資訊: {area if area else '所有區域'}")
+            logger.info("查詢%s自行車架資訊: %s", '捷運站週邊' if near_mrt else '', area if area else '所有區域')
             
             response = self.client.get_by_resource_id(
                 resource_id,
@@ -101,7 +106,7 @@ class BikeAPI:
             else:
                 return parse_bike_rack_districts(data)
         except APIError as e:
-            logger.error(f"查詢自行車架資訊失敗: {e.message}")
+            logger.error("查詢自行車架資訊失敗: %s", e.message)
             raise
     
     def get_bike_lanes(self) -> List[BikeLane]:
@@ -122,9 +127,37 @@ class BikeAPI:
             data = self._process_response(response)
             return parse_bike_lanes(data)
         except APIError as e:
-            logger.error(f"查詢自行車道建設統計資料失敗: {e.message}")
+            logger.error("查詢自行車道建設統計資料失敗: %s", e.message)
             raise
             
+    # 站點網格索引的重建週期（秒），與服務層的即時資料快取一致
+    _INDEX_TTL = 60.0
+
+    def _get_station_index(self) -> GridIndex:
+        """取得（必要時重建）YouBike 站點的網格索引
+
+        索引在 _INDEX_TTL 內重複使用，期間的近鄰查詢只需檢視
+        查詢半徑覆蓋到的格子，毋須對全部站點重算距離。
+
+        Returns:
+            已填入所有站點的網格索引
+
+        Raises:
+            APIError: 當 API 請求失敗時
+        """
+        now = time.monotonic()
+        if (
+            self._station_index is None
+            or now - self._station_index_time > self._INDEX_TTL
+        ):
+            index = GridIndex(cell_size_m=500.0)
+            for station in self.get_youbike_stations():
+                if station.latitude and station.longitude:
+                    index.add(station.latitude, station.longitude, station)
+            self._station_index = index
+            self._station_index_time = now
+        return self._station_index
+
     def find_nearby_youbike(self, lat: float, lon: float, radius: int = 500) -> List[YouBikeStation]:
         """查詢附近的 YouBike 站點
         
@@ -140,35 +173,19 @@ class BikeAPI:
             APIError: 當 API 請求失敗時
         """
         try:
-            logger.info(f"查詢位置 ({lat}, {lon}) 半徑 {radius}m 內的 YouBike 站點")
-            
-            # 獲取所有站點
-            all_stations = self.get_youbike_stations()
+            logger.info("查詢位置 (%s, %s) 半徑 %sm 內的 YouBike 站點", lat, lon, radius)
             
-            # 計算距離並篩選
-            nearby_stations = []
-            
-            for station in all_stations:
-                try:
-                    station_lat = station.latitude
-                    station_lon = station.longitude
-                    
-                    if station_lat and station_lon:
-                        # 計算距離
-                        distance = self._calculate_distance(lat, lon, station_lat, station_lon)
-                        
-                        if distance <= radius:
-                            # 設置距離屬性
-                            station.distance = int(distance)
-                            nearby_stations.append(station)
-                except (ValueError, TypeError):
-                    continue
-            
-            # 按距離排序
-            return sorted(nearby_stations, key=lambda x: x.distance or 999999)
+            # 由網格索引取得半徑內的候選站點與距離；索引內的站點
+            # 物件會被多次查詢共用，距離寫在複本上，不改動快取狀態
+            nearby = self._get_station_index().query_radius(lat, lon, radius)
+
+            return [
+                station.model_copy(update={"distance": int(distance)})
+                for distance, station in sorted(nearby, key=lambda t: t[0])
+            ]
             
         except APIError as e:
-            logger.error(f"查詢附近 YouBike 站點失敗: {e.message}")
+            logger.error("查詢附近 YouBike 站點失敗: %s", e.message)
             raise
     
     def _calculate_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -183,23 +200,7 @@ class BikeAPI:
         Returns:
             兩點間的距離（公尺）
         """
-        # 地球半徑（公尺）
-        R = 6371000
-        
-        # 將經緯度轉換為弧度
-        lat1_rad = math.radians(lat1)
-        lon1_rad = math.radians(lon1)
-        lat2_rad = math.radians(lat2)
-        lon2_rad = math.radians(lon2)
-        
-        # Haversine 公式
-        dlon = lon2_rad - lon1_rad
-        dlat = lat2_rad - lat1_rad
-        a = math.sin(dlat/2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon/2)**2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-        distance = R * c
-        
-        return distance
+        return haversine_distance(lat1, lon1, lat2, lon2)
             
     def get_available_youbikes(self, min_bikes: int = 1) -> List[YouBikeStation]:
         """獲取有可借車輛的 YouBike 站點
@@ -214,7 +215,7 @@ class BikeAPI:
             APIError: 當 API 請求失敗時
         """
         try:
-            logger.info(f"查詢至少有 {min_bikes} 輛可借車輛的 YouBike 站點")
+            logger.info("查詢至少有 %s 輛可借車輛的 YouBike 站點", min_bikes)
             
             all_stations = self.get_youbike_stations()
             
@@ -228,5 +229,5 @@ class BikeAPI:
             return sorted(available_stations, key=lambda x: x.available_bikes, reverse=True)
             
         except APIError as e:
-            logger.error(f"查詢有可借車輛的 YouBike 站點失敗: {e.message}")
+            logger.error("查詢有可借車輛的 YouBike 站點失敗: %s", e.message)
             raise 
\ No newline at end of file
@@ -61,7 +61,7 @@ class BusAPI:
             if route_name:
                 params["nameZh"] = route_name
                 
-            logger.info(f"查詢公車路線: {route_name if route_name else '所有路線'} (頁碼: {page}, 每頁筆數: {size})")
+            logger.info("查詢公車路線: %s (頁碼: %s, 每頁筆數: %s)", route_name if route_name else '所有路線', page, size)
             
             response = self.client.get_by_resource_id(
                 self.client.RESOURCE_IDS["bus_routes"],
@@ -69,7 +69,7 @@ class BusAPI:
             )
             return self._process_response(response)
         except APIError as e:
-            logger.error(f"查詢公車路線失敗: {e.message}")
+            logger.error("查詢公車路線失敗: %s", e.message)
             raise
     
     def get_stops(self, route_name: str) -> List[Dict[str, Any]]:
@@ -85,7 +85,7 @@ class BusAPI:
             APIError: 當 API 請求失敗時
         """
         try:
-            logger.info(f"查詢路線 {route_name} 的站點資訊")
+            logger.info("查詢路線 %s 的站點資訊", route_name)
             
             response = self.client.get_by_resource_id(
                 self.client.RESOURCE_IDS["bus_stops"],
@@ -93,7 +93,7 @@ class BusAPI:
             )
             return self._process_response(response)
         except APIError as e:
-            logger.error(f"查詢站點資訊失敗: {e.message}")
+            logger.error("查詢站點資訊失敗: %s", e.message)
             raise
     
     def _get_route_id(self, route_name: str) -> str:
@@ -127,7 +127,7 @@ class BusAPI:
             APIError: 當 API 請求失敗時
         """
         try:
-            logger.info(f"查詢路線 {route_name} 的預計到站時間 {f'(站點: {stop_name})' if stop_name else ''}")
+            logger.info("查詢路線 %s 的預計到站時間 %s", route_name, f'(站點: {stop_name})' if stop_name else '')
             
             route_id = self._get_route_id(route_name)
             params = {"RouteID": route_id}
@@ -146,7 +146,7 @@ class BusAPI:
             )
             return self._process_response(response)
         except APIError as e:
-            logger.error(f"查詢預計到站時間失敗: {e.message}")
+            logger.error("查詢預計到站時間失敗: %s", e.message)
             raise
     
     def get_all_stops(self) -> List[Dict[str, Any]]:
@@ -166,7 +166,7 @@ class BusAPI:
             )
             return self._process_response(response)
         except APIError as e:
-            logger.error(f"查詢所有站點資訊失敗: {e.message}")
+            logger.error("查詢所有站點資訊失敗: %s", e.message)
             raise
     
     def search_by_stop(self, stop_name: str) -> List[Dict[str, Any]]:
@@ -182,28 +182,23 @@ class BusAPI:
             APIError: 當 API 請求失敗時
         """
         try:
-            logger.info(f"搜尋經過站點 {stop_name} 的路線")
+            logger.info("搜尋經過站點 %s 的路線", stop_name)
             
             all_stops = self.get_all_stops()
             matching_stops = [stop for stop in all_stops if stop_name in stop["nameZh"]]
             
             if not matching_stops:
                 return []
-            
-            # 獲取經過這些站點的路線
+
+            # 獲取經過這些站點的路線：一次撈回整份路線清單，
+            # 再以路線 ID 集合在本地過濾，取代逐一路線發送請求
+            # 的 N 次往返（熱門站點可能對應數十條路線）
             route_ids = set(stop["routeId"] for stop in matching_stops)
-            routes = []
-            
-            for route_id in route_ids:
-                route_info = self.client.get_by_resource_id(
-                    self.client.RESOURCE_IDS["bus_routes"],
-                    params={"Id": route_id}
-                )
-                routes.extend(self._process_response(route_info))
-            
-            return routes
+            all_routes = self.get_routes(size=10000)
+
+            return [route for route in all_routes if route.get("Id") in route_ids]
         except APIError as e:
-            logger.error(f"搜尋站點路線失敗: {e.message}")
+            logger.error("搜尋站點路線失敗: %s", e.message)
             raise
     
     def get_real_time_by_route(self, route_name: str) -> List[Dict[str, Any]]:
@@ -219,7 +214,7 @@ class BusAPI:
             APIError: 當 API 請求失敗時
         """
         try:
-            logger.info(f"查詢路線 {route_name} 的公車即時位置")
+            logger.info("查詢路線 %s 的公車即時位置", route_name)
             
             route_id = self._get_route_id(route_name)
             
@@ -231,7 +226,7 @@ class BusAPI:
             )
             return self._process_response(response)
         except APIError as e:
-            logger.error(f"查詢公車即時位置失敗: {e.message}")
+            logger.error("查詢公車即時位置失敗: %s", e.message)
             raise
     
     def get_bus_operators(self) -> List[Dict[str, Any]]:
@@ -251,7 +246,7 @@ class BusAPI:
             )
             return self._process_response(response)
         except APIError as e:
-            logger.error(f"查詢公車業者資訊失敗: {e.message}")
+            logger.error("查詢公車業者資訊失敗: %s", e.message)
             raise
     
     def get_bus_transfer_discounts(self) -> List[Dict[str, Any]]:
@@ -271,7 +266,7 @@ class BusAPI:
             )
             return self._process_response(response)
         except APIError as e:
-            logger.error(f"查詢公車轉乘優惠資訊失敗: {e.message}")
+            logger.error("查詢公車轉乘優惠資訊失敗: %s", e.message)
             raise
     
     def get_route_info(self, route_type: Optional[str] = None, route_name: Optional[str] = None) -> List[Dict[str, Any]]:
@@ -288,7 +283,7 @@ class BusAPI:
             APIError: 當 API 請求失敗時
         """
         try:
-            logger.info(f"查詢公車路線說明及示意圖 {f'(類型: {route_type})' if route_type else ''} {f'(路線: {route_name})' if route_name else ''}")
+            logger.info("查詢公車路線說明及示意圖 %s %s", f'(類型: {route_type})' if route_type else '', f'(路線: {route_name})' if route_name else '')
             
             resource_id = self.client.RESOURCE_IDS["bus_route_info"]
             
@@ -317,5 +312,5 @@ class BusAPI:
             )
             return self._process_response(response)
         except APIError as e:
-            logger.error(f"查詢公車路線說明及示意圖失敗: {e.message}")
+            logger.error("查詢公車路線說明及示意圖失敗: %s", e.message)
             raise 
\ No newline at end of file
@@ -6,6 +6,7 @@
 import os
 import logging
 from typing import Dict, Any, Optional, Union
+import orjson
 import requests
 from dotenv import load_dotenv
 
@@ -78,7 +79,20 @@ class OpenDataClient:
         "taxi_service": "e5a6cf13-d00f-4680-ace4-826bfc3f4506",  # 新北市境內計程車客運服務業經營派遣業務業者相關資訊
         "towing_storage": "1994216a-ea78-4ca5-b876-0ff45bf9d78f",  # 新北市拖吊保管場資訊
     }
-    
+
+    # 停車資料家族的 kind 鑑別值：依資源 ID 注入回應列，
+    # 供 models.parking.parse_parking 的標籤聯集分派使用
+    RESOURCE_KINDS = {
+        RESOURCE_IDS["parking_lots"]: "parking_lot",
+        RESOURCE_IDS["parking_realtime"]: "parking_availability",
+        RESOURCE_IDS["roadside_parking"]: "roadside_parking",
+        RESOURCE_IDS["motorcycle_parking"]: "motorcycle_parking",
+        RESOURCE_IDS["women_children_parking"]: "women_children_parking",
+        RESOURCE_IDS["disabled_parking"]: "disabled_parking",
+        RESOURCE_IDS["typhoon_parking"]: "typhoon_parking",
+        RESOURCE_IDS["roadside_parking_management"]: "roadside_parking_management",
+    }
+
     def __init__(self):
         """初始化 API 客戶端
         
@@ -87,8 +101,15 @@ class OpenDataClient:
         self.base_url = os.getenv("NTPC_OPENDATA_BASE_URL", "https://data.ntpc.gov.tw/api/datasets")
         self.api_key = os.getenv("NTPC_OPENDATA_API_KEY", "")
         self.timeout = int(os.getenv("REQUEST_TIMEOUT", "30"))
-        
-        logger.info(f"初始化 OpenDataClient，基礎 URL: {self.base_url}")
+
+        # 使用 Session 重用連線：對同一主機的重複請求走 keep-alive
+        # 連線池，省去每次請求的 TCP/TLS 握手成本
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=20)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        logger.info("初始化 OpenDataClient，基礎 URL: %s", self.base_url)
     
     def _build_headers(self) -> Dict[str, str]:
         """構建 HTTP 請求標頭
@@ -115,14 +136,16 @@ class OpenDataClient:
         """
         try:
             response.raise_for_status()
-            return response.json()
+            # 以 orjson 解析原始位元組：大批量回應（YouBike 站點、
+            # 全部停車場等）的解碼速度明顯優於標準函式庫
+            return orjson.loads(response.content)
         except requests.exceptions.HTTPError as e:
             error_msg = f"HTTP 錯誤: {e}"
             logger.error(error_msg)
             try:
-                error_data = response.json()
-                logger.error(f"API 錯誤詳情: {error_data}")
-            except ValueError:
+                error_data = orjson.loads(response.content)
+                logger.error("API 錯誤詳情: %s", error_data)
+            except orjson.JSONDecodeError:
                 error_data = response.text
             
             raise APIError(
@@ -169,10 +192,10 @@ class OpenDataClient:
                     processed_params[key] = value
             params = processed_params
         
-        logger.debug(f"發送 GET 請求至 {url}，參數: {params}")
+        logger.debug("發送 GET 請求至 %s，參數: %s", url, params)
         
         try:
-            response = requests.get(
+            response = self.session.get(
                 url, 
                 params=params, 
                 headers=headers, 
@@ -184,6 +207,56 @@ class OpenDataClient:
             logger.error(error_msg)
             raise APIError(message=error_msg)
     
+    def get_raw(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> bytes:
+        """發送 GET 請求並回傳未解碼的 JSON 位元組
+
+        供大批量資料路徑搭配模型層的 JSON 直解函數
+        （如 ``parse_parking_lots_json``）使用，跳過中介的
+        dict 列表解析。
+
+        Args:
+            endpoint: API 端點路徑
+            params: 查詢參數
+
+        Returns:
+            原始回應位元組
+
+        Raises:
+            APIError: 當請求失敗時
+        """
+        endpoint = endpoint.strip()
+
+        if endpoint in self.RESOURCE_IDS.values():
+            url = f"{self.base_url}/{endpoint}/json"
+        else:
+            url = f"{self.base_url}/{endpoint}"
+
+        headers = self._build_headers()
+
+        logger.debug("發送 GET 請求至 %s（原始位元組），參數: %s", url, params)
+
+        try:
+            response = self.session.get(
+                url,
+                params=params,
+                headers=headers,
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            return response.content
+        except requests.exceptions.HTTPError as e:
+            error_msg = f"HTTP 錯誤: {e}"
+            logger.error(error_msg)
+            raise APIError(
+                message=error_msg,
+                status_code=response.status_code,
+                response=response.text
+            )
+        except requests.exceptions.RequestException as e:
+            error_msg = f"請求異常: {str(e)}"
+            logger.error(error_msg)
+            raise APIError(message=error_msg)
+
     def get_by_resource_id(self, resource_id: str, params: Optional[Dict[str, Any]] = None) -> Any:
         """使用資源 ID 發送 GET 請求
         
@@ -200,8 +273,19 @@ class OpenDataClient:
         """
         if resource_id not in self.RESOURCE_IDS.values():
             raise ValueError(f"無效的資源 ID: {resource_id}")
-        
-        return self.get(f"{resource_id}/json", params)
+
+        response = self.get(f"{resource_id}/json", params)
+
+        # 停車資料家族的回應列注入 kind 鑑別欄位，實際資料
+        # 本身不帶此欄位，標籤聯集的分派仰賴這裡補上
+        kind = self.RESOURCE_KINDS.get(resource_id)
+        if kind is not None:
+            rows = response.get("data") if isinstance(response, dict) else response
+            if isinstance(rows, list):
+                for row in rows:
+                    if isinstance(row, dict):
+                        row.setdefault("kind", kind)
+        return response
     
     def post(self, endpoint: str, data: Optional[Dict[str, Any]] = None, 
              json_data: Optional[Dict[str, Any]] = None) -> Any:
@@ -221,10 +305,10 @@ class OpenDataClient:
         url = f"{self.base_url}/{endpoint}"
         headers = self._build_headers()
         
-        logger.debug(f"發送 POST 請求至 {url}")
+        logger.debug("發送 POST 請求至 %s", url)
         
         try:
-            response = requests.post(
+            response = self.session.post(
                 url, 
                 data=data, 
                 json=json_data,
@@ -62,7 +62,7 @@ class MiscTrafficAPI:
             data = self._process_response(response)
             return parse_taxi_services(data)
         except APIError as e:
-            logger.error(f"查詢計程車客運服務業者資訊失敗: {e.message}")
+            logger.error("查詢計程車客運服務業者資訊失敗: %s", e.message)
             raise
     
     def get_towing_storage_info(self) -> List[TowingStorage]:
@@ -83,7 +83,7 @@ class MiscTrafficAPI:
             data = self._process_response(response)
             return parse_towing_storage_info(data)
         except APIError as e:
-            logger.error(f"查詢拖吊保管場資訊失敗: {e.message}")
+            logger.error("查詢拖吊保管場資訊失敗: %s", e.message)
             raise
     
     def get_traffic_impact_assessment(self) -> List[TrafficImpactAssessment]:
@@ -104,7 +104,7 @@ class MiscTrafficAPI:
             data = self._process_response(response)
             return parse_traffic_impact_assessment(data)
         except APIError as e:
-            logger.error(f"查詢建築物交通影響評估資訊失敗: {e.message}")
+            logger.error("查詢建築物交通影響評估資訊失敗: %s", e.message)
             raise
             
     def find_nearest_towing_storage(self, lat: float, lon: float) -> Optional[TowingStorage]:
@@ -121,7 +121,7 @@ class MiscTrafficAPI:
             APIError: 當 API 請求失敗時
         """
         try:
-            logger.info(f"查詢位置 ({lat}, {lon}) 最近的拖吊保管場")
+            logger.info("查詢位置 (%s, %s) 最近的拖吊保管場", lat, lon)
             
             # 獲取所有拖吊保管場
             all_storage = self.get_towing_storage_info()
@@ -151,7 +151,7 @@ class MiscTrafficAPI:
                 return None
             
         except APIError as e:
-            logger.error(f"查詢最近拖吊保管場失敗: {e.message}")
+            logger.error("查詢最近拖吊保管場失敗: %s", e.message)
             raise
     
     def _calculate_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -197,7 +197,7 @@ class MiscTrafficAPI:
             APIError: 當 API 請求失敗時
         """
         try:
-            logger.info(f"以關鍵字 '{keyword}' 搜尋計程車服務")
+            logger.info("以關鍵字 '%s' 搜尋計程車服務", keyword)
             
             all_services = self.get_taxi_services()
             
@@ -211,5 +211,5 @@ class MiscTrafficAPI:
             return result
             
         except APIError as e:
-            logger.error(f"搜尋計程車服務失敗: {e.message}")
+            logger.error("搜尋計程車服務失敗: %s", e.message)
             raise 
\ No newline at end of file
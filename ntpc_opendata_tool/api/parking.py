@@ -4,6 +4,7 @@
 提供停車場資訊、即時車位數等查詢功能。
 """
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional, Union
 from ntpc_opendata_tool.api.client import OpenDataClient, APIError
 
@@ -53,7 +54,7 @@ class ParkingAPI:
         """
         try:
             params = {"AREA": area} if area else None
-            logger.info(f"查詢路外公共停車場資訊: {area if area else '所有區域'}")
+            logger.info("查詢路外公共停車場資訊: %s", area if area else '所有區域')
             
             response = self.client.get_by_resource_id(
                 self.client.RESOURCE_IDS["parking_lots"],
@@ -61,31 +62,36 @@ class ParkingAPI:
             )
             return self._process_response(response)
         except APIError as e:
-            logger.error(f"查詢路外公共停車場資訊失敗: {e.message}")
+            logger.error("查詢路外公共停車場資訊失敗: %s", e.message)
             raise
     
-    def get_parking_lots_by_type(self, lot_type: str) -> List[Dict[str, Any]]:
+    def get_parking_lots_by_type(self, lot_type: str, area: Optional[str] = None) -> List[Dict[str, Any]]:
         """依類型獲取路外公共停車場資訊
-        
+
         Args:
             lot_type: 停車場類型
-            
+            area: 行政區，可選。提供時由上游一併過濾，
+                避免撈回全部資料後在本地掃描
+
         Returns:
             停車場資訊列表
-            
+
         Raises:
             APIError: 當 API 請求失敗時
         """
         try:
-            logger.info(f"查詢類型為 {lot_type} 的路外公共停車場")
-            
+            params = {"TYPE": lot_type}
+            if area:
+                params["AREA"] = area
+            logger.info("查詢類型為 %s 的路外公共停車場 %s", lot_type, f'(區域: {area})' if area else '')
+
             response = self.client.get_by_resource_id(
                 self.client.RESOURCE_IDS["parking_lots"],
-                params={"TYPE": lot_type}
+                params=params
             )
             return self._process_response(response)
         except APIError as e:
-            logger.error(f"查詢路外公共停車場類型失敗: {e.message}")
+            logger.error("查詢路外公共停車場類型失敗: %s", e.message)
             raise
     
     def get_parking_lot_detail(self, parking_id: str) -> Dict[str, Any]:
@@ -101,7 +107,7 @@ class ParkingAPI:
             APIError: 當 API 請求失敗時或找不到停車場時
         """
         try:
-            logger.info(f"查詢停車場 {parking_id} 的詳細資訊")
+            logger.info("查詢停車場 %s 的詳細資訊", parking_id)
             
             response = self.client.get_by_resource_id(
                 self.client.RESOURCE_IDS["parking_lots"],
@@ -114,7 +120,7 @@ class ParkingAPI:
             
             return data[0]
         except APIError as e:
-            logger.error(f"查詢停車場詳細資訊失敗: {e.message}")
+            logger.error("查詢停車場詳細資訊失敗: %s", e.message)
             raise
     
     def get_available_parking_lots(self, min_spaces: int = 1, area: Optional[str] = None) -> List[Dict[str, Any]]:
@@ -131,34 +137,36 @@ class ParkingAPI:
             APIError: 當 API 請求失敗時
         """
         try:
-            logger.info(f"查詢有至少 {min_spaces} 個空位的停車場 {f'(區域: {area})' if area else ''}")
-            
-            # 獲取即時空位資訊
-            availability_response = self.client.get_by_resource_id(
-                self.client.RESOURCE_IDS["parking_realtime"]
-            )
-            availability_data = self._process_response(availability_response)
-            
+            logger.info("查詢有至少 %s 個空位的停車場 %s", min_spaces, f'(區域: {area})' if area else '')
+
+            params = {}
+            if area:
+                params["AREA"] = area
+
+            # 即時空位與停車場基本資訊互不相依，以執行緒並行抓取，
+            # 等待時間由兩次往返的總和降為其中較長者
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                availability_future = pool.submit(
+                    self.client.get_by_resource_id,
+                    self.client.RESOURCE_IDS["parking_realtime"]
+                )
+                lots_future = pool.submit(
+                    self.client.get_by_resource_id,
+                    self.client.RESOURCE_IDS["parking_lots"],
+                    params
+                )
+                availability_data = self._process_response(availability_future.result())
+                lots_data = self._process_response(lots_future.result())
+
             # 篩選有足夠空位的停車場 ID
             available_ids = [
-                item["ID"] for item in availability_data 
+                item["ID"] for item in availability_data
                 if item.get("AVAILABLECAR", "0").isdigit() and int(item["AVAILABLECAR"]) >= min_spaces
             ]
-            
+
             if not available_ids:
                 return []
             
-            # 獲取停車場基本資訊
-            params = {}
-            if area:
-                params["AREA"] = area
-            
-            lots_response = self.client.get_by_resource_id(
-                self.client.RESOURCE_IDS["parking_lots"],
-                params=params
-            )
-            lots_data = self._process_response(lots_response)
-            
             # 合併資訊
             result = []
             availability_dict = {item["ID"]: item["AVAILABLECAR"] for item in availability_data}
@@ -171,7 +179,7 @@ class ParkingAPI:
             
             return result
         except APIError as e:
-            logger.error(f"查詢有空位的停車場失敗: {e.message}")
+            logger.error("查詢有空位的停車場失敗: %s", e.message)
             raise
     
     def get_roadside_parking_spaces(self, area: Optional[str] = None) -> List[Dict[str, Any]]:
@@ -188,7 +196,7 @@ class ParkingAPI:
         """
         try:
             params = {"AreaCode": area} if area else None
-            logger.info(f"查詢路邊停車空位資訊: {area if area else '所有區域'}")
+            logger.info("查詢路邊停車空位資訊: %s", area if area else '所有區域')
             
             response = self.client.get_by_resource_id(
                 self.client.RESOURCE_IDS["roadside_parking"],
@@ -196,7 +204,7 @@ class ParkingAPI:
             )
             return self._process_response(response)
         except APIError as e:
-            logger.error(f"查詢路邊停車空位資訊失敗: {e.message}")
+            logger.error("查詢路邊停車空位資訊失敗: %s", e.message)
             raise
     
     def get_nearby_parking_lots(self, lat: float, lon: float, radius: int = 500) -> List[Dict[str, Any]]:
@@ -214,7 +222,7 @@ class ParkingAPI:
             APIError: 當 API 請求失敗時
         """
         try:
-            logger.info(f"查詢位置 ({lat}, {lon}) 附近 {radius} 公尺內的停車場")
+            logger.info("查詢位置 (%s, %s) 附近 %s 公尺內的停車場", lat, lon, radius)
             
             # 獲取所有停車場
             response = self.client.get_by_resource_id(
@@ -224,27 +232,25 @@ class ParkingAPI:
             
             # 計算距離並篩選
             import math
-            
-            def calculate_distance(lat1: float, lon1: float, lat2: str, lon2: str) -> float:
+
+            def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
                 """計算兩點間的距離（公尺）"""
-                try:
-                    lat2_float = float(lat2)
-                    lon2_float = float(lon2)
-                    
-                    # 使用簡化版的 Haversine 公式計算距離
-                    R = 6371000  # 地球半徑（公尺）
-                    dlat = math.radians(lat2_float - lat1)
-                    dlon = math.radians(lon2_float - lon1)
-                    a = (math.sin(dlat/2) * math.sin(dlat/2) +
-                         math.cos(math.radians(lat1)) * math.cos(math.radians(lat2_float)) *
-                         math.sin(dlon/2) * math.sin(dlon/2))
-                    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-                    distance = R * c
-                    
-                    return distance
-                except (ValueError, TypeError):
-                    return float('inf')  # 無法計算距離時返回無限大
-            
+                # 使用簡化版的 Haversine 公式計算距離
+                R = 6371000  # 地球半徑（公尺）
+                dlat = math.radians(lat2 - lat1)
+                dlon = math.radians(lon2 - lon1)
+                a = (math.sin(dlat/2) * math.sin(dlat/2) +
+                     math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) *
+                     math.sin(dlon/2) * math.sin(dlon/2))
+                c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
+                return R * c
+
+            # 先以經緯度包圍盒粗篩再算 Haversine：矩形比較遠比
+            # 三角函數便宜，可先剔除絕大多數的遠處停車場。
+            # 經度邊界略放寬 1%，避免邊緣點被粗篩誤判
+            dlat_deg = radius / 111320.0
+            dlon_deg = radius / (111320.0 * math.cos(math.radians(lat))) * 1.01
+
             result = []
             for lot in lots_data:
                 # 使用 TW97 座標系統的座標
@@ -252,10 +258,18 @@ class ParkingAPI:
                     # 這裡需要將 TW97 座標轉換為 WGS84 座標
                     # 由於轉換較複雜，這裡僅使用近似值進行示範
                     # 實際應用中應使用專業的座標轉換庫
-                    
+                    try:
+                        lot_lat = float(lot["TW97Y"])
+                        lot_lon = float(lot["TW97X"])
+                    except (ValueError, TypeError):
+                        continue
+
+                    if abs(lot_lat - lat) > dlat_deg or abs(lot_lon - lon) > dlon_deg:
+                        continue
+
                     # 簡化處理：直接使用 TW97 座標計算距離
-                    distance = calculate_distance(lat, lon, lot["TW97Y"], lot["TW97X"])
-                    
+                    distance = calculate_distance(lat, lon, lot_lat, lot_lon)
+
                     if distance <= radius:
                         lot_copy = lot.copy()
                         lot_copy["distance"] = distance
@@ -266,7 +280,7 @@ class ParkingAPI:
             
             return result
         except APIError as e:
-            logger.error(f"查詢附近停車場失敗: {e.message}")
+            logger.error("查詢附近停車場失敗: %s", e.message)
             raise
     
     def get_motorcycle_parking(self, area: Optional[str] = None) -> List[Dict[str, Any]]:
@@ -283,7 +297,7 @@ class ParkingAPI:
         """
         try:
             params = {"area": area} if area else None
-            logger.info(f"查詢機車停車彎資訊: {area if area else '所有區域'}")
+            logger.info("查詢機車停車彎資訊: %s", area if area else '所有區域')
             
             response = self.client.get_by_resource_id(
                 self.client.RESOURCE_IDS["motorcycle_parking"],
@@ -291,7 +305,7 @@ class ParkingAPI:
             )
             return self._process_response(response)
         except APIError as e:
-            logger.error(f"查詢機車停車彎資訊失敗: {e.message}")
+            logger.error("查詢機車停車彎資訊失敗: %s", e.message)
             raise
     
     def get_women_children_parking(self, area: Optional[str] = None) -> List[Dict[str, Any]]:
@@ -308,7 +322,7 @@ class ParkingAPI:
         """
         try:
             params = {"area": area} if area else None
-            logger.info(f"查詢婦幼停車位資訊: {area if area else '所有區域'}")
+            logger.info("查詢婦幼停車位資訊: %s", area if area else '所有區域')
             
             response = self.client.get_by_resource_id(
                 self.client.RESOURCE_IDS["women_children_parking"],
@@ -316,7 +330,7 @@ class ParkingAPI:
             )
             return self._process_response(response)
         except APIError as e:
-            logger.error(f"查詢婦幼停車位資訊失敗: {e.message}")
+            logger.error("查詢婦幼停車位資訊失敗: %s", e.message)
             raise
     
     def get_disabled_parking(self, area: Optional[str] = None) -> List[Dict[str, Any]]:
@@ -333,7 +347,7 @@ class ParkingAPI:
         """
         try:
             params = {"zone": area} if area else None
-            logger.info(f"查詢身心障礙停車格資訊: {area if area else '所有區域'}")
+            logger.info("查詢身心障礙停車格資訊: %s", area if area else '所有區域')
             
             response = self.client.get_by_resource_id(
                 self.client.RESOURCE_IDS["disabled_parking"],
@@ -341,7 +355,7 @@ class ParkingAPI:
             )
             return self._process_response(response)
         except APIError as e:
-            logger.error(f"查詢身心障礙停車格資訊失敗: {e.message}")
+            logger.error("查詢身心障礙停車格資訊失敗: %s", e.message)
             raise
     
     def get_typhoon_parking(self) -> List[Dict[str, Any]]:
@@ -361,7 +375,7 @@ class ParkingAPI:
             )
             return self._process_response(response)
         except APIError as e:
-            logger.error(f"查詢颱風期間可供停車路段資訊失敗: {e.message}")
+            logger.error("查詢颱風期間可供停車路段資訊失敗: %s", e.message)
             raise
     
     def get_roadside_parking_management(self) -> List[Dict[str, Any]]:
@@ -381,5 +395,5 @@ class ParkingAPI:
             )
             return self._process_response(response)
         except APIError as e:
-            logger.error(f"查詢路邊收費停管場資訊失敗: {e.message}")
+            logger.error("查詢路邊收費停管場資訊失敗: %s", e.message)
             raise 
\ No newline at end of file
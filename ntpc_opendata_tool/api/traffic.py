@@ -60,7 +60,7 @@ class TrafficAPI:
         try:
             params = {"district": district} if district else None
             
-            logger.info(f"查詢交通監視器: {district or '所有區域'}")
+            logger.info("查詢交通監視器: %s", district or '所有區域')
             
             response = self.client.get_by_resource_id(
                 self.client.RESOURCE_IDS["traffic_cameras"],
@@ -69,7 +69,7 @@ class TrafficAPI:
             data = self._process_response(response)
             return parse_traffic_cameras(data)
         except APIError as e:
-            logger.error(f"查詢交通監視器失敗: {e.message}")
+            logger.error("查詢交通監視器失敗: %s", e.message)
             raise
     
     def get_etag_locations(self, district: Optional[str] = None) -> List[ETagLocation]:
@@ -86,7 +86,7 @@ class TrafficAPI:
         """
         try:
             params = {"district": district} if district else None
-            logger.info(f"查詢 ETag 設備位置: {district if district else '所有區域'}")
+            logger.info("查詢 ETag 設備位置: %s", district if district else '所有區域')
             
             response = self.client.get_by_resource_id(
                 self.client.RESOURCE_IDS["traffic_etag"],
@@ -95,7 +95,7 @@ class TrafficAPI:
             data = self._process_response(response)
             return parse_etag_locations(data)
         except APIError as e:
-            logger.error(f"查詢 ETag 設備位置失敗: {e.message}")
+            logger.error("查詢 ETag 設備位置失敗: %s", e.message)
             raise
     
     def get_height_limit_info(self, area: Optional[str] = None, road: Optional[str] = None) -> List[HeightLimit]:
@@ -118,7 +118,7 @@ class TrafficAPI:
             if road:
                 params["road1"] = road
             
-            logger.info(f"查詢交通限高資訊: {area or ''} {road or ''}")
+            logger.info("查詢交通限高資訊: %s %s", area or '', road or '')
             
             response = self.client.get_by_resource_id(
                 self.client.RESOURCE_IDS["traffic_height_limit"],
@@ -127,7 +127,7 @@ class TrafficAPI:
             data = self._process_response(response)
             return parse_height_limits(data)
         except APIError as e:
-            logger.error(f"查詢交通限高資訊失敗: {e.message}")
+            logger.error("查詢交通限高資訊失敗: %s", e.message)
             raise
     
     def get_traffic_impact_assessment(self) -> List[TrafficImpactAssessment]:
@@ -148,7 +148,7 @@ class TrafficAPI:
             data = self._process_response(response)
             return parse_traffic_impact_assessments(data)
         except APIError as e:
-            logger.error(f"查詢交通影響評估資訊失敗: {e.message}")
+            logger.error("查詢交通影響評估資訊失敗: %s", e.message)
             raise
     
     def get_nearby_traffic_cameras(self, lat: float, lon: float, radius: int = 1000) -> List[TrafficCamera]:
@@ -166,7 +166,7 @@ class TrafficAPI:
             APIError: 當 API 請求失敗時
         """
         try:
-            logger.info(f"查詢位置 ({lat}, {lon}) 附近 {radius}m 內的交通監視器")
+            logger.info("查詢位置 (%s, %s) 附近 %sm 內的交通監視器", lat, lon, radius)
             
             # 獲取所有交通監視器
             all_cameras = self.get_traffic_cameras()
@@ -184,7 +184,7 @@ class TrafficAPI:
             
             return nearby_cameras
         except APIError as e:
-            logger.error(f"查詢附近交通監視器失敗: {e.message}")
+            logger.error("查詢附近交通監視器失敗: %s", e.message)
             raise
     
     def _calculate_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -3,10 +3,10 @@
 
 提供簡便的命令列介面，讓使用者可以查詢新北市交通相關資訊。
 """
-import json
 import sys
 from typing import Optional, Any, Dict, List
 
+import orjson
 import typer
 from rich.console import Console
 from rich.table import Table
@@ -42,7 +42,7 @@ def main(
         False, "--version", "-v", help="顯示版本信息", callback=version_callback
     ),
     format: str = typer.Option(
-        "table", "--format", "-f", help="輸出格式: table, json, text"
+        "table", "--format", "-f", help="輸出格式: table, json, ndjson, text"
     ),
     verbose: bool = typer.Option(
         False, "--verbose", help="顯示詳細日誌信息"
@@ -63,9 +63,24 @@ def format_output(data: Any, format_type: str = "table", table_title: Optional[s
     
     Args:
         data: 要輸出的資料
-        format_type: 輸出格式（table、json 或 text）
+        format_type: 輸出格式（table、json、ndjson 或 text）
         table_title: 表格標題（僅在 format_type 為 table 時有效）
     """
+    if format_type == "ndjson":
+        # 逐列輸出 NDJSON：不先在記憶體組出完整文件，大批量資料的
+        # 峰值記憶體維持單列大小，下游管線也能邊讀邊解析
+        out = sys.stdout.buffer
+        for item in data if isinstance(data, list) else [data]:
+            if hasattr(item, 'model_dump'):
+                try:
+                    item = item.model_dump()
+                except AttributeError:
+                    item = item.__dict__
+            out.write(orjson.dumps(item))
+            out.write(b"\n")
+        out.flush()
+        return
+
     # 處理 Pydantic 模型
     if isinstance(data, list) and len(data) > 0 and hasattr(data[0], 'model_dump_json'):
         # Pydantic v2 列表
@@ -85,7 +100,8 @@ def format_output(data: Any, format_type: str = "table", table_title: Optional[s
     
     if format_type == "json":
         if isinstance(data, (dict, list)):
-            return console.print(json.dumps(data, ensure_ascii=False, indent=2))
+            # orjson 序列化較標準函式庫快數倍，預設即輸出非 ASCII 字元
+            return console.print(orjson.dumps(data, option=orjson.OPT_INDENT_2).decode())
         else:
             return console.print(str(data))
     
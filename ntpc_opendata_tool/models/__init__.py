@@ -5,8 +5,10 @@
 """
 
 from .bus import (
-    BusRoute, BusStop, BusEstimatedTime, BusRealTime,
-    parse_bus_routes, parse_bus_stops, parse_bus_estimated_times, parse_bus_real_times
+    BusRoute, BusRouteCore, BusRouteRecord, BusStop, BusEstimatedTime, BusRealTime,
+    parse_bus_routes, parse_bus_route_cores, parse_bus_stops,
+    parse_bus_estimated_times, parse_bus_real_times,
+    parse_bus_routes_json, parse_bus_stops_json
 )
 from .traffic import (
     TrafficStatus, ConstructionInfo, TrafficCamera, TrafficIncident,
@@ -16,8 +18,10 @@ from .traffic import (
     parse_traffic_impact_assessments as parse_traffic_impact_assessments_traffic
 )
 from .parking import (
-    ParkingLot, ParkingAvailability, RoadsideParking, MotorcycleParking,
+    ParkingLot, ParkingLotRecord, ParkingAvailability, RoadsideParking, MotorcycleParking,
     WomenChildrenParking, DisabledParking, TyphoonParking, RoadsideParkingManagement,
+    ParkingRecord, parse_parking,
+    parse_parking_lots_json, parse_roadside_parking_json,
     parse_parking_lots, parse_parking_availability, parse_roadside_parking,
     parse_motorcycle_parking, parse_women_children_parking, parse_disabled_parking,
     parse_typhoon_parking, parse_roadside_parking_management
@@ -33,8 +37,10 @@ from .misc_traffic import (
 
 __all__ = [
     # 公車相關模型
-    "BusRoute", "BusStop", "BusEstimatedTime", "BusRealTime",
-    "parse_bus_routes", "parse_bus_stops", "parse_bus_estimated_times", "parse_bus_real_times",
+    "BusRoute", "BusRouteCore", "BusRouteRecord", "BusStop", "BusEstimatedTime", "BusRealTime",
+    "parse_bus_routes", "parse_bus_route_cores", "parse_bus_stops",
+    "parse_bus_estimated_times", "parse_bus_real_times",
+    "parse_bus_routes_json", "parse_bus_stops_json",
     
     # 交通相關模型
     "TrafficStatus", "ConstructionInfo", "TrafficCamera", "TrafficIncident",
@@ -44,8 +50,10 @@ __all__ = [
     "parse_traffic_impact_assessments_traffic",
     
     # 停車場相關模型
-    "ParkingLot", "ParkingAvailability", "RoadsideParking", "MotorcycleParking",
+    "ParkingLot", "ParkingLotRecord", "ParkingAvailability", "RoadsideParking", "MotorcycleParking",
     "WomenChildrenParking", "DisabledParking", "TyphoonParking", "RoadsideParkingManagement",
+    "ParkingRecord", "parse_parking",
+    "parse_parking_lots_json", "parse_roadside_parking_json",
     "parse_parking_lots", "parse_parking_availability", "parse_roadside_parking",
     "parse_motorcycle_parking", "parse_women_children_parking", "parse_disabled_parking",
     "parse_typhoon_parking", "parse_roadside_parking_management",
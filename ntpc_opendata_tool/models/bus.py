@@ -3,194 +3,284 @@
 
 用於解析和格式化公車相關 API 的回應數據。
 """
-from typing import List, Optional, Dict, Any
+import sys
+from typing import Optional
+from dataclasses import dataclass, fields
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+
+from ntpc_opendata_tool.models._codegen import make_json_parser, make_parser
+
+# 預先 intern 欄位別名字串，讓 pydantic-core 驗證時的 dict 查表
+# 走快取雜湊與指標比較的快速路徑
+_A = sys.intern
 
 
 class BusRoute(BaseModel):
     """公車路線模型"""
-    id: str = Field(..., alias="Id")
-    provider_id: str = Field(..., alias="providerId")
-    provider_name: str = Field(..., alias="providerName")
-    name_zh: str = Field(..., alias="nameZh")
-    name_en: str = Field(..., alias="nameEn")
-    path_attribute_id: str = Field(..., alias="pathAttributeId")
-    path_attribute_name: str = Field(..., alias="pathAttributeName")
-    path_attribute_ename: str = Field(..., alias="pathAttributeEname")
-    build_period: Optional[str] = Field(None, alias="buildPeriod")
-    departure_zh: str = Field(..., alias="departureZh")
-    departure_en: str = Field(..., alias="departureEn")
-    destination_zh: str = Field(..., alias="destinationZh")
-    destination_en: str = Field(..., alias="destinationEn")
-    real_sequence: Optional[str] = Field(None, alias="realSequence")
-    distance: Optional[str] = Field(None, alias="distance")
-    go_first_bus_time: Optional[str] = Field(None, alias="goFirstBusTime")
-    back_first_bus_time: Optional[str] = Field(None, alias="backFirstBusTime")
-    go_last_bus_time: Optional[str] = Field(None, alias="goLastBusTime")
-    back_last_bus_time: Optional[str] = Field(None, alias="backLastBusTime")
-    peak_headway: Optional[str] = Field(None, alias="peakHeadway")
-    holiday_headway_desc: Optional[str] = Field(None, alias="holidayHeadwayDesc")
-    off_peak_headway: Optional[str] = Field(None, alias="offPeakHeadway")
-    bus_time_desc: Optional[str] = Field(None, alias="busTimeDesc")
-    holiday_go_first_bus_time: Optional[str] = Field(None, alias="holidayGoFirstBusTime")
-    holiday_back_first_bus_time: Optional[str] = Field(None, alias="holidayBackFirstBusTime")
-    holiday_go_last_bus_time: Optional[str] = Field(None, alias="holidayGoLastBusTime")
-    holiday_back_last_bus_time: Optional[str] = Field(None, alias="holidayBackLastBusTime")
-    holiday_bus_time_desc: Optional[str] = Field(None, alias="holidayBusTimeDesc")
-    headway_desc: Optional[str] = Field(None, alias="headwayDesc")
-    holiday_peak_headway: Optional[str] = Field(None, alias="holidayPeakHeadway")
-    holiday_off_peak_headway: Optional[str] = Field(None, alias="holidayOffPeakHeadway")
-    segment_buffer_zh: Optional[str] = Field(None, alias="segmentBufferZh")
-    segment_buffer_en: Optional[str] = Field(None, alias="segmentBufferEn")
-    ticket_price_description_zh: Optional[str] = Field(None, alias="ticketPriceDescriptionZh")
-    ticket_price_description_en: Optional[str] = Field(None, alias="ticketPriceDescriptionEn")
+    id: str = Field(..., alias=_A("Id"))
+    provider_id: str = Field(..., alias=_A("providerId"))
+    provider_name: str = Field(..., alias=_A("providerName"))
+    name_zh: str = Field(..., alias=_A("nameZh"))
+    name_en: str = Field(..., alias=_A("nameEn"))
+    path_attribute_id: str = Field(..., alias=_A("pathAttributeId"))
+    path_attribute_name: str = Field(..., alias=_A("pathAttributeName"))
+    path_attribute_ename: str = Field(..., alias=_A("pathAttributeEname"))
+    build_period: Optional[str] = Field(None, alias=_A("buildPeriod"))
+    departure_zh: str = Field(..., alias=_A("departureZh"))
+    departure_en: str = Field(..., alias=_A("departureEn"))
+    destination_zh: str = Field(..., alias=_A("destinationZh"))
+    destination_en: str = Field(..., alias=_A("destinationEn"))
+    real_sequence: Optional[str] = Field(None, alias=_A("realSequence"))
+    distance: Optional[str] = Field(None, alias=_A("distance"))
+    go_first_bus_time: Optional[str] = Field(None, alias=_A("goFirstBusTime"))
+    back_first_bus_time: Optional[str] = Field(None, alias=_A("backFirstBusTime"))
+    go_last_bus_time: Optional[str] = Field(None, alias=_A("goLastBusTime"))
+    back_last_bus_time: Optional[str] = Field(None, alias=_A("backLastBusTime"))
+    peak_headway: Optional[str] = Field(None, alias=_A("peakHeadway"))
+    holiday_headway_desc: Optional[str] = Field(None, alias=_A("holidayHeadwayDesc"))
+    off_peak_headway: Optional[str] = Field(None, alias=_A("offPeakHeadway"))
+    bus_time_desc: Optional[str] = Field(None, alias=_A("busTimeDesc"))
+    holiday_go_first_bus_time: Optional[str] = Field(None, alias=_A("holidayGoFirstBusTime"))
+    holiday_back_first_bus_time: Optional[str] = Field(None, alias=_A("holidayBackFirstBusTime"))
+    holiday_go_last_bus_time: Optional[str] = Field(None, alias=_A("holidayGoLastBusTime"))
+    holiday_back_last_bus_time: Optional[str] = Field(None, alias=_A("holidayBackLastBusTime"))
+    holiday_bus_time_desc: Optional[str] = Field(None, alias=_A("holidayBusTimeDesc"))
+    headway_desc: Optional[str] = Field(None, alias=_A("headwayDesc"))
+    holiday_peak_headway: Optional[str] = Field(None, alias=_A("holidayPeakHeadway"))
+    holiday_off_peak_headway: Optional[str] = Field(None, alias=_A("holidayOffPeakHeadway"))
+    segment_buffer_zh: Optional[str] = Field(None, alias=_A("segmentBufferZh"))
+    segment_buffer_en: Optional[str] = Field(None, alias=_A("segmentBufferEn"))
+    ticket_price_description_zh: Optional[str] = Field(None, alias=_A("ticketPriceDescriptionZh"))
+    ticket_price_description_en: Optional[str] = Field(None, alias=_A("ticketPriceDescriptionEn"))
     
     class Config:
         populate_by_name = True
+        frozen = True
+
+
+class BusRouteCore(BaseModel):
+    """公車路線精簡模型（熱欄位）
+
+    僅保留典型「列出路線」查詢會用到的欄位；班距、假日時刻等
+    較少使用的冷欄位留在原始資料中，透過屬性延遲讀取。逐筆掃描
+    整份路線清單時，每筆資料的工作集因此大幅縮小。
+    """
+    id: str = Field(..., alias=_A("Id"))
+    provider_name: str = Field(..., alias=_A("providerName"))
+    name_zh: str = Field(..., alias=_A("nameZh"))
+    name_en: str = Field(..., alias=_A("nameEn"))
+    departure_zh: str = Field(..., alias=_A("departureZh"))
+    destination_zh: str = Field(..., alias=_A("destinationZh"))
+
+    _raw: dict = PrivateAttr(default_factory=dict)
+
+    class Config:
+        populate_by_name = True
+        frozen = True
+
+    @classmethod
+    def from_raw(cls, item: dict) -> "BusRouteCore":
+        """從 API 原始資料建立精簡模型並保留冷欄位來源"""
+        core = cls.model_validate(item)
+        core._raw = item
+        return core
+
+    def to_full(self) -> BusRoute:
+        """需要完整欄位時，還原為全欄位的 `BusRoute` 模型"""
+        return BusRoute.model_validate(self._raw)
+
+    # 冷欄位：時刻表相關資訊於存取時才從原始資料讀取
+    @property
+    def go_first_bus_time(self) -> Optional[str]:
+        return self._raw.get("goFirstBusTime")
+
+    @property
+    def go_last_bus_time(self) -> Optional[str]:
+        return self._raw.get("goLastBusTime")
+
+    @property
+    def back_first_bus_time(self) -> Optional[str]:
+        return self._raw.get("backFirstBusTime")
+
+    @property
+    def back_last_bus_time(self) -> Optional[str]:
+        return self._raw.get("backLastBusTime")
+
+    @property
+    def holiday_go_first_bus_time(self) -> Optional[str]:
+        return self._raw.get("holidayGoFirstBusTime")
+
+    @property
+    def holiday_go_last_bus_time(self) -> Optional[str]:
+        return self._raw.get("holidayGoLastBusTime")
+
+    @property
+    def holiday_back_first_bus_time(self) -> Optional[str]:
+        return self._raw.get("holidayBackFirstBusTime")
+
+    @property
+    def holiday_back_last_bus_time(self) -> Optional[str]:
+        return self._raw.get("holidayBackLastBusTime")
+
+
+@dataclass(slots=True, frozen=True)
+class BusRouteRecord:
+    """公車路線的輕量儲存表示
+
+    供快取、批次處理等內部流程使用的不可變資料類別。欄位內容
+    已經過 `BusRoute` 驗證，因此重建時不需再支付 pydantic 的
+    驗證成本；`slots=True` 也能大幅降低每筆資料的記憶體用量。
+    """
+    id: str
+    provider_id: str
+    provider_name: str
+    name_zh: str
+    name_en: str
+    path_attribute_id: str
+    path_attribute_name: str
+    path_attribute_ename: str
+    departure_zh: str
+    departure_en: str
+    destination_zh: str
+    destination_en: str
+    build_period: Optional[str] = None
+    real_sequence: Optional[str] = None
+    distance: Optional[str] = None
+    go_first_bus_time: Optional[str] = None
+    back_first_bus_time: Optional[str] = None
+    go_last_bus_time: Optional[str] = None
+    back_last_bus_time: Optional[str] = None
+    peak_headway: Optional[str] = None
+    holiday_headway_desc: Optional[str] = None
+    off_peak_headway: Optional[str] = None
+    bus_time_desc: Optional[str] = None
+    holiday_go_first_bus_time: Optional[str] = None
+    holiday_back_first_bus_time: Optional[str] = None
+    holiday_go_last_bus_time: Optional[str] = None
+    holiday_back_last_bus_time: Optional[str] = None
+    holiday_bus_time_desc: Optional[str] = None
+    headway_desc: Optional[str] = None
+    holiday_peak_headway: Optional[str] = None
+    holiday_off_peak_headway: Optional[str] = None
+    segment_buffer_zh: Optional[str] = None
+    segment_buffer_en: Optional[str] = None
+    ticket_price_description_zh: Optional[str] = None
+    ticket_price_description_en: Optional[str] = None
+
+    @classmethod
+    def from_model(cls, model: BusRoute) -> "BusRouteRecord":
+        """從已驗證的 `BusRoute` 模型建立儲存表示"""
+        return cls(**model.model_dump())
+
+    def to_model(self) -> BusRoute:
+        """還原為 `BusRoute` 模型（跳過重複驗證）"""
+        return BusRoute.model_construct(
+            **{f.name: getattr(self, f.name) for f in fields(self)}
+        )
 
 
 class BusStop(BaseModel):
     """公車站點模型"""
-    id: str = Field(..., alias="Id")
-    route_id: str = Field(..., alias="routeId")
-    name_zh: str = Field(..., alias="nameZh")
-    name_en: str = Field(..., alias="nameEn")
-    seq_no: str = Field(..., alias="seqNo")
-    pgp: str = Field(..., alias="pgp")
-    go_back: str = Field(..., alias="goBack")
-    longitude: str = Field(..., alias="longitude")
-    latitude: str = Field(..., alias="latitude")
-    address: Optional[str] = Field(None, alias="address")
-    stop_location_id: str = Field(..., alias="stopLocationId")
-    show_lon: str = Field(..., alias="showLon")
-    show_lat: str = Field(..., alias="showLat")
-    vector: Optional[str] = Field(None, alias="vector")
+    id: str = Field(..., alias=_A("Id"))
+    route_id: str = Field(..., alias=_A("routeId"))
+    name_zh: str = Field(..., alias=_A("nameZh"))
+    name_en: str = Field(..., alias=_A("nameEn"))
+    seq_no: str = Field(..., alias=_A("seqNo"))
+    pgp: str = Field(..., alias=_A("pgp"))
+    go_back: str = Field(..., alias=_A("goBack"))
+    longitude: str = Field(..., alias=_A("longitude"))
+    latitude: str = Field(..., alias=_A("latitude"))
+    address: Optional[str] = Field(None, alias=_A("address"))
+    stop_location_id: str = Field(..., alias=_A("stopLocationId"))
+    show_lon: str = Field(..., alias=_A("showLon"))
+    show_lat: str = Field(..., alias=_A("showLat"))
+    vector: Optional[str] = Field(None, alias=_A("vector"))
     
     class Config:
         populate_by_name = True
+        frozen = True
 
 
 class BusEstimatedTime(BaseModel):
     """公車預計到站時間模型"""
-    route_id: str = Field(..., alias="RouteID")
-    stop_id: str = Field(..., alias="StopID")
-    estimate_time: str = Field(..., alias="EstimateTime")
-    go_back: str = Field(..., alias="GoBack")
+    route_id: str = Field(..., alias=_A("RouteID"))
+    stop_id: str = Field(..., alias=_A("StopID"))
+    estimate_time: str = Field(..., alias=_A("EstimateTime"))
+    go_back: str = Field(..., alias=_A("GoBack"))
     
     class Config:
         populate_by_name = True
+        frozen = True
 
 
 class BusRealTime(BaseModel):
     """公車即時位置模型"""
-    plate_number: str = Field(..., alias="plateNumber")
-    route_id: str = Field(..., alias="routeId")
-    route_name: str = Field(..., alias="routeName")
+    plate_number: str = Field(..., alias=_A("plateNumber"))
+    route_id: str = Field(..., alias=_A("routeId"))
+    route_name: str = Field(..., alias=_A("routeName"))
     direction: int
     longitude: float
     latitude: float
     speed: Optional[float] = None
     azimuth: Optional[float] = None  # 方位角
     status: Optional[str] = None  # 狀態，如「行駛中」、「停靠站」等
-    updated_at: Optional[datetime] = Field(None, alias="updatedAt")
+    updated_at: Optional[datetime] = Field(None, alias=_A("updatedAt"))
     
     class Config:
         populate_by_name = True
+        frozen = True
 
 
 class BusOperator(BaseModel):
     """公車業者模型"""
-    id: str = Field(..., alias="Id")
-    name: str = Field(..., alias="name")
-    phone: Optional[str] = Field(None, alias="phone")
-    email: Optional[str] = Field(None, alias="email")
-    website: Optional[str] = Field(None, alias="website")
-    address: Optional[str] = Field(None, alias="address")
+    id: str = Field(..., alias=_A("Id"))
+    name: str = Field(..., alias=_A("name"))
+    phone: Optional[str] = Field(None, alias=_A("phone"))
+    email: Optional[str] = Field(None, alias=_A("email"))
+    website: Optional[str] = Field(None, alias=_A("website"))
+    address: Optional[str] = Field(None, alias=_A("address"))
     
     class Config:
         populate_by_name = True
+        frozen = True
 
 
 class BusRouteInfo(BaseModel):
     """公車路線說明模型"""
-    id: str = Field(..., alias="Id")
-    route_name: str = Field(..., alias="routeName")
-    route_type: Optional[str] = Field(None, alias="routeType")
-    route_map_url: Optional[str] = Field(None, alias="routeMapUrl")
-    description: Optional[str] = Field(None, alias="description")
+    id: str = Field(..., alias=_A("Id"))
+    route_name: str = Field(..., alias=_A("routeName"))
+    route_type: Optional[str] = Field(None, alias=_A("routeType"))
+    route_map_url: Optional[str] = Field(None, alias=_A("routeMapUrl"))
+    description: Optional[str] = Field(None, alias=_A("description"))
     
     class Config:
         populate_by_name = True
+        frozen = True
 
 
-def parse_bus_routes(data: List[Dict[str, Any]]) -> List[BusRoute]:
-    """解析公車路線資料
-    
-    Args:
-        data: API 回應的原始資料
-        
-    Returns:
-        解析後的公車路線物件列表
-    """
-    return [BusRoute.model_validate(item) for item in data]
-
-
-def parse_bus_stops(data: List[Dict[str, Any]]) -> List[BusStop]:
-    """解析公車站點資料
-    
-    Args:
-        data: API 回應的原始資料
-        
-    Returns:
-        解析後的公車站點物件列表
-    """
-    return [BusStop.model_validate(item) for item in data]
+def parse_bus_route_cores(data: list) -> "list[BusRouteCore]":
+    """解析公車路線資料為精簡模型
 
-
-def parse_bus_estimated_times(data: List[Dict[str, Any]]) -> List[BusEstimatedTime]:
-    """解析公車預計到站時間資料
-    
     Args:
         data: API 回應的原始資料
-        
-    Returns:
-        解析後的公車預計到站時間物件列表
-    """
-    return [BusEstimatedTime.model_validate(item) for item in data]
-
 
-def parse_bus_real_times(data: List[Dict[str, Any]]) -> List[BusRealTime]:
-    """解析公車即時位置資料
-    
-    Args:
-        data: API 回應的原始資料
-        
     Returns:
-        解析後的公車即時位置物件列表
+        解析後的公車路線精簡模型列表
     """
-    return [BusRealTime.model_validate(item) for item in data]
-
+    return [BusRouteCore.from_raw(item) for item in data]
 
-def parse_bus_operators(data: List[Dict[str, Any]]) -> List[BusOperator]:
-    """解析公車業者資料
-    
-    Args:
-        data: API 回應的原始資料
-        
-    Returns:
-        解析後的公車業者物件列表
-    """
-    return [BusOperator.model_validate(item) for item in data]
 
+# 批次解析函數由 make_parser 產生，介面與原手寫版本相同：
+# 接收 API 回應的原始資料列表，回傳解析後的模型物件列表。
+parse_bus_routes = make_parser(BusRoute)
+parse_bus_stops = make_parser(BusStop)
+parse_bus_estimated_times = make_parser(BusEstimatedTime)
+parse_bus_real_times = make_parser(BusRealTime)
+parse_bus_operators = make_parser(BusOperator)
+parse_bus_route_info = make_parser(BusRouteInfo)
 
-def parse_bus_route_info(data: List[Dict[str, Any]]) -> List[BusRouteInfo]:
-    """解析公車路線說明資料
-    
-    Args:
-        data: API 回應的原始資料
-        
-    Returns:
-        解析後的公車路線說明物件列表
-    """
-    return [BusRouteInfo.model_validate(item) for item in data] 
\ No newline at end of file
+# 大批量資料的 JSON 直解版本：搭配 OpenDataClient.get_raw 使用，
+# 由 pydantic-core 直接解析回應位元組，跳過中介的 dict 列表。
+parse_bus_routes_json = make_json_parser(BusRoute)
+parse_bus_stops_json = make_json_parser(BusStop)
\ No newline at end of file
@@ -3,63 +3,113 @@
 
 用於解析和格式化停車場相關 API 的回應數據。
 """
-from typing import List, Optional, Dict, Any
+import sys
+from typing import Annotated, List, Literal, Optional, Union
+from dataclasses import dataclass, fields
 from datetime import datetime, time
 from pydantic import BaseModel, Field
 
+from ntpc_opendata_tool.models._codegen import get_adapter, make_json_parser, make_parser
+
+# 預先 intern 欄位別名字串，讓 pydantic-core 驗證時的 dict 查表
+# 走快取雜湊與指標比較的快速路徑
+_A = sys.intern
+
 
 class ParkingLot(BaseModel):
     """路外公共停車場模型"""
-    id: str = Field(..., alias="ID")
-    area: str = Field(..., alias="AREA")
-    name: str = Field(..., alias="NAME")
-    type: str = Field(..., alias="TYPE")
-    summary: str = Field(..., alias="SUMMARY")
-    address: str = Field(..., alias="ADDRESS")
-    tel: Optional[str] = Field(None, alias="TEL")
-    payex: Optional[str] = Field(None, alias="PAYEX")
-    service_time: Optional[str] = Field(None, alias="SERVICETIME")
-    tw97x: Optional[str] = Field(None, alias="TW97X")
-    tw97y: Optional[str] = Field(None, alias="TW97Y")
-    total_car: Optional[str] = Field(None, alias="TOTALCAR")
-    total_motor: Optional[str] = Field(None, alias="TOTALMOTOR")
-    total_bike: Optional[str] = Field(None, alias="TOTALBIKE")
+    id: str = Field(..., alias=_A("ID"))
+    area: str = Field(..., alias=_A("AREA"))
+    name: str = Field(..., alias=_A("NAME"))
+    type: str = Field(..., alias=_A("TYPE"))
+    summary: str = Field(..., alias=_A("SUMMARY"))
+    address: str = Field(..., alias=_A("ADDRESS"))
+    tel: Optional[str] = Field(None, alias=_A("TEL"))
+    payex: Optional[str] = Field(None, alias=_A("PAYEX"))
+    service_time: Optional[str] = Field(None, alias=_A("SERVICETIME"))
+    tw97x: Optional[str] = Field(None, alias=_A("TW97X"))
+    tw97y: Optional[str] = Field(None, alias=_A("TW97Y"))
+    total_car: int = Field(0, alias=_A("TOTALCAR"))
+    total_motor: int = Field(0, alias=_A("TOTALMOTOR"))
+    total_bike: int = Field(0, alias=_A("TOTALBIKE"))
+    kind: Literal["parking_lot"] = "parking_lot"
     
     class Config:
         populate_by_name = True
+        frozen = True
+
+
+@dataclass(slots=True, frozen=True)
+class ParkingLotRecord:
+    """路外公共停車場的輕量儲存表示
+
+    供快取、批次處理等內部流程使用的不可變資料類別。欄位內容
+    已經過 `ParkingLot` 驗證，因此重建時不需再支付 pydantic 的
+    驗證成本；`slots=True` 也能大幅降低每筆資料的記憶體用量。
+    """
+    id: str
+    area: str
+    name: str
+    type: str
+    summary: str
+    address: str
+    tel: Optional[str] = None
+    payex: Optional[str] = None
+    service_time: Optional[str] = None
+    tw97x: Optional[str] = None
+    tw97y: Optional[str] = None
+    total_car: int = 0
+    total_motor: int = 0
+    total_bike: int = 0
+    kind: str = "parking_lot"
+
+    @classmethod
+    def from_model(cls, model: ParkingLot) -> "ParkingLotRecord":
+        """從已驗證的 `ParkingLot` 模型建立儲存表示"""
+        return cls(**model.model_dump())
+
+    def to_model(self) -> ParkingLot:
+        """還原為 `ParkingLot` 模型（跳過重複驗證）"""
+        return ParkingLot.model_construct(
+            **{f.name: getattr(self, f.name) for f in fields(self)}
+        )
 
 
 class ParkingAvailability(BaseModel):
     """停車場即時空位模型"""
-    id: str = Field(..., alias="ID")
-    available_car: str = Field(..., alias="AVAILABLECAR")
+    id: str = Field(..., alias=_A("ID"))
+    available_car: int = Field(0, alias=_A("AVAILABLECAR"))
+    kind: Literal["parking_availability"] = "parking_availability"
     
     class Config:
         populate_by_name = True
+        frozen = True
 
 
 class RoadsideParking(BaseModel):
     """路邊停車空位模型"""
-    id: str = Field(..., alias="ID")
-    cell_id: str = Field(..., alias="CELLID")
-    name: str = Field(..., alias="NAME")
-    day: str = Field(..., alias="DAY")
-    hour: str = Field(..., alias="HOUR")
-    pay: str = Field(..., alias="PAY")
-    pay_cash: str = Field(..., alias="PAYCASH")
-    memo: Optional[str] = Field(None, alias="MEMO")
-    road_id: str = Field(..., alias="ROADID")
-    road_name: str = Field(..., alias="ROADNAME")
-    cell_status: str = Field(..., alias="CELLSTATUS")
-    is_now_cash: str = Field(..., alias="ISNOWCASH")
-    parking_status: str = Field(..., alias="ParkingStatus")
-    latitude: str = Field(..., alias="latitude")
-    longitude: str = Field(..., alias="longitude")
-    county_code: str = Field(..., alias="CountyCode")
-    area_code: str = Field(..., alias="AreaCode")
+    id: str = Field(..., alias=_A("ID"))
+    cell_id: str = Field(..., alias=_A("CELLID"))
+    name: str = Field(..., alias=_A("NAME"))
+    day: str = Field(..., alias=_A("DAY"))
+    hour: str = Field(..., alias=_A("HOUR"))
+    pay: str = Field(..., alias=_A("PAY"))
+    pay_cash: str = Field(..., alias=_A("PAYCASH"))
+    memo: Optional[str] = Field(None, alias=_A("MEMO"))
+    road_id: str = Field(..., alias=_A("ROADID"))
+    road_name: str = Field(..., alias=_A("ROADNAME"))
+    cell_status: str = Field(..., alias=_A("CELLSTATUS"))
+    is_now_cash: str = Field(..., alias=_A("ISNOWCASH"))
+    parking_status: str = Field(..., alias=_A("ParkingStatus"))
+    latitude: str = Field(..., alias=_A("latitude"))
+    longitude: str = Field(..., alias=_A("longitude"))
+    county_code: str = Field(..., alias=_A("CountyCode"))
+    area_code: str = Field(..., alias=_A("AreaCode"))
+    kind: Literal["roadside_parking"] = "roadside_parking"
     
     class Config:
         populate_by_name = True
+        frozen = True
 
 
 class MotorcycleParking(BaseModel):
@@ -68,10 +118,12 @@ class MotorcycleParking(BaseModel):
     areacode: str
     address: str
     motorcycle_parking_bay_length: str
-    parking_lots: str
+    parking_lots: int = 0
+    kind: Literal["motorcycle_parking"] = "motorcycle_parking"
     
     class Config:
         populate_by_name = True
+        frozen = True
 
 
 class WomenChildrenParking(BaseModel):
@@ -79,10 +131,12 @@ class WomenChildrenParking(BaseModel):
     area: str
     areacode: str
     address: str
-    quantity: str
+    quantity: int = 0
+    kind: Literal["women_children_parking"] = "women_children_parking"
     
     class Config:
         populate_by_name = True
+        frozen = True
 
 
 class DisabledParking(BaseModel):
@@ -90,14 +144,16 @@ class DisabledParking(BaseModel):
     zone: str
     areacode: str
     address: str
-    quantity: str
+    quantity: int = 0
     vehicle_classification: str
     charged: str
     disabled_parking_sign: str
     disabled_parking_lot: str
+    kind: Literal["disabled_parking"] = "disabled_parking"
     
     class Config:
         populate_by_name = True
+        frozen = True
 
 
 class TyphoonParking(BaseModel):
@@ -107,10 +163,12 @@ class TyphoonParking(BaseModel):
     road_section: str
     road_direction: str
     road_length: str
-    parking_capacity: str
+    parking_capacity: int = 0
+    kind: Literal["typhoon_parking"] = "typhoon_parking"
     
     class Config:
         populate_by_name = True
+        frozen = True
 
 
 class RoadsideParkingManagement(BaseModel):
@@ -119,102 +177,57 @@ class RoadsideParkingManagement(BaseModel):
     areacode: str
     name: str
     address: str
+    kind: Literal["roadside_parking_management"] = "roadside_parking_management"
     
     class Config:
         populate_by_name = True
+        frozen = True
 
 
-def parse_parking_lots(data: List[Dict[str, Any]]) -> List[ParkingLot]:
-    """解析路外公共停車場資料
-    
-    Args:
-        data: API 回應的原始資料
-        
-    Returns:
-        解析後的路外公共停車場物件列表
-    """
-    return [ParkingLot.model_validate(item) for item in data]
-
-
-def parse_parking_availability(data: List[Dict[str, Any]]) -> List[ParkingAvailability]:
-    """解析停車場即時空位資料
-    
-    Args:
-        data: API 回應的原始資料
-        
-    Returns:
-        解析後的停車場即時空位物件列表
-    """
-    return [ParkingAvailability.model_validate(item) for item in data]
-
-
-def parse_roadside_parking(data: List[Dict[str, Any]]) -> List[RoadsideParking]:
-    """解析路邊停車空位資料
-    
-    Args:
-        data: API 回應的原始資料
-        
-    Returns:
-        解析後的路邊停車空位物件列表
-    """
-    return [RoadsideParking.model_validate(item) for item in data]
-
-
-def parse_motorcycle_parking(data: List[Dict[str, Any]]) -> List[MotorcycleParking]:
-    """解析機車停車彎資料
-    
-    Args:
-        data: API 回應的原始資料
-        
-    Returns:
-        解析後的機車停車彎物件列表
-    """
-    return [MotorcycleParking.model_validate(item) for item in data]
+# 以 kind 欄位作為鑑別值的停車資料標籤聯集；pydantic-core 可在
+# Rust 層直接依 kind 分派到對應模型，呼叫端不需再按端點挑選解析器。
+ParkingRecord = Annotated[
+    Union[
+        ParkingLot, ParkingAvailability, RoadsideParking, MotorcycleParking,
+        WomenChildrenParking, DisabledParking, TyphoonParking,
+        RoadsideParkingManagement,
+    ],
+    Field(discriminator="kind"),
+]
 
+_PARKING_RECORD_ADAPTER = get_adapter(ParkingRecord)
 
-def parse_women_children_parking(data: List[Dict[str, Any]]) -> List[WomenChildrenParking]:
-    """解析婦幼停車位資料
-    
-    Args:
-        data: API 回應的原始資料
-        
-    Returns:
-        解析後的婦幼停車位物件列表
-    """
-    return [WomenChildrenParking.model_validate(item) for item in data]
 
+def parse_parking(data: List[dict]) -> List[ParkingRecord]:
+    """解析停車相關資料（單一分派入口）
 
-def parse_disabled_parking(data: List[Dict[str, Any]]) -> List[DisabledParking]:
-    """解析身心障礙停車格資料
-    
-    Args:
-        data: API 回應的原始資料
-        
-    Returns:
-        解析後的身心障礙停車格物件列表
-    """
-    return [DisabledParking.model_validate(item) for item in data]
-
+    資料須帶有 kind 鑑別欄位（OpenDataClient.get_by_resource_id
+    會依資源 ID 注入），即可混用各種停車資料類型，由
+    pydantic-core 一次完成路由。
 
-def parse_typhoon_parking(data: List[Dict[str, Any]]) -> List[TyphoonParking]:
-    """解析颱風期間可供停車路段資料
-    
     Args:
-        data: API 回應的原始資料
-        
-    Returns:
-        解析後的颱風期間可供停車路段物件列表
-    """
-    return [TyphoonParking.model_validate(item) for item in data]
-
+        data: API 回應的原始資料（含 kind 欄位）
 
-def parse_roadside_parking_management(data: List[Dict[str, Any]]) -> List[RoadsideParkingManagement]:
-    """解析路邊收費停管場資料
-    
-    Args:
-        data: API 回應的原始資料
-        
     Returns:
-        解析後的路邊收費停管場物件列表
+        解析後的停車資料物件列表
     """
-    return [RoadsideParkingManagement.model_validate(item) for item in data] 
\ No newline at end of file
+    return _PARKING_RECORD_ADAPTER.validate_python(data)
+
+
+# 批次解析函數由 make_parser 產生，介面與原手寫版本相同：
+# 接收 API 回應的原始資料列表，回傳解析後的模型物件列表。
+parse_parking_lots = make_parser(ParkingLot)
+parse_parking_availability = make_parser(ParkingAvailability)
+# 路邊停車空位為最大宗的批次資料，整批交給 pydantic-core 的
+# 編譯迴圈處理（parse_parking_lots 因含 int 欄位已走同一路徑）
+parse_roadside_parking = make_parser(RoadsideParking, force_validate=True)
+parse_motorcycle_parking = make_parser(MotorcycleParking)
+parse_women_children_parking = make_parser(WomenChildrenParking)
+parse_disabled_parking = make_parser(DisabledParking)
+parse_typhoon_parking = make_parser(TyphoonParking)
+parse_roadside_parking_management = make_parser(RoadsideParkingManagement)
+
+# 大批量資料的 JSON 直解版本：搭配 OpenDataClient.get_raw 使用，
+# 由 pydantic-core 直接解析回應位元組，跳過中介的 dict 列表。
+parse_parking_lots_json = make_json_parser(ParkingLot)
+parse_roadside_parking_json = make_json_parser(RoadsideParking)
\ No newline at end of file
@@ -1,38 +1,533 @@
+import asyncio
 import re
-import json
-import logging
-import sys
 import uuid
+from itertools import groupby, islice
 from typing import Dict, Any, List, Optional, Union
-import os
 
-# 將目錄加入 Python 路徑
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import ahocorasick
 
 from mcp.server.fastmcp import FastMCP
 
-# 使用絕對導入
 from ntpc_opendata_tool.utils.logger import setup_logger
-from ntpc_opendata_tool.api.bus import BusAPI
-from ntpc_opendata_tool.api.traffic import TrafficAPI
-from ntpc_opendata_tool.api.parking import ParkingAPI
-from ntpc_opendata_tool.api.bike import BikeAPI
-from ntpc_opendata_tool.api.misc_traffic import MiscTrafficAPI
+from ntpc_opendata_tool.utils.cache import TTLCache
+from ntpc_opendata_tool.api import (
+    bus_api,
+    traffic_api,
+    parking_api,
+    bike_api,
+    misc_traffic_api,
+)
 from ntpc_opendata_tool.api.client import APIError
 
 # 設置日誌
 logger = setup_logger("ntpc_opendata_mcp")
 
-# 初始化 API 客戶端
-bus_api = BusAPI()
-traffic_api = TrafficAPI() 
-parking_api = ParkingAPI()
-bike_api = BikeAPI()
-misc_traffic_api = MiscTrafficAPI()
 
 # 生成唯一的 UUID，用於服務器實例標識
 SERVER_UUID = str(uuid.uuid4())
 
+# 查詢解析用的正規表示式（模組載入時預先編譯，處理函數內
+# 直接使用編譯結果，避免每次查詢重複查找 re 模組的模式快取）
+_BUS_ROUTE_RE = re.compile(r'(\d+[a-zA-Z]?|[a-zA-Z]\d+|紅\d+|藍\d+|綠\d+)(?:號|線|路|公車)')
+_STOP_RE = re.compile(r'(?:站牌|站點|車站|站)「?([\w\s]+?)」?(?:的|有|到|站|$)')
+_ROAD_RE = re.compile(r'([^\s]+(?:路|街|大道|橋))')
+_PARKING_TYPE_RE = re.compile(r'(路邊停車|立體停車場|地下停車場)')
+_BIKE_ROUTE_RE = re.compile(r'([A-Za-z0-9]+)\s*(?:路線|自行車|腳踏車|單車)')
+_BIKE_STOP_RE = re.compile(r'到\s*([^\s]+)\s*(?:站|站點)')
+_DISTRICT_RE = re.compile(r'([^\s]+(?:區|鎮|市))')
+_COORD_RE = re.compile(r'座標\s*(\d+\.\d+)\s*,\s*(\d+\.\d+)')
+_RADIUS_RE = re.compile(r'(\d+)\s*(?:公尺|米|m)')
+_MIN_BIKES_RE = re.compile(r'至少\s*(\d+)\s*(?:輛|台|臺)')
+_TAXI_KW_RE = re.compile(r'(?:搜尋|查詢)\s*([^\s]+)\s*(?:計程車|的計程車)')
+
+# 正規表達式的廉價前置檢查字元集合：查詢不含任何對應字元時
+# 不可能匹配，可直接跳過 NFA 掃描（isdisjoint 為單趟 C 層掃描）
+_ROUTE_CHARS = frozenset("0123456789紅藍綠")
+_ROAD_CHARS = frozenset("路街道橋")
+
+
+def _extract_area(query: str) -> Optional[str]:
+    """以右錨定掃描取出查詢中的行政區名稱
+
+    找到「區」字後往前收集連續的文字字元，行為等同原本的
+    [\w]+區 正規表達式，但以單趟 C 層 find 加短迴圈取代
+    NFA 掃描；多數不含「區」的查詢在 find 即可排除。
+
+    Args:
+        query: 用戶查詢內容
+
+    Returns:
+        含「區」字尾的行政區名稱，找不到時回傳 None
+    """
+    i = query.find("區")
+    while i != -1:
+        j = i
+        while j > 0 and (query[j - 1].isalnum() or query[j - 1] == "_"):
+            j -= 1
+        if j < i:
+            return query[j:i + 1]
+        i = query.find("區", i + 1)
+    return None
+
+
+# 各類查詢的判斷關鍵字（模組載入時餵入 _build_category_automaton
+# 建成 Aho–Corasick 自動機，分類時只需掃描查詢字串一次，
+# 而非逐一比對每個關鍵字）
+_BUS_KEYWORDS = [
+    "公車", "巴士", "路線", "站牌", "站點", "幾分鐘", "到站", "幾號公車",
+    "公車路線", "哪些公車", "班次", "公車時刻"
+]
+_TRAFFIC_KEYWORDS = [
+    "交通", "路況", "塞車", "施工", "道路", "車流", "車速", "交通狀況",
+    "壅塞", "事故", "交通事件", "交通攝影機", "監視器"
+]
+_PARKING_KEYWORDS = [
+    "停車", "停車場", "車位", "停車費", "收費標準", "停車資訊",
+    "有位子", "有空位", "找車位", "泊車"
+]
+_BIKE_KEYWORDS = [
+    "自行車", "腳踏車", "單車", "單車路線", "單車站點", "單車時刻",
+    "youbike", "ubike", "YouBike", "UBike", "自行車道", "腳踏車道",
+    "自行車架", "腳踏車架", "單車架", "自行車站", "腳踏車站", "單車站"
+]
+_MISC_TRAFFIC_KEYWORDS = [
+    "其他交通服務", "交通資訊", "交通規劃", "交通管理", "交通諮詢",
+    "計程車", "taxi", "Taxi", "TAXI", "拖吊", "保管場", "拖吊保管場",
+    "交通影響評估", "交評", "交通服務", "交通局", "運輸局"
+]
+_HELP_KEYWORDS = [
+    "幫助", "help", "Help", "HELP", "說明", "使用說明", "指南", "使用指南",
+    "怎麼用", "如何使用", "功能", "有什麼功能", "能做什麼", "可以做什麼"
+]
+
+# 分類優先順序與原本 handle_query 內 if/elif 鏈的判斷順序一致
+_CATEGORY_PRIORITY = ["help", "bus", "traffic", "parking", "bike", "misc_traffic"]
+
+# 各類別查詢結果的快取存活秒數：到站時間、路況等即時資料存活
+# 較短，YouBike 站點清單等偏靜態的資料可以放久一些
+_RESPONSE_CACHE_TTLS = {
+    "bus": 30.0,
+    "traffic": 30.0,
+    "parking": 60.0,
+    "bike": 300.0,
+    "misc_traffic": 300.0,
+}
+
+# 資料快取的各端點 TTL（秒）：即時性端點短、偏靜態端點長；
+# 未列出的端點沿用資料快取的預設 TTL
+_DATA_CACHE_TTLS = {
+    "bus_routes": 1800.0,
+    "bus_stops": 1800.0,
+    "bus_estimated_time": 20.0,
+    "bus_search_by_stop": 300.0,
+    "traffic_status": 60.0,
+    "traffic_construction": 300.0,
+    "traffic_cameras": 600.0,
+    "traffic_incidents": 60.0,
+    "parking_lots": 300.0,
+    "parking_lots_by_type": 300.0,
+    "parking_available": 60.0,
+}
+
+
+def _normalize_query(query: str) -> str:
+    """正規化查詢字串作為快取鍵（壓縮空白並轉為小寫）"""
+    return " ".join(query.split()).lower()
+
+
+def _build_category_automaton() -> "ahocorasick.Automaton":
+    """建立所有分類關鍵字共用的 Aho–Corasick 自動機
+
+    所有類別的關鍵字合併進同一個自動機，讓分類只需線性掃描
+    查詢字串一次，便能找出所有命中的類別。同一關鍵字若出現在
+    多個類別，保留優先順序較高者。
+
+    Returns:
+        已完成建構（make_automaton）的自動機
+    """
+    automaton = ahocorasick.Automaton()
+    categories = [
+        ("help", _HELP_KEYWORDS),
+        ("bus", _BUS_KEYWORDS),
+        ("traffic", _TRAFFIC_KEYWORDS),
+        ("parking", _PARKING_KEYWORDS),
+        ("bike", _BIKE_KEYWORDS),
+        ("misc_traffic", _MISC_TRAFFIC_KEYWORDS),
+    ]
+    for priority, (category, keywords) in enumerate(categories):
+        for keyword in keywords:
+            if not automaton.exists(keyword):
+                automaton.add_word(keyword, (priority, category))
+    automaton.make_automaton()
+    return automaton
+
+
+_HELP_MESSAGE = """### 新北市交通局開放資料查詢助手
+
+我可以幫您查詢新北市的交通相關資訊，包括：
+
+1. **公車資訊**：
+   - 公車路線查詢，例如「307公車的路線」
+   - 站牌查詢，例如「307公車的站牌」
+   - 到站時間查詢，例如「307公車到板橋站的時間」
+   - 站點公車查詢，例如「板橋站有哪些公車」
+
+2. **交通狀況**：
+   - 道路交通狀況，例如「板橋區的交通狀況」
+   - 道路施工資訊，例如「板橋區有哪些道路施工」
+   - 交通攝影機，例如「板橋區的交通攝影機」
+   - 交通事件，例如「板橋區有哪些交通事件」
+
+3. **停車場資訊**：
+   - 停車場查詢，例如「板橋區有哪些停車場」
+   - 停車場空位查詢，例如「板橋區有空位的停車場」
+   - 停車場收費標準，例如「板橋區停車場的收費標準」
+
+4. **自行車資訊**：
+   - YouBike 站點查詢，例如「板橋區的 YouBike 站點」
+   - 自行車架查詢，例如「板橋區的自行車架」
+   - 自行車道查詢，例如「板橋區的自行車道」
+
+5. **其他交通服務**：
+   - 計程車服務查詢，例如「新北市的計程車服務」
+   - 拖吊保管場查詢，例如「板橋區的拖吊保管場」
+   - 交通影響評估查詢，例如「新北市的交通影響評估」
+
+請告訴我您想查詢的資訊，我會盡力協助您。
+"""
+
+# 無法理解查詢時的預設回應（預先串接，免去每次查詢重組字串）
+_FALLBACK_MESSAGE = f"抱歉，我無法理解您的查詢。以下是我可以提供的服務：\n\n{_HELP_MESSAGE}"
+
+_CATEGORY_AUTOMATON = _build_category_automaton()
+
+
+# 交通服務記錄的固定欄位樣板（各類型中無條件輸出的行，
+# 模組載入時就緒，逐筆格式化時不再重組樣板）
+_TPL_BIKE_RACK_STATION = "- **{station}**\n  項目: {item}\n  數量: {quantity} 個\n\n"
+_TPL_BIKE_RACK_AREA = "- **{area}**\n  項目: {item}\n  數量: {quantity} 個\n\n"
+_TPL_BIKEWAY = "- **{bikeway}**\n  行政區: {district}\n  路線: {route}\n  長度: {length} 公里\n\n"
+_TPL_YOUBIKE = (
+    "- **{name}**\n"
+    "{address_line}"
+    "  可借車輛: {available_bikes} 輛\n"
+    "  可還空位: {empty_spaces} 個\n"
+    "  總車位數: {total_bikes} 個\n"
+    "{distance_line}"
+    "\n"
+)
+
+# 到站時間的特殊值對應文字；一般分鐘數走 f-string 組字串
+# 公車方向代碼對應名稱：以查表取代逐列的條件運算式
+_DIR_NAME = {0: "去程", 1: "返程"}
+
+_ETA_SPECIAL = {-1: "尚未發車", 0: "進站中"}
+
+# 收費標準的群組標題樣板（模組載入時就緒）
+_TPL_FEE_HEADER = "#### {}\n\n"
+
+# 各列表格式器的單列樣板：每列一次 format 呼叫取代多段 f-string 附加
+_TPL_TRAFFIC_ROW = "- **{area} {road}**: {status}\n"
+_TPL_TRAFFIC_ROW_SPEED = "- **{area} {road}**: {status}, 平均車速 {speed} km/h\n"
+_TPL_CONSTRUCTION_ROW = (
+    "- **{area} {road}**\n"
+    "  - 說明: {desc}\n"
+    "  - 期間: {start} 至 {end}\n"
+    "  - 狀態: {status}\n\n"
+)
+_TPL_INCIDENT_ROW = (
+    "- **{area} {road}** ({type})\n"
+    "  - 說明: {desc}\n"
+    "  - 開始時間: {start}\n"
+    "  - 狀態: {status}\n\n"
+)
+_TPL_CAMERA_ROW = "- **{area} {road}** ({direction})\n{image_line}\n"
+_TPL_PARKING_ROW = (
+    "- **{name}** ({area})\n"
+    "  - 地址: {address}\n"
+    "  - 總車位: {total}\n"
+    "{available_line}\n"
+)
+
+# 單一公車路線詳細欄位：(標籤, 欄位鍵, 預設值) 三元組驅動輸出
+_BUS_ROUTE_FIELDS = (
+    ("路線 ID", "Id", "無資料"),
+    ("營運業者", "providerName", "無資料"),
+    ("路線類型", "pathAttributeName", "無資料"),
+    ("起點站", "departureZh", "無資料"),
+    ("終點站", "destinationZh", "無資料"),
+    ("建置期間", "buildPeriod", "無資料"),
+)
+_BUS_ROUTE_EN_FIELDS = (
+    ("Route Name", "nameEn", "N/A"),
+    ("Departure", "departureEn", "N/A"),
+    ("Destination", "destinationEn", "N/A"),
+)
+
+
+def _as_mapping(item: Any) -> Dict[str, Any]:
+    """以唯讀方式取得單筆記錄的欄位對照表
+
+    dict 直接回傳；Pydantic 模型回傳其 __dict__（v2 將欄位值
+    存於 __dict__），省去 model_dump() 逐欄位複製成新字典。
+    僅供讀取欄位使用，不可修改回傳的對照表。
+
+    Args:
+        item: 單筆記錄（dict 或 Pydantic 模型）
+
+    Returns:
+        該記錄的欄位對照表
+    """
+    return item if isinstance(item, dict) else item.__dict__
+
+
+def _service_kind(service: Dict[str, Any]) -> str:
+    """判斷單筆交通服務記錄的類型
+
+    判斷順序與原本 _format_traffic_service_info 的 if/elif 鏈
+    相同；每筆記錄只判斷一次，後續輸出交由對應的格式化函數。
+
+    Args:
+        service: 單筆交通服務記錄
+
+    Returns:
+        類型鍵，作為 _SERVICE_EMITTERS 的索引
+    """
+    if "taxi_transportation_service" in service:
+        return "taxi_old"
+    if "title" in service:
+        return "towing"
+    if "url" in service:
+        return "assessment"
+    if "countycode" in service and "phone" in service:
+        return "taxi"
+    if "station_name" in service or "sna" in service:
+        return "youbike"
+    if "area" in service and "quantity" in service:
+        return "bike_rack"
+    if "type" in service and "bikeway" in service:
+        return "bikeway"
+    return "generic"
+
+
+# 類型判斷會用到的鍵；記錄的鍵集合與此交集即可完全決定類型
+_SENTINEL_KEYS = frozenset({
+    "taxi_transportation_service", "title", "url", "countycode", "phone",
+    "station_name", "sna", "area", "quantity", "type", "bikeway",
+})
+
+# 鍵簽章 → 類型的備忘錄：同一批資料的記錄結構通常只有少數幾
+# 種，第一筆之後的分類成本降為一次集合交集加一次查表
+_KIND_BY_SIGNATURE: Dict[frozenset, str] = {}
+
+
+def _service_kind_cached(service: Dict[str, Any]) -> str:
+    """以鍵簽章備忘錄加速的記錄類型判斷
+
+    先以 C 層級的集合交集取出記錄中出現的判斷鍵，未見過的
+    簽章才走一次 _service_kind 的逐項判斷並記入備忘錄。
+
+    Args:
+        service: 單筆交通服務記錄
+
+    Returns:
+        類型鍵，作為 _SERVICE_EMITTERS 的索引
+    """
+    signature = frozenset(service.keys() & _SENTINEL_KEYS)
+    kind = _KIND_BY_SIGNATURE.get(signature)
+    if kind is None:
+        kind = _service_kind(service)
+        _KIND_BY_SIGNATURE[signature] = kind
+    return kind
+
+
+def _emit_taxi_old(out: List[str], service: Dict[str, Any]) -> None:
+    """輸出計程車服務（舊格式）記錄"""
+    name = service.get("taxi_transportation_service", service.get("name", "無名稱"))
+    phone = service.get("phone_number", service.get("phone", "無電話"))
+    out.append(f"- **{name}**\n")
+    if phone:
+        out.append(f"  電話: {phone}\n")
+    out.append("\n")
+
+
+def _emit_towing(out: List[str], service: Dict[str, Any]) -> None:
+    """輸出拖吊保管場記錄"""
+    g = service.get
+    name = g("title", g("name", "無名稱"))
+    address = g("address", "無地址")
+    tel = g("tel", "無電話")
+    distance = g("distance")
+    out.append(f"- **{name}**\n")
+    if address:
+        out.append(f"  地址: {address}\n")
+    if tel:
+        out.append(f"  電話: {tel}\n")
+    if distance:
+        out.append(f"  距離: {distance} 公尺\n")
+    out.append("\n")
+
+
+def _emit_assessment(out: List[str], service: Dict[str, Any]) -> None:
+    """輸出交通影響評估記錄"""
+    name = service.get("name", "無名稱")
+    category = service.get("category", "無類別")
+    url = service.get("url", "")
+    out.append(f"- **{name}**")
+    if category:
+        out.append(f" ({category})")
+    out.append("\n")
+    if url:
+        out.append(f"  連結: {url}\n")
+    out.append("\n")
+
+
+def _emit_taxi(out: List[str], service: Dict[str, Any]) -> None:
+    """輸出計程車服務（新格式）記錄"""
+    name = service.get("name", "無名稱")
+    phone = service.get("phone", "無電話")
+    out.append(f"- **{name}**\n")
+    if phone:
+        out.append(f"  電話: {phone}\n")
+    out.append("\n")
+
+
+def _emit_youbike(out: List[str], service: Dict[str, Any]) -> None:
+    """輸出 YouBike 站點記錄
+
+    六行輸出以單一 format_map 呼叫套用預先定義的樣板；
+    選填的地址與距離行先算成完整行或空字串再帶入。
+    """
+    g = service.get
+    address = g("address", g("ar", "無地址"))
+    distance = g("distance")
+    out.append(_TPL_YOUBIKE.format_map({
+        "name": g("station_name", g("sna", "無名稱")),
+        "address_line": f"  地址: {address}\n" if address else "",
+        "available_bikes": g("available_bikes", g("sbi", 0)),
+        "empty_spaces": g("empty_spaces", g("bemp", 0)),
+        "total_bikes": g("total_bikes", g("tot", 0)),
+        "distance_line": f"  距離: {distance} 公尺\n" if distance else "",
+    }))
+
+
+def _emit_bike_rack(out: List[str], service: Dict[str, Any]) -> None:
+    """輸出自行車架記錄（捷運站週邊或行政區）"""
+    if "station" in service:
+        out.append(_TPL_BIKE_RACK_STATION.format(
+            station=service.get("station", "無站名"),
+            item=service.get("item", "無項目"),
+            quantity=service.get("quantity", 0),
+        ))
+    else:
+        out.append(_TPL_BIKE_RACK_AREA.format(
+            area=service.get("area", "無區域"),
+            item=service.get("item", "無項目"),
+            quantity=service.get("quantity", 0),
+        ))
+
+
+def _emit_bikeway(out: List[str], service: Dict[str, Any]) -> None:
+    """輸出自行車道記錄"""
+    out.append(_TPL_BIKEWAY.format(
+        bikeway=service.get("bikeway", "無名稱"),
+        district=service.get("district", "無區域"),
+        route=service.get("route", "無路線"),
+        length=service.get("length", 0),
+    ))
+
+
+def _emit_generic(out: List[str], service: Dict[str, Any]) -> None:
+    """輸出一般交通服務記錄"""
+    g = service.get
+    name = g("name", "無名稱")
+    category = g("category", "無類別")
+    address = g("address", "無地址")
+    tel = g("tel", "無電話")
+    phone = g("phone", "")  # 計程車服務可能有 phone 而非 tel
+    url = g("url", "")  # 交通影響評估可能有 url
+    out.append(f"- **{name}**")
+    if category:
+        out.append(f" ({category})")
+    out.append("\n")
+    if address:
+        out.append(f"  地址: {address}\n")
+    if tel:
+        out.append(f"  電話: {tel}\n")
+    if phone and not tel:  # 如果有 phone 但沒有 tel，則顯示 phone
+        out.append(f"  電話: {phone}\n")
+    if url:
+        out.append(f"  連結: {url}\n")
+    out.append("\n")
+
+
+
+def _render_bike_stop_section(append, header: str, stops: List[Dict[str, Any]]) -> None:
+    """輸出單一方向的自行車站點區塊（去程與回程共用）"""
+    if not stops:
+        return
+    append(header)
+    for i, stop in enumerate(stops, 1):
+        g = stop.get
+        append(f"{i}. **{g('name', '無名稱')}**")
+        if g("address"):
+            append(f" ({g('address')})")
+        append("\n")
+
+
+def _render_bike_eta_section(append, header: str, stops: List[Dict[str, Any]]) -> None:
+    """輸出單一方向的自行車到站時間區塊（去程與回程共用）"""
+    if not stops:
+        return
+    append(header)
+    for stop in stops:
+        g = stop.get
+        name = g("name", "無名稱")
+        eta = g("eta", "無資料")
+        status = g("status", "無狀態")
+
+        append(f"- **{name}**: ")
+        append(_ETA_SPECIAL.get(eta) or f"預計 {eta} 分鐘到站")
+
+        if status:
+            append(f" ({status})")
+        append("\n")
+
+
+# 記錄類型 → 格式化函數的分發表
+_SERVICE_EMITTERS = {
+    "taxi_old": _emit_taxi_old,
+    "towing": _emit_towing,
+    "assessment": _emit_assessment,
+    "taxi": _emit_taxi,
+    "youbike": _emit_youbike,
+    "bike_rack": _emit_bike_rack,
+    "bikeway": _emit_bikeway,
+    "generic": _emit_generic,
+}
+
+
+def _classify_query(query: str) -> Optional[str]:
+    """以單次掃描判斷查詢所屬類別
+
+    與逐一呼叫各個 _is_*_query 相比，整個查詢字串只需掃描一次；
+    命中多個類別時，依 _CATEGORY_PRIORITY 的順序取優先者，
+    行為與原本的 if/elif 判斷鏈相同。
+
+    Args:
+        query: 用戶查詢內容
+
+    Returns:
+        類別名稱，無法分類時為 None
+    """
+    best: Optional[tuple] = None
+    for _, value in _CATEGORY_AUTOMATON.iter(query):
+        if best is None or value < best:
+            best = value
+            if value[0] == 0:  # 已是最高優先的類別，毋須再掃
+                break
+    return best[1] if best else None
+
 class NTPCOpenDataMCP(FastMCP):
     """新北市交通局 OpenData MCP 服務器"""
     
@@ -45,23 +540,52 @@ class NTPCOpenDataMCP(FastMCP):
             uuid=str(uuid.uuid4())
         )
         
-        # 初始化 logger
-        self.logger = logging.getLogger("ntpc_opendata_mcp")
-        self.logger.setLevel(logging.INFO)
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        handler.setFormatter(formatter)
-        self.logger.addHandler(handler)
+        # 初始化 logger：setup_logger 會避免重複掛載處理器，
+        # 與模組層級的日誌器共用同一個 stderr StreamHandler，
+        # 每則訊息只寫出一次
+        self.logger = setup_logger("ntpc_opendata_mcp")
         
         self.logger.info("初始化新北市交通局 OpenData MCP 服務器")
         
-        # 初始化 API 客戶端
-        self.bus_api = BusAPI()
-        self.traffic_api = TrafficAPI()
-        self.parking_api = ParkingAPI()
-        self.bike_api = BikeAPI()
-        self.misc_traffic_api = MiscTrafficAPI()
-        
+        # 重用模組層級的 API 客戶端單例，
+        # 避免重複建立 HTTP 連線池與載入設定
+        self.bus_api = bus_api
+        self.traffic_api = traffic_api
+        self.parking_api = parking_api
+        self.bike_api = bike_api
+        self.misc_traffic_api = misc_traffic_api
+
+        # 查詢結果快取：同一（類別, 正規化查詢）在 TTL 內直接回傳
+        # 快取結果；過期但仍在寬限期內時先回舊值、背景重新整理
+        self._response_cache = TTLCache(maxsize=1024, ttl=60.0, stale_ttl=240.0)
+
+        # 進行中查詢對照表：相同查詢併發抵達時，後到者等待先到者
+        # 的結果，同一時間對上游只發出一次請求（single-flight）
+        self._inflight: Dict[tuple, "asyncio.Future"] = {}
+
+        # 靜態端點資料快取：大批量且變動不頻繁的清單（YouBike
+        # 站點、自行車道、拖吊保管場、計程車業者）載入後依 TTL 重用
+        self._data_cache = TTLCache(maxsize=64, ttl=600.0, stale_ttl=1200.0)
+
+        # 行政區索引表：快取鍵 → (資料快照, {行政區: 子集})。
+        # 同一份快取資料對各行政區只掃描一次，資料重新整理時
+        # 索引隨之重建
+        self._district_index: Dict[str, tuple] = {}
+
+        # 快取預熱的一次性旗標：__init__ 在模組匯入時執行，事件
+        # 迴圈尚未啟動，無法在此建立任務；首次查詢進入事件迴圈
+        # 時才排程背景預熱
+        self._warmup_scheduled = False
+
+        # 類別 → 處理函數的分發表；新增查詢類別時只需在此註冊
+        self._dispatch = {
+            "bus": self._handle_bus_query,
+            "traffic": self._handle_traffic_query,
+            "parking": self._handle_parking_query,
+            "bike": self._handle_bike_query,
+            "misc_traffic": self._handle_misc_traffic_query,
+        }
+
         # 註冊查詢處理函數
         @self.tool(name="ntpc-query", description="處理交通相關查詢")
         async def handle_query(query: str) -> str:
@@ -73,254 +597,356 @@ class NTPCOpenDataMCP(FastMCP):
             Returns:
                 MCP 回應
             """
-            self.logger.info(f"收到查詢: {query}")
-            print(f"收到查詢: {query}", file=sys.stderr)
-            
+            self.logger.info("收到查詢: %s", query)
+
+            # 首次查詢時於背景預熱偏靜態的大批量端點，後續查詢
+            # 可直接命中資料快取
+            if not self._warmup_scheduled:
+                self._warmup_scheduled = True
+                asyncio.create_task(self._warm_caches())
+
             try:
-                # 檢查是否為幫助請求
-                if self._is_help_query(query):
-                    return self._get_help_message()
-                
-                # 檢查查詢類型並分發到相應處理函數
-                if self._is_bus_query(query):
-                    return await self._handle_bus_query(query)
-                elif self._is_traffic_query(query):
-                    return await self._handle_traffic_query(query)
-                elif self._is_parking_query(query):
-                    return await self._handle_parking_query(query)
-                elif self._is_bike_query(query):
-                    return await self._handle_bike_query(query)
-                elif self._is_misc_traffic_query(query):
-                    return await self._handle_misc_traffic_query(query)
-                else:
+                # 以單次掃描找出查詢類別，再分發到相應處理函數
+                category = _classify_query(query)
+                if category == "help":
+                    return _HELP_MESSAGE
+                elif category is None:
                     # 一般性查詢，提供幫助信息
-                    return f"抱歉，我無法理解您的查詢。以下是我可以提供的服務：\n\n{self._get_help_message()}"
+                    return _FALLBACK_MESSAGE
+
+                # 查詢結果快取：命中且仍新鮮時直接回傳；過期但在
+                # 寬限期內先回舊值，並於背景重新整理
+                cache_key = (category, _normalize_query(query))
+                cached = self._response_cache.get_entry(cache_key)
+                if cached is not None:
+                    response, fresh = cached
+                    if not fresh:
+                        asyncio.ensure_future(
+                            self._refresh_response(category, query, cache_key)
+                        )
+                    return response
+
+                response = await self._single_flight(cache_key, category, query)
+                self._response_cache.set(
+                    cache_key, response, ttl=_RESPONSE_CACHE_TTLS.get(category)
+                )
+                return response
             except APIError as e:
-                self.logger.error(f"API 錯誤: {e.message}")
-                print(f"API 錯誤: {e.message}", file=sys.stderr)
+                self.logger.error("API 錯誤: %s", e.message)
                 return f"抱歉，查詢過程中發生錯誤: {e.message}"
             except Exception as e:
-                self.logger.exception(f"未預期錯誤: {str(e)}")
-                print(f"未預期錯誤: {str(e)}", file=sys.stderr)
+                self.logger.exception("未預期錯誤: %s", e)
                 return f"抱歉，查詢處理過程中發生未預期錯誤: {str(e)}"
     
-    def _is_bus_query(self, query: str) -> bool:
-        """判斷是否為公車相關查詢"""
-        bus_keywords = [
-            "公車", "巴士", "路線", "站牌", "站點", "幾分鐘", "到站", "幾號公車",
-            "公車路線", "哪些公車", "班次", "公車時刻"
-        ]
-        return any(keyword in query for keyword in bus_keywords)
-    
-    def _is_traffic_query(self, query: str) -> bool:
-        """判斷是否為交通狀況相關查詢"""
-        traffic_keywords = [
-            "交通", "路況", "塞車", "施工", "道路", "車流", "車速", "交通狀況",
-            "壅塞", "事故", "交通事件", "交通攝影機", "監視器"
-        ]
-        return any(keyword in query for keyword in traffic_keywords)
-    
-    def _is_parking_query(self, query: str) -> bool:
-        """判斷是否為停車場相關查詢"""
-        parking_keywords = [
-            "停車", "停車場", "車位", "停車費", "收費標準", "停車資訊",
-            "有位子", "有空位", "找車位", "泊車"
-        ]
-        return any(keyword in query for keyword in parking_keywords)
-    
-    def _is_bike_query(self, query: str) -> bool:
-        """判斷是否為自行車相關查詢"""
-        bike_keywords = [
-            "自行車", "腳踏車", "單車", "單車路線", "單車站點", "單車時刻",
-            "youbike", "ubike", "YouBike", "UBike", "自行車道", "腳踏車道",
-            "自行車架", "腳踏車架", "單車架", "自行車站", "腳踏車站", "單車站"
-        ]
-        return any(keyword in query for keyword in bike_keywords)
-    
-    def _is_misc_traffic_query(self, query: str) -> bool:
-        """判斷是否為其他交通服務相關查詢"""
-        misc_traffic_keywords = [
-            "其他交通服務", "交通資訊", "交通規劃", "交通管理", "交通諮詢",
-            "計程車", "taxi", "Taxi", "TAXI", "拖吊", "保管場", "拖吊保管場",
-            "交通影響評估", "交評", "交通服務", "交通局", "運輸局"
-        ]
-        return any(keyword in query for keyword in misc_traffic_keywords)
-    
-    def _is_help_query(self, query: str) -> bool:
-        """判斷是否為幫助請求"""
-        help_keywords = [
-            "幫助", "help", "Help", "HELP", "說明", "使用說明", "指南", "使用指南",
-            "怎麼用", "如何使用", "功能", "有什麼功能", "能做什麼", "可以做什麼"
-        ]
-        return any(keyword in query for keyword in help_keywords)
-    
+    async def _dispatch_query(self, category: str, query: str) -> str:
+        """依類別分發查詢到對應的處理函數
+
+        Args:
+            category: _classify_query 回傳的類別名稱
+            query: 用戶查詢內容
+
+        Returns:
+            處理函數產生的回應
+        """
+        return await self._dispatch[category](query)
+
+    async def _single_flight(self, cache_key: tuple, category: str, query: str) -> str:
+        """合併併發的相同查詢，同一鍵同時只發出一次上游請求
+
+        後到的呼叫端直接等待先到者建立的 Future；請求完成後
+        （無論成敗）自對照表移除，讓後續查詢可重新發出。
+
+        Args:
+            cache_key: 查詢的快取鍵（類別與正規化查詢）
+            category: 查詢類別
+            query: 用戶查詢內容
+
+        Returns:
+            處理函數產生的回應
+        """
+        fut = self._inflight.get(cache_key)
+        if fut is not None:
+            return await fut
+
+        fut = asyncio.ensure_future(self._dispatch_query(category, query))
+        self._inflight[cache_key] = fut
+        try:
+            return await fut
+        finally:
+            self._inflight.pop(cache_key, None)
+
+    async def _refresh_response(self, category: str, query: str, cache_key: tuple) -> None:
+        """於背景重新整理過期的快取查詢結果
+
+        失敗時保留舊值不更新，下一次查詢會再嘗試。
+
+        Args:
+            category: 查詢類別
+            query: 用戶查詢內容
+            cache_key: 對應的快取鍵
+        """
+        try:
+            response = await self._single_flight(cache_key, category, query)
+            self._response_cache.set(
+                cache_key, response, ttl=_RESPONSE_CACHE_TTLS.get(category)
+            )
+        except Exception as e:
+            self.logger.warning("背景更新查詢快取失敗: %s", e)
+
+    async def _cached_api_call(self, key: Union[str, tuple], func, *args) -> Any:
+        """以資料快取包裝阻塞式 API 呼叫
+
+        TTL 內直接回傳快取資料，未命中時於工作執行緒呼叫上游並
+        寫回快取。帶參數的呼叫以 (端點名稱, *參數) 元組為鍵，
+        各端點的存活秒數查 _DATA_CACHE_TTLS，即時性端點較短、
+        偏靜態端點較長。
+
+        Args:
+            key: 資料快取鍵，端點名稱字串或 (端點名稱, *參數) 元組
+            func: 阻塞式 API 呼叫
+            *args: 傳給 func 的位置參數
+
+        Returns:
+            API 回傳的資料
+        """
+        entry = self._data_cache.get_entry(key)
+        if entry is not None and entry[1]:
+            return entry[0]
+        value = await asyncio.to_thread(func, *args)
+        name = key[0] if isinstance(key, tuple) else key
+        self._data_cache.set(key, value, ttl=_DATA_CACHE_TTLS.get(name))
+        return value
+
+    def _district_slice(self, key: str, data: List[Any], district: str, get_text) -> List[Any]:
+        """自快取資料取出特定行政區的子集
+
+        同一份快取資料首次查詢某行政區時線性掃描一次並記入
+        索引表；之後相同行政區的查詢為 O(1) 查表。資料因 TTL
+        重新整理（物件更換）時索引自動重建。
+
+        Args:
+            key: 資料快取鍵
+            data: 快取的資料清單
+            district: 行政區名稱
+            get_text: 自單筆資料取出行政區比對文字的函數
+
+        Returns:
+            行政區比對文字包含 district 的資料子集
+        """
+        snapshot, index = self._district_index.get(key, (None, None))
+        if snapshot is not data:
+            index = {}
+            self._district_index[key] = (data, index)
+        result = index.get(district)
+        if result is None:
+            result = [item for item in data if district in get_text(item)]
+            index[district] = result
+        return result
+
+    async def _warm_caches(self) -> None:
+        """預熱偏靜態的大批量端點
+
+        並行抓取 YouBike 站點、自行車道、拖吊保管場與計程車
+        業者清單並寫入資料快取；個別端點失敗僅記錄警告，
+        不影響服務啟動。
+        """
+        warmers = {
+            "youbike_stations": self.bike_api.get_youbike_stations,
+            "bike_lanes": self.bike_api.get_bike_lanes,
+            "towing_storage": self.misc_traffic_api.get_towing_storage_info,
+            "taxi_services": self.misc_traffic_api.get_taxi_services,
+        }
+        results = await asyncio.gather(
+            *(self._cached_api_call(key, func) for key, func in warmers.items()),
+            return_exceptions=True,
+        )
+        for key, result in zip(warmers, results):
+            if isinstance(result, Exception):
+                self.logger.warning("預熱快取失敗 (%s): %s", key, result)
+
     async def _handle_bus_query(self, query: str) -> str:
         """處理公車相關查詢"""
         self.logger.info("處理公車相關查詢")
-        print("處理公車相關查詢", file=sys.stderr)
         
-        # 嘗試提取公車路線號碼
-        route_match = re.search(r'(\d+[a-zA-Z]?|[a-zA-Z]\d+|紅\d+|藍\d+|綠\d+)(?:號|線|路|公車)', query)
+        # 嘗試提取公車路線號碼：先確認查詢含路線號碼字元再跑正規表達式
+        route_match = None if _ROUTE_CHARS.isdisjoint(query) else _BUS_ROUTE_RE.search(query)
         route_name = route_match.group(1) if route_match else None
-        
+
         # 嘗試提取站點名稱
-        stop_match = re.search(r'(?:站牌|站點|車站|站)「?([\w\s]+?)」?(?:的|有|到|站|$)', query)
+        stop_match = _STOP_RE.search(query) if "站" in query else None
         stop_name = stop_match.group(1) if stop_match else None
         
-        try:
-            if route_name and "到站" in query:
-                # 查詢到站時間
-                data = self.bus_api.get_estimated_time(route_name, stop_name)
-                return self._format_bus_estimated_time(data, route_name, stop_name)
-            elif route_name and ("站牌" in query or "站點" in query):
-                # 查詢路線站牌
-                data = self.bus_api.get_stops(route_name)
-                return self._format_bus_stops(data, route_name)
-            elif route_name:
-                # 查詢路線資訊
-                data = self.bus_api.get_routes(route_name)
-                return self._format_bus_routes(data, route_name)
-            elif stop_name:
-                # 查詢站點經過的公車
-                data = self.bus_api.search_by_stop(stop_name)
-                return self._format_bus_search_by_stop(data, stop_name)
-            else:
-                # 一般公車查詢
-                return "您似乎在查詢公車資訊，請提供更具體的資訊，例如公車路線號碼或站牌名稱。例如「307公車的路線」或「捷運板橋站有哪些公車」。"
-        except APIError as e:
-            return f"查詢公車資訊時發生錯誤: {e.message}"
+        if route_name and "到站" in query:
+            # 查詢到站時間
+            data = await self._cached_api_call(
+                ("bus_estimated_time", route_name, stop_name),
+                self.bus_api.get_estimated_time, route_name, stop_name,
+            )
+            return self._format_bus_estimated_time(data, route_name, stop_name)
+        elif route_name and ("站牌" in query or "站點" in query):
+            # 查詢路線站牌
+            data = await self._cached_api_call(("bus_stops", route_name), self.bus_api.get_stops, route_name)
+            return self._format_bus_stops(data, route_name)
+        elif route_name:
+            # 查詢路線資訊
+            data = await self._cached_api_call(("bus_routes", route_name), self.bus_api.get_routes, route_name)
+            return self._format_bus_routes(data, route_name)
+        elif stop_name:
+            # 查詢站點經過的公車
+            data = await self._cached_api_call(("bus_search_by_stop", stop_name), self.bus_api.search_by_stop, stop_name)
+            return self._format_bus_search_by_stop(data, stop_name)
+        else:
+            # 一般公車查詢
+            return "您似乎在查詢公車資訊，請提供更具體的資訊，例如公車路線號碼或站牌名稱。例如「307公車的路線」或「捷運板橋站有哪些公車」。"
     
     async def _handle_traffic_query(self, query: str) -> str:
         """處理交通狀況相關查詢"""
         self.logger.info("處理交通狀況相關查詢")
-        print("處理交通狀況相關查詢", file=sys.stderr)
-        
-        # 嘗試提取區域
-        area_match = re.search(r'([\w]+區)', query)
-        area = area_match.group(1) if area_match else None
         
-        # 嘗試提取道路名稱
-        road_match = re.search(r'([^\s]+(?:路|街|大道|橋))', query)
+        # 嘗試提取區域：右錨定掃描，免去正規表達式引擎
+        area = _extract_area(query)
+
+        # 嘗試提取道路名稱：先確認查詢含道路字元再跑正規表達式
+        road_match = None if _ROAD_CHARS.isdisjoint(query) else _ROAD_RE.search(query)
         road = road_match.group(1) if road_match else None
         
-        try:
-            if "施工" in query:
-                # 查詢道路施工資訊
-                data = self.traffic_api.get_construction_info(area)
-                return self._format_traffic_construction(data, area)
-            elif "攝影機" in query or "監視器" in query or "即時影像" in query:
-                # 查詢交通攝影機
-                data = self.traffic_api.get_traffic_cameras(area, road)
-                return self._format_traffic_cameras(data, area, road)
-            elif "事件" in query or "事故" in query:
-                # 查詢交通事件
-                data = self.traffic_api.get_traffic_incidents(area)
-                return self._format_traffic_incidents(data, area)
-            else:
-                # 查詢交通狀況
-                data = self.traffic_api.get_traffic_status(area, road)
-                return self._format_traffic_status(data, area, road)
-        except APIError as e:
-            return f"查詢交通資訊時發生錯誤: {e.message}"
+        if "施工" in query:
+            # 查詢道路施工資訊
+            data = await self._cached_api_call(("traffic_construction", area), self.traffic_api.get_construction_info, area)
+            return self._format_traffic_construction(data, area)
+        elif "攝影機" in query or "監視器" in query or "即時影像" in query:
+            # 查詢交通攝影機
+            data = await self._cached_api_call(("traffic_cameras", area, road), self.traffic_api.get_traffic_cameras, area, road)
+            return self._format_traffic_cameras(data, area, road)
+        elif "事件" in query or "事故" in query:
+            # 查詢交通事件
+            data = await self._cached_api_call(("traffic_incidents", area), self.traffic_api.get_traffic_incidents, area)
+            return self._format_traffic_incidents(data, area)
+        else:
+            # 查詢交通狀況
+            data = await self._cached_api_call(("traffic_status", area, road), self.traffic_api.get_traffic_status, area, road)
+            return self._format_traffic_status(data, area, road)
     
     async def _handle_parking_query(self, query: str) -> str:
         """處理停車場相關查詢"""
         self.logger.info("處理停車場相關查詢")
-        print("處理停車場相關查詢", file=sys.stderr)
-        
-        # 嘗試提取區域
-        area_match = re.search(r'([\w]+區)', query)
-        area = area_match.group(1) if area_match else None
         
+        # 嘗試提取區域：右錨定掃描，免去正規表達式引擎
+        area = _extract_area(query)
+
         # 嘗試提取停車場類型
-        type_match = re.search(r'(路邊停車|立體停車場|地下停車場)', query)
+        type_match = _PARKING_TYPE_RE.search(query)
         type_name = type_match.group(1) if type_match else None
         
-        try:
-            if "收費" in query or "費率" in query or "費用" in query:
-                # 查詢停車場收費標準
-                data = self.parking_api.get_parking_lots()
-                return self._format_parking_fee_rates(data)
-            elif "有空位" in query or "有位子" in query or "可以停" in query:
-                # 查詢有空位的停車場
-                min_spaces = 1
-                data = self.parking_api.get_available_parking_lots(min_spaces, area)
-                return self._format_parking_available(data, area)
-            elif area and type_name:
-                # 查詢特定區域和類型的停車場
-                data = self.parking_api.get_parking_lots_by_type(type_name)
-                # 手動過濾區域
-                data = [item for item in data if area in item.get("area", "")]
-                return self._format_parking_lots(data, area, type_name)
-            elif area:
-                # 查詢特定區域的停車場
-                data = self.parking_api.get_parking_lots(area)
-                return self._format_parking_lots(data, area)
-            elif type_name:
-                # 查詢特定類型的停車場
-                data = self.parking_api.get_parking_lots_by_type(type_name)
-                return self._format_parking_lots(data, type_name=type_name)
+        if "收費" in query or "費率" in query or "費用" in query:
+            # 查詢停車場收費標準
+            data = await self._cached_api_call(("parking_lots", None), self.parking_api.get_parking_lots)
+            return self._format_parking_fee_rates(data)
+        elif "有空位" in query or "有位子" in query or "可以停" in query:
+            # 查詢有空位的停車場
+            min_spaces = 1
+            if type_name:
+                # 同時指定類型時，並行撈取該類型清單與即時空位，
+                # 再於本地以停車場 ID 取交集
+                lots, available = await asyncio.gather(
+                    self._cached_api_call(
+                        ("parking_lots_by_type", type_name, area),
+                        self.parking_api.get_parking_lots_by_type, type_name, area,
+                    ),
+                    self._cached_api_call(
+                        ("parking_available", min_spaces, area),
+                        self.parking_api.get_available_parking_lots, min_spaces, area,
+                    ),
+                )
+                type_ids = {lot.get("ID") for lot in lots}
+                data = [item for item in available if item.get("ID") in type_ids]
             else:
-                # 一般停車場查詢
-                return "您似乎在查詢停車場資訊，請提供更具體的資訊，例如區域或停車場類型。例如「板橋區有哪些停車場」或「新莊區有空位的停車場」。"
-        except APIError as e:
-            return f"查詢停車場資訊時發生錯誤: {e.message}"
+                data = await self._cached_api_call(
+                    ("parking_available", min_spaces, area),
+                    self.parking_api.get_available_parking_lots, min_spaces, area,
+                )
+            return self._format_parking_available(data, area)
+        elif area and type_name:
+            # 查詢特定區域和類型的停車場（由上游一併過濾區域）
+            data = await self._cached_api_call(
+                ("parking_lots_by_type", type_name, area),
+                self.parking_api.get_parking_lots_by_type, type_name, area,
+            )
+            return self._format_parking_lots(data, area, type_name)
+        elif area:
+            # 查詢特定區域的停車場
+            data = await self._cached_api_call(("parking_lots", area), self.parking_api.get_parking_lots, area)
+            return self._format_parking_lots(data, area)
+        elif type_name:
+            # 查詢特定類型的停車場
+            data = await self._cached_api_call(("parking_lots_by_type", type_name, None), self.parking_api.get_parking_lots_by_type, type_name)
+            return self._format_parking_lots(data, type_name=type_name)
+        else:
+            # 一般停車場查詢
+            return "您似乎在查詢停車場資訊，請提供更具體的資訊，例如區域或停車場類型。例如「板橋區有哪些停車場」或「新莊區有空位的停車場」。"
     
     async def _handle_bike_query(self, query: str) -> str:
         """處理自行車相關查詢"""
         try:
             # 嘗試提取路線編號
-            route_match = re.search(r'([A-Za-z0-9]+)\s*(?:路線|自行車|腳踏車|單車)', query)
+            route_match = _BIKE_ROUTE_RE.search(query)
             route_name = route_match.group(1) if route_match else None
             
             # 嘗試提取站點名稱
-            stop_match = re.search(r'到\s*([^\s]+)\s*(?:站|站點)', query)
+            stop_match = _BIKE_STOP_RE.search(query)
             stop_name = stop_match.group(1) if stop_match else None
             
             # 嘗試提取行政區
-            district_match = re.search(r'([^\s]+(?:區|鎮|市))', query)
+            district_match = _DISTRICT_RE.search(query)
             district = district_match.group(1) if district_match else None
-            
+
+            # 一次計算小寫查詢字串，供後續關鍵字判斷重複使用
+            query_lower = query.lower()
+
             # 判斷查詢類型
-            if "youbike" in query.lower() or "ubike" in query.lower():
+            if "youbike" in query_lower or "ubike" in query_lower:
                 # YouBike 站點查詢
                 if district:
-                    youbike_stations = self.bike_api.get_youbike_stations(area=district)
+                    stations = await self._cached_api_call("youbike_stations", self.bike_api.get_youbike_stations)
+                    youbike_stations = self._district_slice(
+                        "youbike_stations", stations, district,
+                        lambda s: s.area if hasattr(s, 'area') else s.get('area', ''),
+                    )
                     return self._format_traffic_service_info(youbike_stations, "YouBike 站點")
                 else:
-                    youbike_stations = self.bike_api.get_youbike_stations()
+                    youbike_stations = await self._cached_api_call("youbike_stations", self.bike_api.get_youbike_stations)
                     return self._format_traffic_service_info(youbike_stations, "YouBike 站點")
             
             elif "自行車架" in query or "腳踏車架" in query or "單車架" in query:
                 # 自行車架查詢
-                near_mrt = "捷運" in query or "mrt" in query.lower() or "MRT" in query
+                near_mrt = "捷運" in query or "mrt" in query_lower
                 
                 if district:
-                    bike_racks = self.bike_api.get_bike_racks(area=district, near_mrt=near_mrt)
+                    bike_racks = await asyncio.to_thread(self.bike_api.get_bike_racks, area=district, near_mrt=near_mrt)
                     return self._format_traffic_service_info(bike_racks, "自行車架")
                 else:
-                    bike_racks = self.bike_api.get_bike_racks(near_mrt=near_mrt)
+                    bike_racks = await asyncio.to_thread(self.bike_api.get_bike_racks, near_mrt=near_mrt)
                     return self._format_traffic_service_info(bike_racks, "自行車架")
             
             elif "自行車道" in query or "腳踏車道" in query or "單車道" in query:
                 # 自行車道查詢
-                bike_lanes = self.bike_api.get_bike_lanes()
+                bike_lanes = await self._cached_api_call("bike_lanes", self.bike_api.get_bike_lanes)
                 return self._format_traffic_service_info(bike_lanes, "自行車道")
             
             elif "附近" in query or "最近" in query:
                 # 查詢附近的 YouBike 站點
-                coord_match = re.search(r'座標\s*(\d+\.\d+)\s*,\s*(\d+\.\d+)', query)
+                coord_match = _COORD_RE.search(query) if "座標" in query else None
                 if coord_match:
                     lat = float(coord_match.group(1))
                     lng = float(coord_match.group(2))
                     radius = 500  # 預設搜尋半徑 500 公尺
                     
                     # 嘗試提取搜尋半徑
-                    radius_match = re.search(r'(\d+)\s*(?:公尺|米|m)', query)
+                    radius_match = _RADIUS_RE.search(query)
                     if radius_match:
                         radius = int(radius_match.group(1))
                     
-                    nearby_stations = self.bike_api.find_nearby_youbike(lat, lng, radius)
+                    nearby_stations = await asyncio.to_thread(self.bike_api.find_nearby_youbike, lat, lng, radius)
                     return self._format_traffic_service_info(nearby_stations, f"附近 {radius} 公尺內的 YouBike 站點")
                 else:
                     return "請提供座標以查詢附近的 YouBike 站點，例如「座標25.0330, 121.5654附近的 YouBike 站點」。"
@@ -330,20 +956,20 @@ class NTPCOpenDataMCP(FastMCP):
                 min_bikes = 1  # 預設至少有 1 輛可借車輛
                 
                 # 嘗試提取最少可借車輛數
-                min_bikes_match = re.search(r'至少\s*(\d+)\s*(?:輛|台|臺)', query)
+                min_bikes_match = _MIN_BIKES_RE.search(query)
                 if min_bikes_match:
                     min_bikes = int(min_bikes_match.group(1))
                 
-                available_stations = self.bike_api.get_available_youbikes(min_bikes)
+                available_stations = await asyncio.to_thread(self.bike_api.get_available_youbikes, min_bikes)
                 return self._format_traffic_service_info(available_stations, f"有至少 {min_bikes} 輛可借車輛的 YouBike 站點")
             
             else:
                 # 默認返回所有 YouBike 站點
-                youbike_stations = self.bike_api.get_youbike_stations()
+                youbike_stations = await self._cached_api_call("youbike_stations", self.bike_api.get_youbike_stations)
                 return self._format_traffic_service_info(youbike_stations, "YouBike 站點")
         
         except Exception as e:
-            self.logger.error(f"處理自行車查詢時出錯: {str(e)}")
+            self.logger.error("處理自行車查詢時出錯: %s", e)
             return f"抱歉，處理您的自行車查詢時出現錯誤: {str(e)}"
     
     async def _handle_misc_traffic_query(self, query: str) -> str:
@@ -353,30 +979,30 @@ class NTPCOpenDataMCP(FastMCP):
             service_type = None
             if "計程車" in query or "taxi" in query.lower():
                 service_type = "計程車"
-                keyword_match = re.search(r'(?:搜尋|查詢)\s*([^\s]+)\s*(?:計程車|的計程車)', query)
+                keyword_match = _TAXI_KW_RE.search(query)
                 keyword = keyword_match.group(1) if keyword_match else None
                 
                 if keyword:
-                    taxi_services = self.misc_traffic_api.search_taxi_service(keyword)
+                    taxi_services = await asyncio.to_thread(self.misc_traffic_api.search_taxi_service, keyword)
                     return self._format_traffic_service_info(taxi_services, "計程車服務")
                 else:
-                    taxi_services = self.misc_traffic_api.get_taxi_services()
+                    taxi_services = await self._cached_api_call("taxi_services", self.misc_traffic_api.get_taxi_services)
                     return self._format_traffic_service_info(taxi_services, "計程車服務")
             
             elif "拖吊" in query or "保管場" in query:
                 service_type = "拖吊保管場"
-                district_match = re.search(r'([^\s]+(?:區|鎮|市))', query)
+                district_match = _DISTRICT_RE.search(query)
                 district = district_match.group(1) if district_match else None
                 
                 if "最近" in query or "附近" in query:
                     # 尋找最近的拖吊保管場
                     # 注意：這裡需要提取座標，但通常用戶不會直接提供座標
                     # 這裡僅作為示例，實際應用可能需要地址轉座標的功能
-                    coord_match = re.search(r'座標\s*(\d+\.\d+)\s*,\s*(\d+\.\d+)', query)
+                    coord_match = _COORD_RE.search(query) if "座標" in query else None
                     if coord_match:
                         lat = float(coord_match.group(1))
                         lng = float(coord_match.group(2))
-                        nearest = self.misc_traffic_api.find_nearest_towing_storage(lat, lng)
+                        nearest = await asyncio.to_thread(self.misc_traffic_api.find_nearest_towing_storage, lat, lng)
                         if nearest:
                             # 將 Pydantic 模型轉換為字典
                             if hasattr(nearest, 'model_dump'):
@@ -389,798 +1015,628 @@ class NTPCOpenDataMCP(FastMCP):
                 
                 elif district:
                     # 按區域查詢拖吊保管場
-                    towing_storages = self.misc_traffic_api.get_towing_storage_info()
-                    # 將 Pydantic 模型轉換為字典
-                    if towing_storages and hasattr(towing_storages[0], 'model_dump'):
-                        towing_storages_dict = [item.model_dump() for item in towing_storages]
-                    else:
-                        towing_storages_dict = towing_storages
-                    # 過濾特定區域的拖吊保管場
-                    filtered_storages = [
-                        storage for storage in towing_storages_dict 
-                        if district in storage.get("address", "")
-                    ]
+                    towing_storages = await self._cached_api_call("towing_storage", self.misc_traffic_api.get_towing_storage_info)
+                    # 直接以模型屬性過濾，不先把整份清單 model_dump
+                    # 成字典；通過過濾的少數項目交由格式化函數轉換
+                    is_model = bool(towing_storages) and hasattr(towing_storages[0], 'address')
+                    filtered_storages = self._district_slice(
+                        "towing_storage", towing_storages, district,
+                        (lambda s: s.address) if is_model else (lambda s: s.get("address", "")),
+                    )
                     return self._format_traffic_service_info(filtered_storages, "拖吊保管場")
                 else:
-                    towing_storages = self.misc_traffic_api.get_towing_storage_info()
+                    towing_storages = await self._cached_api_call("towing_storage", self.misc_traffic_api.get_towing_storage_info)
                     return self._format_traffic_service_info(towing_storages, "拖吊保管場")
             
             elif "交通影響評估" in query or "交評" in query:
                 service_type = "交通影響評估"
-                assessments = self.misc_traffic_api.get_traffic_impact_assessment()
+                assessments = await asyncio.to_thread(self.misc_traffic_api.get_traffic_impact_assessment)
                 return self._format_traffic_service_info(assessments, "交通影響評估")
             
             else:
                 # 默認返回計程車服務資訊
-                taxi_services = self.misc_traffic_api.get_taxi_services()
+                taxi_services = await self._cached_api_call("taxi_services", self.misc_traffic_api.get_taxi_services)
                 return self._format_traffic_service_info(taxi_services, "計程車服務")
         
         except Exception as e:
-            self.logger.error(f"處理其他交通服務查詢時出錯: {str(e)}")
+            self.logger.error("處理其他交通服務查詢時出錯: %s", e)
             return f"抱歉，處理您的交通服務查詢時出現錯誤: {str(e)}"
     
-    def _format_bus_routes(self, data: List[Dict[str, Any]], route_name: Optional[str] = None) -> str:
+    @staticmethod
+    def _format_bus_routes(data: List[Dict[str, Any]], route_name: Optional[str] = None) -> str:
         """格式化公車路線資訊"""
         if not data:
             return f"找不到公車路線 {route_name} 的資訊。"
         
         if len(data) == 1:
             route = data[0]
-            result = f"### 公車 {route.get('nameZh', '無編號')} 路線資訊\n\n"
-            result += f"- **路線 ID**: {route.get('Id', '無資料')}\n"
-            result += f"- **營運業者**: {route.get('providerName', '無資料')}\n"
-            result += f"- **路線類型**: {route.get('pathAttributeName', '無資料')}\n"
-            result += f"- **起點站**: {route.get('departureZh', '無資料')}\n"
-            result += f"- **終點站**: {route.get('destinationZh', '無資料')}\n"
-            result += f"- **建置期間**: {route.get('buildPeriod', '無資料')}\n"
-            
+            g = route.get
+            # 以 (標籤, 欄位鍵, 預設值) 表格驅動欄位輸出
+            out = [f"### 公車 {g('nameZh', '無編號')} 路線資訊\n\n"]
+            out.extend(
+                f"- **{label}**: {g(key, default)}\n"
+                for label, key, default in _BUS_ROUTE_FIELDS
+            )
+
             # 如果有英文資訊，加入雙語顯示
-            if route.get('nameEn'):
-                result += f"\n**英文路線資訊**:\n"
-                result += f"- **Route Name**: {route.get('nameEn', 'N/A')}\n"
-                result += f"- **Departure**: {route.get('departureEn', 'N/A')}\n"
-                result += f"- **Destination**: {route.get('destinationEn', 'N/A')}\n"
-            
-            return result
+            if g('nameEn'):
+                out.append("\n**英文路線資訊**:\n")
+                out.extend(
+                    f"- **{label}**: {g(key, default)}\n"
+                    for label, key, default in _BUS_ROUTE_EN_FIELDS
+                )
+
+            return "".join(out)
         else:
             if route_name:
-                result = f"### 與 {route_name} 相關的公車路線:\n\n"
+                out = [f"### 與 {route_name} 相關的公車路線:\n\n"]
+                # 區域變數綁定 append，省去迴圈內重複的屬性查找
+                append = out.append
             else:
-                result = "### 公車路線列表:\n\n"
-            
-            for route in data[:10]:  # 限制顯示數量避免太長
-                result += f"- **{route.get('nameZh', '無編號')}**: {route.get('departureZh', '無起點')} - {route.get('destinationZh', '無終點')}\n"
-            
-            if len(data) > 10:
-                result += f"\n*共有 {len(data)} 條路線，僅顯示前 10 條。*"
-            
-            return result
+                out = ["### 公車路線列表:\n\n"]
+                # 區域變數綁定 append，省去迴圈內重複的屬性查找
+                append = out.append
+
+            total = len(data)
+            for route in islice(data, 10):  # 限制顯示數量避免太長
+                append(f"- **{route.get('nameZh', '無編號')}**: {route.get('departureZh', '無起點')} - {route.get('destinationZh', '無終點')}\n")
+
+            if total > 10:
+                append(f"\n*共有 {total} 條路線，僅顯示前 10 條。*")
+
+            return "".join(out)
     
-    def _format_bus_stops(self, data: List[Dict[str, Any]], route_name: str) -> str:
+    @staticmethod
+    def _format_bus_stops(data: List[Dict[str, Any]], route_name: str) -> str:
         """格式化公車站點資訊"""
         if not data:
             return f"找不到公車路線 {route_name} 的站點資訊。"
         
         # 預設為不分方向的合併列表
-        result = f"### 公車 {route_name} 的站點資訊\n\n"
-        
-        # 根據方向分組
-        directions = {}
-        for stop in data:
-            direction = stop.get('direction', 0)
-            if direction not in directions:
-                directions[direction] = []
-            directions[direction].append(stop)
-        
+        out = [f"### 公車 {route_name} 的站點資訊\n\n"]
+        # 區域變數綁定 append，省去迴圈內重複的屬性查找
+        append = out.append
+
+        # 根據方向分組：排序後以 groupby 單趟掃描，
+        # 不需逐筆做 dict 查表與列表擴充
+        direction_key = lambda stop: stop.get('direction', 0)
+        groups = [
+            (direction, list(stops))
+            for direction, stops in groupby(sorted(data, key=direction_key), key=direction_key)
+        ]
+
         # 如果有多個方向，就分開顯示
-        if len(directions) > 1:
-            for direction, stops in directions.items():
-                dir_name = "去程" if direction == 0 else "返程"
-                result += f"#### {dir_name}方向\n\n"
-                
+        if len(groups) > 1:
+            for direction, stops in groups:
+                dir_name = _DIR_NAME.get(direction, "返程")
+                append(f"#### {dir_name}方向\n\n")
+
                 for i, stop in enumerate(stops, 1):
-                    result += f"{i}. **{stop.get('stopName', '無名稱')}**\n"
-                
-                result += "\n"
+                    append(f"{i}. **{stop.get('stopName', '無名稱')}**\n")
+
+                append("\n")
         else:
             # 只有一個方向
-            stops = list(directions.values())[0]
+            stops = groups[0][1]
             for i, stop in enumerate(stops, 1):
-                result += f"{i}. **{stop.get('stopName', '無名稱')}**\n"
-        
-        return result
+                append(f"{i}. **{stop.get('stopName', '無名稱')}**\n")
+
+        return "".join(out)
     
-    def _format_bus_estimated_time(self, data: List[Dict[str, Any]], route_name: str, stop_name: Optional[str] = None) -> str:
+    @staticmethod
+    def _format_bus_estimated_time(data: List[Dict[str, Any]], route_name: str, stop_name: Optional[str] = None) -> str:
         """格式化公車預計到站時間"""
         if not data:
-            msg = f"找不到公車路線 {route_name}"
-            if stop_name:
-                msg += f" 在站點 {stop_name}"
-            msg += " 的到站時間資訊。"
-            return msg
+            return "".join((
+                f"找不到公車路線 {route_name}",
+                f" 在站點 {stop_name}" if stop_name else "",
+                " 的到站時間資訊。",
+            ))
         
         if stop_name:
-            result = f"### 公車 {route_name} 在站點 {stop_name} 的到站時間\n\n"
+            out = [f"### 公車 {route_name} 在站點 {stop_name} 的到站時間\n\n"]
+            # 區域變數綁定 append，省去迴圈內重複的屬性查找
+            append = out.append
             filtered_data = [item for item in data if item.get('stopName') == stop_name]
-            
+
             if not filtered_data:
                 return f"找不到公車路線 {route_name} 在站點 {stop_name} 的到站時間資訊。"
-            
+
             for item in filtered_data:
-                direction = "去程" if item.get('direction') == 0 else "返程"
+                direction = _DIR_NAME.get(item.get('direction'), "返程")
                 time = item.get('estimatedTime')
                 status = item.get('status', '無資料')
-                
+
                 if time is not None:
                     minutes = time // 60
-                    result += f"- **{direction}**: {minutes} 分鐘後到站\n"
+                    append(f"- **{direction}**: {minutes} 分鐘後到站\n")
                 else:
-                    result += f"- **{direction}**: {status}\n"
+                    append(f"- **{direction}**: {status}\n")
         else:
-            result = f"### 公車 {route_name} 的到站時間\n\n"
-            
-            # 根據方向和站點分組
-            grouped_data = {}
-            for item in data:
-                direction = item.get('direction', 0)
-                stop_name = item.get('stopName', '未知站點')
-                if direction not in grouped_data:
-                    grouped_data[direction] = []
-                grouped_data[direction].append(item)
-            
-            for direction, items in grouped_data.items():
-                dir_name = "去程" if direction == 0 else "返程"
-                result += f"#### {dir_name}方向\n\n"
-                
+            out = [f"### 公車 {route_name} 的到站時間\n\n"]
+            # 區域變數綁定 append，省去迴圈內重複的屬性查找
+            append = out.append
+
+            # 根據方向分組：排序後以 groupby 單趟掃描
+            direction_key = lambda item: item.get('direction', 0)
+            for direction, items in groupby(sorted(data, key=direction_key), key=direction_key):
+                dir_name = _DIR_NAME.get(direction, "返程")
+                append(f"#### {dir_name}方向\n\n")
+
                 for item in items:
                     stop = item.get('stopName', '未知站點')
                     time = item.get('estimatedTime')
                     status = item.get('status', '無資料')
-                    
+
                     if time is not None:
                         minutes = time // 60
-                        result += f"- **{stop}**: {minutes} 分鐘後到站\n"
+                        append(f"- **{stop}**: {minutes} 分鐘後到站\n")
                     else:
-                        result += f"- **{stop}**: {status}\n"
-                
-                result += "\n"
-        
-        return result
+                        append(f"- **{stop}**: {status}\n")
+
+                append("\n")
+
+        return "".join(out)
     
-    def _format_bus_search_by_stop(self, data: List[Dict[str, Any]], stop_name: str) -> str:
+    @staticmethod
+    def _format_bus_search_by_stop(data: List[Dict[str, Any]], stop_name: str) -> str:
         """格式化依站點查詢的公車資訊"""
         if not data:
             return f"找不到站點 {stop_name} 的公車資訊。"
         
-        result = f"### 站點 {stop_name} 的公車資訊\n\n"
+        out = [f"### 站點 {stop_name} 的公車資訊\n\n"]
         
-        # 依路線分組
-        routes = {}
-        for item in data:
-            route_name = item.get('routeName', '未知路線')
-            if route_name not in routes:
-                routes[route_name] = []
-            routes[route_name].append(item)
+        # 區域變數綁定 append，省去迴圈內重複的屬性查找
         
-        for route_name, items in routes.items():
-            result += f"#### 路線 {route_name}\n\n"
-            
+        append = out.append
+
+        # 依路線分組：排序後以 groupby 單趟掃描
+        route_key = lambda item: item.get('routeName', '未知路線')
+        for route_name, items in groupby(sorted(data, key=route_key), key=route_key):
+            append(f"#### 路線 {route_name}\n\n")
+
             for item in items:
-                direction = "去程" if item.get('direction') == 0 else "返程"
+                direction = _DIR_NAME.get(item.get('direction'), "返程")
                 time = item.get('estimatedTime')
                 status = item.get('status', '無資料')
-                
+
                 if time is not None:
                     minutes = time // 60
-                    result += f"- **{direction}**: {minutes} 分鐘後到站\n"
+                    append(f"- **{direction}**: {minutes} 分鐘後到站\n")
                 else:
-                    result += f"- **{direction}**: {status}\n"
-            
-            result += "\n"
-        
-        return result
+                    append(f"- **{direction}**: {status}\n")
+
+            append("\n")
+
+        return "".join(out)
     
-    def _format_traffic_status(self, data: List[Dict[str, Any]], area: Optional[str] = None, road: Optional[str] = None) -> str:
+    @staticmethod
+    def _format_traffic_status(data: List[Dict[str, Any]], area: Optional[str] = None, road: Optional[str] = None) -> str:
         """格式化交通狀況資訊"""
         if not data:
-            msg = "找不到交通狀況資訊"
-            if area:
-                msg += f"，區域: {area}"
-            if road:
-                msg += f"，道路: {road}"
-            msg += "。"
-            return msg
-        
-        title = "### 交通狀況資訊"
-        if area:
-            title += f" - {area}"
-        if road:
-            title += f" {road}"
-        
-        result = f"{title}\n\n"
-        
-        for item in data[:15]:  # 限制顯示數量
-            road_name = item.get('road', '未知道路')
-            area_name = item.get('area', '未知區域')
-            status = item.get('status', '無資料')
-            speed = item.get('avgSpeed')
-            
-            result += f"- **{area_name} {road_name}**: {status}"
-            if speed is not None:
-                result += f", 平均車速 {speed} km/h"
-            result += "\n"
+            return "".join((
+                "找不到交通狀況資訊",
+                f"，區域: {area}" if area else "",
+                f"，道路: {road}" if road else "",
+                "。",
+            ))
+        
+        out = [
+            "### 交通狀況資訊",
+            f" - {area}" if area else "",
+            f" {road}" if road else "",
+            "\n\n",
+        ]
         
-        if len(data) > 15:
-            result += f"\n*共有 {len(data)} 筆資料，僅顯示前 15 筆。*"
+        # 區域變數綁定 append，省去迴圈內重複的屬性查找
         
-        return result
+        append = out.append
+
+        total = len(data)
+        for item in islice(data, 15):  # 限制顯示數量
+            g = item.get
+            speed = g('avgSpeed')
+            tpl = _TPL_TRAFFIC_ROW if speed is None else _TPL_TRAFFIC_ROW_SPEED
+            append(tpl.format(
+                area=g('area', '未知區域'), road=g('road', '未知道路'),
+                status=g('status', '無資料'), speed=speed,
+            ))
+
+        if total > 15:
+            append(f"\n*共有 {total} 筆資料，僅顯示前 15 筆。*")
+
+        return "".join(out)
     
-    def _format_traffic_construction(self, data: List[Dict[str, Any]], area: Optional[str] = None) -> str:
+    @staticmethod
+    def _format_traffic_construction(data: List[Dict[str, Any]], area: Optional[str] = None) -> str:
         """格式化道路施工資訊"""
         if not data:
-            msg = "找不到道路施工資訊"
-            if area:
-                msg += f"，區域: {area}"
-            msg += "。"
-            return msg
-        
-        title = "### 道路施工資訊"
-        if area:
-            title += f" - {area}"
-        
-        result = f"{title}\n\n"
-        
-        for item in data[:10]:  # 限制顯示數量
-            road = item.get('road', '未知道路')
-            area_name = item.get('area', '未知區域')
-            desc = item.get('description', '無說明')
-            start_date = item.get('startDate', '未知')
-            end_date = item.get('endDate', '未知')
-            status = item.get('status', '無資料')
-            
-            result += f"- **{area_name} {road}**\n"
-            result += f"  - 說明: {desc}\n"
-            result += f"  - 期間: {start_date} 至 {end_date}\n"
-            result += f"  - 狀態: {status}\n\n"
+            return "".join((
+                "找不到道路施工資訊",
+                f"，區域: {area}" if area else "",
+                "。",
+            ))
+        
+        out = [
+            "### 道路施工資訊",
+            f" - {area}" if area else "",
+            "\n\n",
+        ]
         
-        if len(data) > 10:
-            result += f"\n*共有 {len(data)} 筆資料，僅顯示前 10 筆。*"
+        # 區域變數綁定 append，省去迴圈內重複的屬性查找
         
-        return result
+        append = out.append
+
+        total = len(data)
+        for item in islice(data, 10):  # 限制顯示數量
+            g = item.get
+            append(_TPL_CONSTRUCTION_ROW.format(
+                area=g('area', '未知區域'), road=g('road', '未知道路'),
+                desc=g('description', '無說明'), start=g('startDate', '未知'),
+                end=g('endDate', '未知'), status=g('status', '無資料'),
+            ))
+
+        if total > 10:
+            append(f"\n*共有 {total} 筆資料，僅顯示前 10 筆。*")
+
+        return "".join(out)
     
-    def _format_traffic_cameras(self, data: List[Dict[str, Any]], area: Optional[str] = None, road: Optional[str] = None) -> str:
+    @staticmethod
+    def _format_traffic_cameras(data: List[Dict[str, Any]], area: Optional[str] = None, road: Optional[str] = None) -> str:
         """格式化交通攝影機資訊"""
         if not data:
-            msg = "找不到交通攝影機資訊"
-            if area:
-                msg += f"，區域: {area}"
-            if road:
-                msg += f"，道路: {road}"
-            msg += "。"
-            return msg
-        
-        title = "### 交通攝影機資訊"
-        if area:
-            title += f" - {area}"
-        if road:
-            title += f" {road}"
-        
-        result = f"{title}\n\n"
-        
-        for item in data[:10]:  # 限制顯示數量
-            road_name = item.get('road', '未知道路')
-            area_name = item.get('area', '未知區域')
-            direction = item.get('direction', '未知方向')
-            image_url = item.get('imageUrl')
-            
-            result += f"- **{area_name} {road_name}** ({direction})\n"
-            if image_url:
-                result += f"  - 影像連結: {image_url}\n"
-            result += "\n"
+            return "".join((
+                "找不到交通攝影機資訊",
+                f"，區域: {area}" if area else "",
+                f"，道路: {road}" if road else "",
+                "。",
+            ))
+        
+        out = [
+            "### 交通攝影機資訊",
+            f" - {area}" if area else "",
+            f" {road}" if road else "",
+            "\n\n",
+        ]
         
-        if len(data) > 10:
-            result += f"\n*共有 {len(data)} 個攝影機，僅顯示前 10 個。*"
+        # 區域變數綁定 append，省去迴圈內重複的屬性查找
         
-        return result
+        append = out.append
+
+        total = len(data)
+        for item in islice(data, 10):  # 限制顯示數量
+            g = item.get
+            image_url = g('imageUrl')
+            append(_TPL_CAMERA_ROW.format(
+                area=g('area', '未知區域'), road=g('road', '未知道路'),
+                direction=g('direction', '未知方向'),
+                image_line=f"  - 影像連結: {image_url}\n" if image_url else "",
+            ))
+
+        if total > 10:
+            append(f"\n*共有 {total} 個攝影機，僅顯示前 10 個。*")
+
+        return "".join(out)
     
-    def _format_traffic_incidents(self, data: List[Dict[str, Any]], area: Optional[str] = None) -> str:
+    @staticmethod
+    def _format_traffic_incidents(data: List[Dict[str, Any]], area: Optional[str] = None) -> str:
         """格式化交通事件資訊"""
         if not data:
-            msg = "找不到交通事件資訊"
-            if area:
-                msg += f"，區域: {area}"
-            msg += "。"
-            return msg
-        
-        title = "### 交通事件資訊"
-        if area:
-            title += f" - {area}"
-        
-        result = f"{title}\n\n"
-        
-        for item in data[:10]:  # 限制顯示數量
-            road = item.get('road', '未知道路')
-            area_name = item.get('area', '未知區域')
-            incident_type = item.get('type', '未知類型')
-            desc = item.get('description', '無說明')
-            start_time = item.get('startTime', '未知')
-            status = item.get('status', '無資料')
-            
-            result += f"- **{area_name} {road}** ({incident_type})\n"
-            result += f"  - 說明: {desc}\n"
-            result += f"  - 開始時間: {start_time}\n"
-            result += f"  - 狀態: {status}\n\n"
+            return "".join((
+                "找不到交通事件資訊",
+                f"，區域: {area}" if area else "",
+                "。",
+            ))
+        
+        out = [
+            "### 交通事件資訊",
+            f" - {area}" if area else "",
+            "\n\n",
+        ]
         
-        if len(data) > 10:
-            result += f"\n*共有 {len(data)} 筆事件，僅顯示前 10 筆。*"
+        # 區域變數綁定 append，省去迴圈內重複的屬性查找
         
-        return result
+        append = out.append
+
+        total = len(data)
+        for item in islice(data, 10):  # 限制顯示數量
+            g = item.get
+            append(_TPL_INCIDENT_ROW.format(
+                area=g('area', '未知區域'), road=g('road', '未知道路'),
+                type=g('type', '未知類型'), desc=g('description', '無說明'),
+                start=g('startTime', '未知'), status=g('status', '無資料'),
+            ))
+
+        if total > 10:
+            append(f"\n*共有 {total} 筆事件，僅顯示前 10 筆。*")
+
+        return "".join(out)
     
-    def _format_parking_lots(self, data: List[Dict[str, Any]], area: Optional[str] = None, type_name: Optional[str] = None) -> str:
+    @staticmethod
+    def _format_parking_lots(data: List[Dict[str, Any]], area: Optional[str] = None, type_name: Optional[str] = None) -> str:
         """格式化停車場資訊"""
         if not data:
-            msg = "找不到停車場資訊"
-            if area:
-                msg += f"，區域: {area}"
-            if type_name:
-                msg += f"，類型: {type_name}"
-            msg += "。"
-            return msg
-        
-        title = "### 停車場資訊"
-        if area:
-            title += f" - {area}"
-        if type_name:
-            title += f" {type_name}"
-        
-        result = f"{title}\n\n"
-        
-        for item in data[:15]:  # 限制顯示數量
-            name = item.get('name', '未知停車場')
-            area_name = item.get('area', '未知區域')
-            address = item.get('address', '無地址')
-            total = item.get('totalSpaces', '未知')
-            available = item.get('availableSpaces')
-            
-            result += f"- **{name}** ({area_name})\n"
-            result += f"  - 地址: {address}\n"
-            result += f"  - 總車位: {total}\n"
-            if available is not None:
-                result += f"  - 可用車位: {available}\n"
-            result += "\n"
+            return "".join((
+                "找不到停車場資訊",
+                f"，區域: {area}" if area else "",
+                f"，類型: {type_name}" if type_name else "",
+                "。",
+            ))
+        
+        out = [
+            "### 停車場資訊",
+            f" - {area}" if area else "",
+            f" {type_name}" if type_name else "",
+            "\n\n",
+        ]
         
-        if len(data) > 15:
-            result += f"\n*共有 {len(data)} 個停車場，僅顯示前 15 個。*"
+        # 區域變數綁定 append，省去迴圈內重複的屬性查找
         
-        return result
+        append = out.append
+
+        total = len(data)
+        for item in islice(data, 15):  # 限制顯示數量
+            g = item.get
+            available = g('availableSpaces')
+            append(_TPL_PARKING_ROW.format(
+                name=g('name', '未知停車場'), area=g('area', '未知區域'),
+                address=g('address', '無地址'), total=g('totalSpaces', '未知'),
+                available_line=f"  - 可用車位: {available}\n" if available is not None else "",
+            ))
+
+        if total > 15:
+            append(f"\n*共有 {total} 個停車場，僅顯示前 15 個。*")
+
+        return "".join(out)
     
-    def _format_parking_available(self, data: List[Dict[str, Any]], area: Optional[str] = None) -> str:
+    @staticmethod
+    def _format_parking_available(data: List[Dict[str, Any]], area: Optional[str] = None) -> str:
         """格式化有空位的停車場資訊"""
         if not data:
-            msg = "找不到有空位的停車場資訊"
-            if area:
-                msg += f"，區域: {area}"
-            msg += "。"
-            return msg
-        
-        # 如果有指定區域，過濾資料
-        if area:
-            data = [item for item in data if area in item.get('area', '')]
-        
-        title = "### 有空位的停車場"
-        if area:
-            title += f" - {area}"
-        
-        result = f"{title}\n\n"
-        
-        for item in data[:15]:  # 限制顯示數量
-            name = item.get('name', '未知停車場')
-            area_name = item.get('area', '未知區域')
-            address = item.get('address', '無地址')
-            total = item.get('totalSpaces', '未知')
-            available = item.get('availableSpaces', '未知')
-            
-            result += f"- **{name}** ({area_name})\n"
-            result += f"  - 地址: {address}\n"
-            result += f"  - 總車位: {total}\n"
-            result += f"  - 可用車位: {available}\n\n"
-        
-        if len(data) > 15:
-            result += f"\n*共有 {len(data)} 個有空位的停車場，僅顯示前 15 個。*"
-        
-        return result
+            return "".join((
+                "找不到有空位的停車場資訊",
+                f"，區域: {area}" if area else "",
+                "。",
+            ))
+        
+        # 區域過濾已由上游以 AREA 參數完成（get_available_parking_lots
+        # 帶 area 參數查詢），這裡不再重複掃描
+        out = [
+            "### 有空位的停車場",
+            f" - {area}" if area else "",
+            "\n\n",
+        ]
+
+        # 區域變數綁定 append，省去迴圈內重複的屬性查找
+
+        append = out.append
+
+        total = len(data)
+        for item in islice(data, 15):  # 限制顯示數量
+            g = item.get
+            name = g('name', '未知停車場')
+            area_name = g('area', '未知區域')
+            address = g('address', '無地址')
+            total_spaces = g('totalSpaces', '未知')
+            available = g('availableSpaces', '未知')
+
+            append(f"- **{name}** ({area_name})\n")
+            append(f"  - 地址: {address}\n")
+            append(f"  - 總車位: {total_spaces}\n")
+            append(f"  - 可用車位: {available}\n\n")
+
+        if total > 15:
+            append(f"\n*共有 {total} 個有空位的停車場，僅顯示前 15 個。*")
+
+        return "".join(out)
     
-    def _format_parking_fee_rates(self, data: List[Dict[str, Any]]) -> str:
+    @staticmethod
+    def _format_parking_fee_rates(data: List[Dict[str, Any]]) -> str:
         """格式化停車場收費標準"""
         if not data:
             return "找不到停車場收費標準資訊。"
         
-        result = "### 停車場收費標準\n\n"
-        
-        # 根據停車場分組
-        parking_rates = {}
-        for item in data:
-            parking_id = item.get('parkingId')
-            parking_name = item.get('parkingName', '未知停車場')
-            if parking_id not in parking_rates:
-                parking_rates[parking_id] = {
-                    'name': parking_name,
-                    'rates': []
-                }
-            parking_rates[parking_id]['rates'].append(item)
-        
-        # 顯示前10個停車場的收費標準
-        count = 0
-        for parking_id, info in parking_rates.items():
-            if count >= 10:
-                break
-            
-            result += f"#### {info['name']}\n\n"
-            
-            for rate in info['rates']:
-                vehicle_type = rate.get('vehicleType', '未知')
-                hourly_rate = rate.get('hourlyRate')
-                daily_max = rate.get('dailyMaximum')
-                monthly_rate = rate.get('monthlyRate')
-                desc = rate.get('description', '無')
-                
-                result += f"- **{vehicle_type}**:\n"
-                if hourly_rate is not None:
-                    result += f"  - 小時費率: {hourly_rate} 元\n"
-                if daily_max is not None:
-                    result += f"  - 每日上限: {daily_max} 元\n"
-                if monthly_rate is not None:
-                    result += f"  - 月租費率: {monthly_rate} 元\n"
-                if desc != '無':
-                    result += f"  - 說明: {desc}\n"
-                result += "\n"
-            
-            count += 1
+        out = ["### 停車場收費標準\n\n"]
         
-        if len(parking_rates) > 10:
-            result += f"\n*共有 {len(parking_rates)} 個停車場的收費標準，僅顯示前 10 個。*"
+        # 區域變數綁定 append，省去迴圈內重複的屬性查找
         
-        return result
-    
-    def _get_help_message(self) -> str:
-        """獲取幫助信息"""
-        return """### 新北市交通局開放資料查詢助手
+        append = out.append
 
-我可以幫您查詢新北市的交通相關資訊，包括：
+        # 根據停車場分組：排序後以 groupby 單趟掃描，只具體化
+        # 實際顯示的前 10 組費率，其餘組僅計數；顯示順序因此
+        # 改依停車場 ID 排序
+        lot_key = lambda item: str(item.get('parkingId'))
+        groups = groupby(sorted(data, key=lot_key), key=lot_key)
 
-1. **公車資訊**：
-   - 公車路線查詢，例如「307公車的路線」
-   - 站牌查詢，例如「307公車的站牌」
-   - 到站時間查詢，例如「307公車到板橋站的時間」
-   - 站點公車查詢，例如「板橋站有哪些公車」
+        shown = 0
+        for _, group in islice(groups, 10):
+            rates = list(group)
+            shown += 1
+            append(_TPL_FEE_HEADER.format(rates[0].get('parkingName', '未知停車場')))
 
-2. **交通狀況**：
-   - 道路交通狀況，例如「板橋區的交通狀況」
-   - 道路施工資訊，例如「板橋區有哪些道路施工」
-   - 交通攝影機，例如「板橋區的交通攝影機」
-   - 交通事件，例如「板橋區有哪些交通事件」
+            for rate in rates:
+                g = rate.get
+                desc = g('description', '無')
+                # 以 (標籤, 值, 單位) 列表驅動選填欄位的輸出，
+                # 值為 None 的欄位直接跳過，取代逐欄位的 if 判斷
+                fields = (
+                    ("小時費率", g('hourlyRate'), " 元"),
+                    ("每日上限", g('dailyMaximum'), " 元"),
+                    ("月租費率", g('monthlyRate'), " 元"),
+                    ("說明", None if desc == '無' else desc, ""),
+                )
 
-3. **停車場資訊**：
-   - 停車場查詢，例如「板橋區有哪些停車場」
-   - 停車場空位查詢，例如「板橋區有空位的停車場」
-   - 停車場收費標準，例如「板橋區停車場的收費標準」
+                append(f"- **{g('vehicleType', '未知')}**:\n")
+                append("".join(
+                    f"  - {label}: {value}{unit}\n"
+                    for label, value, unit in fields if value is not None
+                ))
+                append("\n")
 
-4. **自行車資訊**：
-   - YouBike 站點查詢，例如「板橋區的 YouBike 站點」
-   - 自行車架查詢，例如「板橋區的自行車架」
-   - 自行車道查詢，例如「板橋區的自行車道」
+        remaining = sum(1 for _ in groups)
+        if remaining:
+            append(f"\n*共有 {shown + remaining} 個停車場的收費標準，僅顯示前 10 個。*")
 
-5. **其他交通服務**：
-   - 計程車服務查詢，例如「新北市的計程車服務」
-   - 拖吊保管場查詢，例如「板橋區的拖吊保管場」
-   - 交通影響評估查詢，例如「新北市的交通影響評估」
-
-請告訴我您想查詢的資訊，我會盡力協助您。
-"""
+        return "".join(out)
+    
+    @staticmethod
+    def _get_help_message() -> str:
+        """獲取幫助信息"""
+        return _HELP_MESSAGE
 
-    def _format_traffic_service_info(self, data: List[Dict[str, Any]], service_type: Optional[str] = None) -> str:
+    @staticmethod
+    def _format_traffic_service_info(data: List[Dict[str, Any]], service_type: Optional[str] = None) -> str:
         """格式化交通服務資訊"""
         if not data:
             return f"找不到{service_type or ''}交通服務資訊。"
         
         if service_type:
-            result = f"### {service_type}資訊\n\n"
+            out = [f"### {service_type}資訊\n\n"]
+            # 區域變數綁定 append，省去迴圈內重複的屬性查找
+            append = out.append
         else:
-            result = "### 交通服務資訊\n\n"
-        
-        # 檢查是否為 Pydantic 模型對象列表
-        if data and hasattr(data[0], 'model_dump'):
-            # 將 Pydantic 模型轉換為字典
-            data = [item.model_dump() for item in data]
-        
-        for service in data[:10]:  # 限制顯示數量避免太長
-            # 根據不同類型的服務處理不同的字段
-            if "taxi_transportation_service" in service:
-                # 計程車服務（舊格式）
-                name = service.get("taxi_transportation_service", service.get("name", "無名稱"))
-                phone = service.get("phone_number", service.get("phone", "無電話"))
-                
-                result += f"- **{name}**\n"
-                if phone:
-                    result += f"  電話: {phone}\n"
-                result += "\n"
-            elif "title" in service:
-                # 拖吊保管場
-                name = service.get("title", service.get("name", "無名稱"))
-                address = service.get("address", "無地址")
-                tel = service.get("tel", "無電話")
-                distance = service.get("distance")
-                
-                result += f"- **{name}**\n"
-                if address:
-                    result += f"  地址: {address}\n"
-                if tel:
-                    result += f"  電話: {tel}\n"
-                if distance:
-                    result += f"  距離: {distance} 公尺\n"
-                result += "\n"
-            elif "url" in service:
-                # 交通影響評估
-                name = service.get("name", "無名稱")
-                category = service.get("category", "無類別")
-                url = service.get("url", "")
-                
-                result += f"- **{name}**"
-                if category:
-                    result += f" ({category})"
-                result += "\n"
-                if url:
-                    result += f"  連結: {url}\n"
-                result += "\n"
-            elif "countycode" in service and "phone" in service:
-                # 計程車服務（新格式）
-                name = service.get("name", "無名稱")
-                phone = service.get("phone", "無電話")
-                
-                result += f"- **{name}**\n"
-                if phone:
-                    result += f"  電話: {phone}\n"
-                result += "\n"
-            elif "station_name" in service or "sna" in service:
-                # YouBike 站點
-                name = service.get("station_name", service.get("sna", "無名稱"))
-                address = service.get("address", service.get("ar", "無地址"))
-                available_bikes = service.get("available_bikes", service.get("sbi", 0))
-                empty_spaces = service.get("empty_spaces", service.get("bemp", 0))
-                total_bikes = service.get("total_bikes", service.get("tot", 0))
-                distance = service.get("distance")
-                
-                result += f"- **{name}**\n"
-                if address:
-                    result += f"  地址: {address}\n"
-                result += f"  可借車輛: {available_bikes} 輛\n"
-                result += f"  可還空位: {empty_spaces} 個\n"
-                result += f"  總車位數: {total_bikes} 個\n"
-                if distance:
-                    result += f"  距離: {distance} 公尺\n"
-                result += "\n"
-            elif "area" in service and "quantity" in service:
-                # 自行車架
-                if "station" in service:
-                    # 捷運站週邊自行車架
-                    station = service.get("station", "無站名")
-                    item = service.get("item", "無項目")
-                    quantity = service.get("quantity", 0)
-                    
-                    result += f"- **{station}**\n"
-                    result += f"  項目: {item}\n"
-                    result += f"  數量: {quantity} 個\n"
-                    result += "\n"
-                else:
-                    # 行政區自行車架
-                    area = service.get("area", "無區域")
-                    item = service.get("item", "無項目")
-                    quantity = service.get("quantity", 0)
-                    
-                    result += f"- **{area}**\n"
-                    result += f"  項目: {item}\n"
-                    result += f"  數量: {quantity} 個\n"
-                    result += "\n"
-            elif "type" in service and "bikeway" in service:
-                # 自行車道
-                district = service.get("district", "無區域")
-                bikeway = service.get("bikeway", "無名稱")
-                route = service.get("route", "無路線")
-                length = service.get("length", 0)
-                
-                result += f"- **{bikeway}**\n"
-                result += f"  行政區: {district}\n"
-                result += f"  路線: {route}\n"
-                result += f"  長度: {length} 公里\n"
-                result += "\n"
-            else:
-                # 一般服務
-                name = service.get("name", "無名稱")
-                category = service.get("category", "無類別")
-                address = service.get("address", "無地址")
-                tel = service.get("tel", "無電話")
-                phone = service.get("phone", "")  # 計程車服務可能有 phone 而非 tel
-                url = service.get("url", "")  # 交通影響評估可能有 url
-                
-                result += f"- **{name}**"
-                if category:
-                    result += f" ({category})"
-                result += "\n"
-                
-                if address:
-                    result += f"  地址: {address}\n"
-                if tel:
-                    result += f"  電話: {tel}\n"
-                if phone and not tel:  # 如果有 phone 但沒有 tel，則顯示 phone
-                    result += f"  電話: {phone}\n"
-                if url:
-                    result += f"  連結: {url}\n"
-                result += "\n"
-        
-        if len(data) > 10:
-            result += f"\n*共有 {len(data)} 筆資料，僅顯示前 10 筆。*"
-        
-        return result
+            out = ["### 交通服務資訊\n\n"]
+            # 區域變數綁定 append，省去迴圈內重複的屬性查找
+            append = out.append
+        
+        # 每筆記錄判斷一次類型後查表分發到對應的格式化函數，
+        # 取代逐筆重跑整條 if/elif 判斷鏈；Pydantic 模型經
+        # _as_mapping 以欄位對照表讀取，不先整份轉成字典
+        total = len(data)
+        for service in islice(data, 10):  # 限制顯示數量避免太長
+            service = _as_mapping(service)
+            _SERVICE_EMITTERS[_service_kind_cached(service)](out, service)
+        
+        if total > 10:
+            append(f"\n*共有 {total} 筆資料，僅顯示前 10 筆。*")
+        
+        return "".join(out)
 
-    def _format_bike_routes(self, data: List[Dict[str, Any]], route_name: Optional[str] = None) -> str:
+    @staticmethod
+    def _format_bike_routes(data: List[Dict[str, Any]], route_name: Optional[str] = None) -> str:
         """格式化自行車路線資訊"""
         if not data:
             return f"找不到自行車路線 {route_name} 的資訊。"
         
-        # 檢查是否為 Pydantic 模型對象列表
-        if data and hasattr(data[0], 'model_dump'):
-            # 將 Pydantic 模型轉換為字典
-            data = [item.model_dump() for item in data]
-        
+        # 逐筆經 _as_mapping 讀取欄位，不先把整份清單轉成字典
         if len(data) == 1:
-            route = data[0]
-            result = f"### 自行車路線 {route.get('name', '無編號')} 資訊\n\n"
-            result += f"- **路線類型**: {route.get('type', '無資料')}\n"
-            result += f"- **縣市代碼**: {route.get('countycode', '無資料')}\n"
-            result += f"- **行政區**: {route.get('district', '無資料')}\n"
-            result += f"- **路線**: {route.get('route', '無資料')}\n"
-            result += f"- **建置年月**: {route.get('year_month', '無資料')}\n"
-            result += f"- **長度(公里)**: {route.get('length', '無資料')}\n"
+            route = _as_mapping(data[0])
+            out = [f"### 自行車路線 {route.get('name', '無編號')} 資訊\n\n"]
+            # 區域變數綁定 append，省去迴圈內重複的屬性查找
+            append = out.append
+            append(f"- **路線類型**: {route.get('type', '無資料')}\n")
+            append(f"- **縣市代碼**: {route.get('countycode', '無資料')}\n")
+            append(f"- **行政區**: {route.get('district', '無資料')}\n")
+            append(f"- **路線**: {route.get('route', '無資料')}\n")
+            append(f"- **建置年月**: {route.get('year_month', '無資料')}\n")
+            append(f"- **長度(公里)**: {route.get('length', '無資料')}\n")
             
-            return result
+            return "".join(out)
         else:
             if route_name:
-                result = f"### 與 {route_name} 相關的自行車路線:\n\n"
+                out = [f"### 與 {route_name} 相關的自行車路線:\n\n"]
+                # 區域變數綁定 append，省去迴圈內重複的屬性查找
+                append = out.append
             else:
-                result = "### 自行車路線列表:\n\n"
+                out = ["### 自行車路線列表:\n\n"]
+                # 區域變數綁定 append，省去迴圈內重複的屬性查找
+                append = out.append
             
-            for route in data[:10]:  # 限制顯示數量避免太長
-                result += f"- **{route.get('name', '無編號')}**: {route.get('district', '無區域')} - {route.get('route', '無路線')}, 長度: {route.get('length', '無資料')}公里\n"
+            total = len(data)
+            for route in islice(data, 10):  # 限制顯示數量避免太長
+                route = _as_mapping(route)
+                append(f"- **{route.get('name', '無編號')}**: {route.get('district', '無區域')} - {route.get('route', '無路線')}, 長度: {route.get('length', '無資料')}公里\n")
             
-            if len(data) > 10:
-                result += f"\n*共有 {len(data)} 條路線，僅顯示前 10 條。*"
+            if total > 10:
+                append(f"\n*共有 {total} 條路線，僅顯示前 10 條。*")
             
-            return result
+            return "".join(out)
 
-    def _format_bike_stops(self, data: List[Dict[str, Any]], route_name: str) -> str:
+    @staticmethod
+    def _format_bike_stops(data: List[Dict[str, Any]], route_name: str) -> str:
         """格式化自行車站點資訊"""
         if not data:
             return f"找不到自行車路線 {route_name} 的站點資訊。"
         
-        # 檢查是否為 Pydantic 模型對象列表
-        if data and hasattr(data[0], 'model_dump'):
-            # 將 Pydantic 模型轉換為字典
-            data = [item.model_dump() for item in data]
-        
-        result = f"### 自行車路線 {route_name} 的站點資訊\n\n"
-        
-        # 分為去程和回程
-        go_stops = [stop for stop in data if stop.get("direction") == 0]
-        back_stops = [stop for stop in data if stop.get("direction") == 1]
+        out = [f"### 自行車路線 {route_name} 的站點資訊\n\n"]
         
-        if go_stops:
-            result += "#### 去程站點\n\n"
-            for i, stop in enumerate(go_stops, 1):
-                result += f"{i}. **{stop.get('name', '無名稱')}**"
-                if stop.get("address"):
-                    result += f" ({stop.get('address')})"
-                result += "\n"
+        # 區域變數綁定 append，省去迴圈內重複的屬性查找
+        append = out.append
         
-        if back_stops:
-            result += "\n#### 回程站點\n\n"
-            for i, stop in enumerate(back_stops, 1):
-                result += f"{i}. **{stop.get('name', '無名稱')}**"
-                if stop.get("address"):
-                    result += f" ({stop.get('address')})"
-                result += "\n"
-        
-        return result
+        # 分為去程和回程（單趟掃描同時分到兩個列表，
+        # 不需走訪 data 兩次）
+        go_stops: List[Dict[str, Any]] = []
+        back_stops: List[Dict[str, Any]] = []
+        for stop in data:
+            stop = _as_mapping(stop)
+            direction = stop.get("direction")
+            if direction == 0:
+                go_stops.append(stop)
+            elif direction == 1:
+                back_stops.append(stop)
+        
+        # 去程與回程共用同一個區塊輸出函數
+        _render_bike_stop_section(append, "#### 去程站點\n\n", go_stops)
+        _render_bike_stop_section(append, "\n#### 回程站點\n\n", back_stops)
+        
+        return "".join(out)
 
-    def _format_bike_estimated_time(self, data: List[Dict[str, Any]], route_name: str, stop_name: Optional[str] = None) -> str:
+    @staticmethod
+    def _format_bike_estimated_time(data: List[Dict[str, Any]], route_name: str, stop_name: Optional[str] = None) -> str:
         """格式化自行車預計到站時間"""
         if not data:
             return f"找不到自行車路線 {route_name} 的到站時間資訊。"
         
-        # 檢查是否為 Pydantic 模型對象列表
-        if data and hasattr(data[0], 'model_dump'):
-            # 將 Pydantic 模型轉換為字典
-            data = [item.model_dump() for item in data]
-        
-        if stop_name:
-            # 過濾特定站點
-            filtered_data = [item for item in data if stop_name in item.get("name", "")]
-            if not filtered_data:
-                return f"找不到自行車路線 {route_name} 在站點 {stop_name} 的到站時間資訊。"
-            data = filtered_data
-        
-        result = f"### 自行車路線 {route_name} 的到站時間\n\n"
-        
-        # 分為去程和回程
-        go_stops = [stop for stop in data if stop.get("direction") == 0]
-        back_stops = [stop for stop in data if stop.get("direction") == 1]
+        # 站點過濾與去程/回程分組合併為單趟掃描，
+        # 不另外建立過濾後的中介列表
+        go_stops: List[Dict[str, Any]] = []
+        back_stops: List[Dict[str, Any]] = []
+        for stop in data:
+            stop = _as_mapping(stop)
+            if stop_name and stop_name not in (stop.get("name") or ""):
+                continue
+            direction = stop.get("direction")
+            if direction == 0:
+                go_stops.append(stop)
+            elif direction == 1:
+                back_stops.append(stop)
+
+        if stop_name and not (go_stops or back_stops):
+            return f"找不到自行車路線 {route_name} 在站點 {stop_name} 的到站時間資訊。"
+
+        out = [f"### 自行車路線 {route_name} 的到站時間\n\n"]
         
-        if go_stops:
-            result += "#### 去程\n\n"
-            for stop in go_stops:
-                name = stop.get("name", "無名稱")
-                eta = stop.get("eta", "無資料")
-                status = stop.get("status", "無狀態")
-                
-                result += f"- **{name}**: "
-                if eta == -1:
-                    result += "尚未發車"
-                elif eta == 0:
-                    result += "進站中"
-                else:
-                    result += f"預計 {eta} 分鐘到站"
-                
-                if status:
-                    result += f" ({status})"
-                result += "\n"
+        # 區域變數綁定 append，省去迴圈內重複的屬性查找
+        append = out.append
         
-        if back_stops:
-            result += "\n#### 回程\n\n"
-            for stop in back_stops:
-                name = stop.get("name", "無名稱")
-                eta = stop.get("eta", "無資料")
-                status = stop.get("status", "無狀態")
-                
-                result += f"- **{name}**: "
-                if eta == -1:
-                    result += "尚未發車"
-                elif eta == 0:
-                    result += "進站中"
-                else:
-                    result += f"預計 {eta} 分鐘到站"
-                
-                if status:
-                    result += f" ({status})"
-                result += "\n"
+        # 去程與回程共用同一個區塊輸出函數
+        _render_bike_eta_section(append, "#### 去程\n\n", go_stops)
+        _render_bike_eta_section(append, "\n#### 回程\n\n", back_stops)
         
-        return result
+        return "".join(out)
 
-    def _format_bike_search_by_stop(self, data: List[Dict[str, Any]], stop_name: str) -> str:
+    @staticmethod
+    def _format_bike_search_by_stop(data: List[Dict[str, Any]], stop_name: str) -> str:
         """格式化站點經過的自行車路線"""
         if not data:
             return f"找不到經過站點 {stop_name} 的自行車路線。"
         
-        # 檢查是否為 Pydantic 模型對象列表
-        if data and hasattr(data[0], 'model_dump'):
-            # 將 Pydantic 模型轉換為字典
-            data = [item.model_dump() for item in data]
+        out = [f"### 經過站點 {stop_name} 的自行車路線\n\n"]
         
-        result = f"### 經過站點 {stop_name} 的自行車路線\n\n"
+        # 區域變數綁定 append，省去迴圈內重複的屬性查找
+        append = out.append
         
         for route in data:
-            route_name = route.get("name", "無編號")
-            direction = "去程" if route.get("direction") == 0 else "回程"
-            eta = route.get("eta", "無資料")
+            g = _as_mapping(route).get
+            route_name = g("name", "無編號")
+            direction = "去程" if g("direction") == 0 else "回程"
+            eta = g("eta", "無資料")
             
-            result += f"- **{route_name}** ({direction}): "
-            if eta == -1:
-                result += "尚未發車"
-            elif eta == 0:
-                result += "進站中"
-            else:
-                result += f"預計 {eta} 分鐘到站"
-            result += "\n"
+            append(f"- **{route_name}** ({direction}): ")
+            append(_ETA_SPECIAL.get(eta) or f"預計 {eta} 分鐘到站")
+            append("\n")
         
-        return result
+        return "".join(out)
 
 
 # 初始化 MCP 服務器的實例
@@ -1188,5 +1644,5 @@ mcp = NTPCOpenDataMCP()
 
 # 確保 MCP 運行時有可識別的 ID
 if __name__ == "__main__":
-    print(f"MCP 服務器 UUID: {SERVER_UUID}", file=sys.stderr)
+    logger.info("MCP 服務器 UUID: %s", SERVER_UUID)
     mcp.run()
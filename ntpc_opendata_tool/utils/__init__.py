@@ -5,5 +5,7 @@
 """
 
 from .logger import setup_logger
+from .cache import TTLCache
+from .geo import GridIndex, haversine_distance
 
-__all__ = ["setup_logger"] 
\ No newline at end of file
+__all__ = ["setup_logger", "TTLCache", "GridIndex", "haversine_distance"]
\ No newline at end of file
@@ -0,0 +1,99 @@
+"""
+快取工具模組
+
+提供帶存活時間（TTL）的記憶體快取，支援過期後的寬限窗口
+（stale-while-revalidate）：過期但仍在寬限期內的資料可先回傳
+給呼叫端，由呼叫端在背景重新整理，避免熱門查詢卡在上游請求。
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """帶存活時間與 LRU 淘汰的記憶體快取
+
+    以 ``time.monotonic`` 記錄寫入時間，讀取時依 TTL 判斷新鮮度；
+    超過容量時淘汰最久未使用的項目。同時維護命中／未命中計數，
+    方便觀察快取效益。
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0, stale_ttl: float = 0.0):
+        """初始化快取
+
+        Args:
+            maxsize: 最大項目數，超過時淘汰最久未使用者
+            ttl: 預設存活秒數
+            stale_ttl: 過期後仍可回傳舊值的寬限秒數（0 表示不啟用）
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Tuple[Any, float, float]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """讀取仍在 TTL 內的快取值，過期或不存在時回傳 default"""
+        entry = self.get_entry(key)
+        if entry is None or not entry[1]:
+            return default
+        return entry[0]
+
+    def get_entry(self, key: Hashable) -> Optional[Tuple[Any, bool]]:
+        """讀取快取值及其新鮮度
+
+        Args:
+            key: 快取鍵
+
+        Returns:
+            (值, 是否仍在 TTL 內) 的元組；不存在或已超出寬限期
+            時回傳 None
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at, stale_until = entry
+        now = time.monotonic()
+        if now < expires_at:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value, True
+        if now < stale_until:
+            # 過期但仍在寬限期：回傳舊值並標記為不新鮮
+            self.hits += 1
+            return value, False
+
+        del self._data[key]
+        self.misses += 1
+        return None
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """寫入快取值
+
+        Args:
+            key: 快取鍵
+            value: 快取值
+            ttl: 此項目的存活秒數，未提供時使用預設 TTL
+        """
+        if ttl is None:
+            ttl = self.ttl
+        now = time.monotonic()
+        self._data[key] = (value, now + ttl, now + ttl + self.stale_ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """清空快取內容與計數"""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get_entry(key) is not None
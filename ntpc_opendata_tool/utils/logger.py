@@ -11,6 +11,12 @@ from dotenv import load_dotenv
 # 載入環境變數
 load_dotenv()
 
+# 模組載入時解析一次預設日誌級別：setup_logger 可能被測試或
+# 嵌入端重複呼叫，不需每次重讀環境變數與 getattr 解析
+_DEFAULT_LEVEL = getattr(
+    logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO
+)
+
 
 def setup_logger(name: Optional[str] = None, level: Optional[str] = None) -> logging.Logger:
     """設置並返回日誌器
@@ -26,11 +32,11 @@ def setup_logger(name: Optional[str] = None, level: Optional[str] = None) -> log
     log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     date_format = "%Y-%m-%d %H:%M:%S"
     
-    # 從環境變數獲取日誌級別，預設為 INFO
+    # 未指定級別時使用模組載入時解析好的預設級別
     if level is None:
-        level = os.getenv("LOG_LEVEL", "INFO").upper()
-    
-    numeric_level = getattr(logging, level, logging.INFO)
+        numeric_level = _DEFAULT_LEVEL
+    else:
+        numeric_level = getattr(logging, level.upper(), logging.INFO)
     
     # 檢查是否已存在該名稱的日誌器
     logger = logging.getLogger(name)
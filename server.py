@@ -1,437 +1,539 @@
+import asyncio
+import functools
+import os
 import re
 import json
 import logging
 import sys
+import time
+from collections import Counter
+
+import uvicorn
 from typing import Dict, Any, List, Optional, Union
 
+import ahocorasick
+
 from mcp.server.fastmcp import FastMCP
 
 # 使用絕對導入
 from ntpc_opendata_tool.utils.logger import setup_logger
-from ntpc_opendata_tool.api.bus import BusAPI
-from ntpc_opendata_tool.api.traffic import TrafficAPI
-from ntpc_opendata_tool.api.parking import ParkingAPI
-from ntpc_opendata_tool.api.bike import BikeAPI
-from ntpc_opendata_tool.api.misc_traffic import MiscTrafficAPI
+from ntpc_opendata_tool.utils.cache import TTLCache
+from ntpc_opendata_tool.api import (
+    bus_api,
+    traffic_api,
+    parking_api,
+    bike_api,
+    misc_traffic_api,
+)
 from ntpc_opendata_tool.api.client import APIError
 
 # 設置日誌
 logger = setup_logger("ntpc_opendata_mcp")
 
-# 初始化 API 客戶端
-bus_api = BusAPI()
-traffic_api = TrafficAPI() 
-parking_api = ParkingAPI()
-bike_api = BikeAPI()
-misc_traffic_api = MiscTrafficAPI()
 
 app = FastMCP()
 
+# 查詢分類用的關鍵字與句型：關鍵字在模組載入時建成
+# Aho–Corasick 自動機，分類時一趟掃描收集所有命中類別；
+# 路線編號與句型另以編譯好的正規表示式補掃
+_BUS_KEYWORDS = [
+    "公車", "巴士", "路線", "幾號", "班次", "路線圖", "路線時刻",
+    "站牌", "站點", "車站", "站", "下車", "上車",
+    "幾分鐘", "到站", "進站", "抵達", "還要多久", "什麼時候到",
+    "發車", "末班", "首班", "時刻表", "幾點",
+    "公車處", "客運", "業者", "哪家",
+    "轉乘", "優惠", "票價", "多少錢", "費用",
+]
+_BIKE_KEYWORDS = [
+    "自行車", "腳踏車", "單車", "bike",
+    "youbike", "ubike", "微笑單車", "共享單車",
+    "自行車道", "腳踏車道", "單車道", "自行車架", "單車架", "停車架",
+    "可以借", "有車", "可借", "可還", "車位", "空位",
+]
+_PARKING_KEYWORDS = [
+    "停車場", "停車", "泊車", "車位", "停車格",
+    "收費", "費率", "計費", "票價", "多少錢",
+    "有位子", "有空位", "滿了", "客滿", "可以停",
+    "婦幼", "身障", "殘障", "機車", "汽車",
+    "颱風", "防災", "臨時", "緊急",
+]
+_TRAFFIC_KEYWORDS = [
+    "塞車", "壅塞", "順暢", "車多", "車流", "車速",
+    "監視器", "攝影機", "即時影像", "路況", "etag",
+    "施工", "封路", "改道", "維修", "工程",
+    "事故", "車禍", "故障", "拋錨", "事件",
+    "限高", "限重", "禁行", "單行",
+]
+_MISC_KEYWORDS = [
+    "計程車", "taxi", "叫車", "車行",
+    "拖吊", "保管場", "被拖", "領車",
+    "交通影響", "評估", "交評", "影響評估",
+]
+
+_BUS_ROUTE_RE = re.compile(r"\d+[a-zA-Z]?(?:路|線|公車|號)|[藍紅綠橘棕]\d+|F\d+", re.IGNORECASE)
+_PARKING_PATTERN_RE = re.compile(r"停車.*在哪|哪裡.*停車|可以停.*車|車.*停在哪")
+_TRAFFIC_PATTERN_RE = re.compile(r"路況.*如何|交通.*狀況|好不好走|塞不塞")
+
+
+def _build_category_automaton() -> "ahocorasick.Automaton":
+    """建立所有分類關鍵字共用的 Aho–Corasick 自動機
+
+    各類別的關鍵字合併進同一個自動機，分類時只需線性掃描
+    查詢字串一次即可取得所有命中的類別；同一關鍵字出現在多個
+    類別時，保留優先順序較高者。
+
+    Returns:
+        已完成建構（make_automaton）的自動機
+    """
+    automaton = ahocorasick.Automaton()
+    categories = [
+        ("bus", _BUS_KEYWORDS),
+        ("traffic", _TRAFFIC_KEYWORDS),
+        ("parking", _PARKING_KEYWORDS),
+        ("bike", _BIKE_KEYWORDS),
+        ("misc_traffic", _MISC_KEYWORDS),
+    ]
+    for priority, (category, keywords) in enumerate(categories):
+        for keyword in keywords:
+            if not automaton.exists(keyword):
+                automaton.add_word(keyword, (priority, category))
+    automaton.make_automaton()
+    return automaton
+
+
+_CATEGORY_AUTOMATON = _build_category_automaton()
+
+# 類別優先順序（與自動機建構順序一致），供單一類別判斷取優先者
+_CATEGORY_PRIORITY = {
+    "bus": 0,
+    "traffic": 1,
+    "parking": 2,
+    "bike": 3,
+    "misc_traffic": 4,
+}
+
+# 幫助與查無結果訊息：皆為固定內容，模組載入時建好，
+# 查詢路徑上只剩字典查找與必要時的區域前綴串接
+_HELP_MESSAGE = """### 新北市交通局開放資料查詢助手
+
+我可以協助您查詢以下交通相關資訊：
+
+🚌 公車資訊
+- 路線查詢：「307公車怎麼走？」
+- 到站時間：「307公車什麼時候到捷運板橋站？」
+- 站點查詢：「捷運板橋站有哪些公車？」
+- 路線類型：「板橋有哪些快速公車？」
+- 轉乘優惠：「哪些公車有轉乘優惠？」
+
+🚲 自行車資訊
+- YouBike站點：「板橋火車站附近有YouBike嗎？」
+- 即時車位：「哪些YouBike站還有車可以借？」
+- 自行車道：「板橋區的自行車道在哪裡？」
+- 停車架：「捷運站附近有自行車架嗎？」
+
+🅿️ 停車資訊
+- 停車場查詢：「板橋車站附近有停車場嗎？」
+- 即時空位：「板橋哪些停車場還有空位？」
+- 收費標準：「板橋停車場要收多少錢？」
+- 特殊車位：「板橋區有哪些婦幼停車位？」
+
+🚦 交通狀況
+- 即時路況：「板橋往台北現在塞車嗎？」
+- 施工資訊：「板橋區最近有哪裡在施工？」
+- 交通事件：「板橋區有發生車禍嗎？」
+- 監視器：「板橋區有哪些交通監視器？」
+
+🚕 其他服務
+- 計程車：「板橋區有哪些合法計程車行？」
+- 拖吊服務：「我的車被拖吊了要去哪裡領？」
+- 交通評估：「新板特區的交通影響評估如何？」
+
+您可以用自然的方式詢問，我會協助您找到需要的資訊。
+需要範例可以輸入「範例」或「使用說明」。"""
+
+_NO_RESULT_MESSAGES = {
+    "bus": "抱歉，找不到相關的公車資訊。您可以：\n"
+           "1. 確認路線號碼是否正確\n"
+           "2. 使用較寬鬆的搜尋條件\n"
+           "3. 改用站點名稱搜尋\n"
+           "4. 查詢附近的其他站點",
+
+    "bike": "抱歉，找不到相關的自行車資訊。您可以：\n"
+            "1. 擴大搜尋範圍\n"
+            "2. 查詢附近的其他站點\n"
+            "3. 使用座標搜尋附近站點",
+
+    "parking": "抱歉，找不到相關的停車場資訊。您可以：\n"
+               "1. 查詢附近的其他停車場\n"
+               "2. 嘗試不同類型的停車場\n"
+               "3. 查詢路邊停車格",
+
+    "traffic": "抱歉，找不到相關的交通狀況資訊。您可以：\n"
+               "1. 查詢主要道路的狀況\n"
+               "2. 使用交通監視器查看即時狀況\n"
+               "3. 查詢特定路段的施工資訊",
+
+    "misc": "抱歉，找不到相關的交通服務資訊。您可以：\n"
+            "1. 使用其他關鍵字搜尋\n"
+            "2. 查詢鄰近區域的服務\n"
+            "3. 聯繫交通局詢問更多資訊",
+}
+
+
+# 端點回應快取：上游資料更新頻率從數十秒（到站時間）到每日
+# （計程車業者、自行車道）不等，各端點依資料性質指定 TTL
+_endpoint_cache = TTLCache(maxsize=256, ttl=60.0)
+
+# 進行中的上游請求對照表：同一鍵同時只發出一次上游請求，
+# 後到的請求直接等待先到者的結果（single-flight）
+_inflight: Dict[Any, "asyncio.Future"] = {}
+
+
+def cached(ttl: Optional[float] = None):
+    """端點回應的 TTL 快取裝飾器
+
+    以 (函數名稱, 參數) 為鍵快取回應；錯誤回應不寫入快取，
+    讓下一個請求重試上游。快取未命中時合併併發的相同請求，
+    同一鍵同時只發出一次上游呼叫，其餘請求共用結果。
+
+    Args:
+        ttl: 此端點的快取存活秒數，未提供時使用預設值
+
+    Returns:
+        包裝後的非同步處理函數
+    """
+    def decorator(func):
+        name = func.__name__
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            # 請求計數在最外層、查快取之前進行，快取命中也算一次
+            _request_counts[name] += 1
+            key = (name, args, tuple(sorted(kwargs.items())))
+            entry = _endpoint_cache.get_entry(key)
+            if entry is not None and entry[1]:
+                return entry[0]
+
+            # 合併併發的相同請求：後到者等待先到者的 Future
+            fut = _inflight.get(key)
+            if fut is not None:
+                return await fut
+
+            fut = asyncio.ensure_future(func(*args, **kwargs))
+            _inflight[key] = fut
+            try:
+                result = await fut
+            finally:
+                _inflight.pop(key, None)
+            if not (isinstance(result, dict) and "error" in result):
+                _endpoint_cache.set(key, result, ttl=ttl)
+            return result
+        return wrapper
+    return decorator
+
+
+# 行程內的端點請求與錯誤計數，由 /metrics 端點輸出
+_request_counts: Counter = Counter()
+_error_counts: Counter = Counter()
+
+# 錯誤日誌限流：上游故障風暴時每秒最多記錄這麼多筆，
+# 其餘只累計計數，避免日誌鎖成為過載時的瓶頸
+_ERROR_LOG_BURST = 10
+_error_log_window = 0
+_error_log_used = 0
+
+
+def _log_error_limited(msg: str, detail: str) -> None:
+    """記錄錯誤訊息，超過每秒上限時僅計數不輸出
+
+    Args:
+        msg: 失敗訊息前綴
+        detail: 錯誤詳情
+    """
+    global _error_log_window, _error_log_used
+    now = int(time.monotonic())
+    if now != _error_log_window:
+        _error_log_window = now
+        _error_log_used = 0
+    if _error_log_used < _ERROR_LOG_BURST:
+        _error_log_used += 1
+        logger.error("%s: %s", msg, detail)
+
+
+def handle_api_errors(msg: str):
+    """端點的 APIError 統一處理裝飾器
+
+    各端點原本重複相同的 try/except 樣板；集中到一個包裝層，
+    APIError 以附帶的訊息記錄後轉為錯誤回應字典。
+
+    Args:
+        msg: 記錄日誌時使用的失敗訊息前綴
+
+    Returns:
+        包裝後的非同步處理函數
+    """
+    def decorator(func):
+        name = func.__name__
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            except APIError as e:
+                _error_counts[name] += 1
+                _log_error_limited(msg, e.message)
+                return {"error": e.message, "status_code": e.status_code}
+        return wrapper
+    return decorator
+
+
 @app.get("/")
 def root():
     return {"message": "新北市交通局開放資料 API"}
 
+@app.get("/metrics")
+def metrics():
+    """輸出行程內的請求、錯誤與快取計數"""
+    return {
+        "requests": dict(_request_counts),
+        "errors": dict(_error_counts),
+        "cache": {
+            "hits": _endpoint_cache.hits,
+            "misses": _endpoint_cache.misses,
+        },
+    }
+
 # 公車相關 API
 @app.get("/bus/routes")
-def get_bus_routes(route_name: Optional[str] = None, page: int = 0, size: int = 100):
-    try:
-        return bus_api.get_routes(route_name, page, size)
-    except APIError as e:
-        logger.error(f"獲取公車路線失敗: {e.message}")
-        return {"error": e.message, "status_code": e.status_code}
+@cached(ttl=1800)
+@handle_api_errors("獲取公車路線失敗")
+async def get_bus_routes(route_name: Optional[str] = None, page: int = 0, size: int = 100):
+    return await asyncio.to_thread(bus_api.get_routes, route_name, page, size)
 
 @app.get("/bus/stops")
-def get_bus_stops(route_name: str):
-    try:
-        return bus_api.get_stops(route_name)
-    except APIError as e:
-        logger.error(f"獲取公車站點失敗: {e.message}")
-        return {"error": e.message, "status_code": e.status_code}
+@cached(ttl=1800)
+@handle_api_errors("獲取公車站點失敗")
+async def get_bus_stops(route_name: str):
+    return await asyncio.to_thread(bus_api.get_stops, route_name)
 
 @app.get("/bus/arrival")
-def get_bus_arrival(route_name: str, stop_name: Optional[str] = None):
-    try:
-        return bus_api.get_estimated_time(route_name, stop_name)
-    except APIError as e:
-        logger.error(f"獲取公車到站時間失敗: {e.message}")
-        return {"error": e.message, "status_code": e.status_code}
+@cached(ttl=15)
+@handle_api_errors("獲取公車到站時間失敗")
+async def get_bus_arrival(route_name: str, stop_name: Optional[str] = None):
+    return await asyncio.to_thread(bus_api.get_estimated_time, route_name, stop_name)
 
 @app.get("/bus/all-stops")
-def get_all_bus_stops():
-    try:
-        return bus_api.get_all_stops()
-    except APIError as e:
-        logger.error(f"獲取所有公車站點失敗: {e.message}")
-        return {"error": e.message, "status_code": e.status_code}
+@cached(ttl=3600)
+@handle_api_errors("獲取所有公車站點失敗")
+async def get_all_bus_stops():
+    return await asyncio.to_thread(bus_api.get_all_stops)
 
 @app.get("/bus/search-by-stop")
-def search_bus_by_stop(stop_name: str):
-    try:
-        return bus_api.search_by_stop(stop_name)
-    except APIError as e:
-        logger.error(f"根據站點搜尋公車失敗: {e.message}")
-        return {"error": e.message, "status_code": e.status_code}
+@cached(ttl=1800)
+@handle_api_errors("根據站點搜尋公車失敗")
+async def search_bus_by_stop(stop_name: str):
+    return await asyncio.to_thread(bus_api.search_by_stop, stop_name)
 
 @app.get("/bus/real-time")
-def get_bus_real_time(route_name: str):
-    try:
-        return bus_api.get_real_time_by_route(route_name)
-    except APIError as e:
-        logger.error(f"獲取公車即時位置失敗: {e.message}")
-        return {"error": e.message, "status_code": e.status_code}
+@cached(ttl=15)
+@handle_api_errors("獲取公車即時位置失敗")
+async def get_bus_real_time(route_name: str):
+    return await asyncio.to_thread(bus_api.get_real_time_by_route, route_name)
 
 # 交通相關 API
 @app.get("/traffic/status")
-def get_traffic_status(area: Optional[str] = None, road: Optional[str] = None):
-    try:
-        return traffic_api.get_traffic_status(area, road)
-    except APIError as e:
-        logger.error(f"獲取交通狀況失敗: {e.message}")
-        return {"error": e.message, "status_code": e.status_code}
+@cached(ttl=60)
+@handle_api_errors("獲取交通狀況失敗")
+async def get_traffic_status(area: Optional[str] = None, road: Optional[str] = None):
+    return await asyncio.to_thread(traffic_api.get_traffic_status, area, road)
 
 @app.get("/traffic/construction")
-def get_construction_info(area: Optional[str] = None, road: Optional[str] = None):
-    try:
-        return traffic_api.get_construction_info(area, road)
-    except APIError as e:
-        logger.error(f"獲取施工資訊失敗: {e.message}")
-        return {"error": e.message, "status_code": e.status_code}
+@cached(ttl=300)
+@handle_api_errors("獲取施工資訊失敗")
+async def get_construction_info(area: Optional[str] = None, road: Optional[str] = None):
+    return await asyncio.to_thread(traffic_api.get_construction_info, area, road)
 
 @app.get("/traffic/cameras")
-def get_traffic_cameras(area: Optional[str] = None):
-    try:
-        return traffic_api.get_traffic_cameras(area)
-    except APIError as e:
-        logger.error(f"獲取交通攝影機失敗: {e.message}")
-        return {"error": e.message, "status_code": e.status_code}
+@cached(ttl=3600)
+@handle_api_errors("獲取交通攝影機失敗")
+async def get_traffic_cameras(area: Optional[str] = None):
+    return await asyncio.to_thread(traffic_api.get_traffic_cameras, area)
 
 @app.get("/traffic/incidents")
-def get_traffic_incidents(area: Optional[str] = None):
-    try:
-        return traffic_api.get_traffic_incidents(area)
-    except APIError as e:
-        logger.error(f"獲取交通事件失敗: {e.message}")
-        return {"error": e.message, "status_code": e.status_code}
+@cached(ttl=60)
+@handle_api_errors("獲取交通事件失敗")
+async def get_traffic_incidents(area: Optional[str] = None):
+    return await asyncio.to_thread(traffic_api.get_traffic_incidents, area)
 
 # 停車場相關 API
 @app.get("/parking/lots")
-def get_parking_lots(area: Optional[str] = None, type_name: Optional[str] = None):
-    try:
-        if area:
-            return parking_api.get_parking_lots_by_area(area)
-        elif type_name:
-            return parking_api.get_parking_lots_by_type(type_name)
-        else:
-            return parking_api.get_all_parking_lots()
-    except APIError as e:
-        logger.error(f"獲取停車場資訊失敗: {e.message}")
-        return {"error": e.message, "status_code": e.status_code}
+@cached(ttl=300)
+@handle_api_errors("獲取停車場資訊失敗")
+async def get_parking_lots(area: Optional[str] = None, type_name: Optional[str] = None):
+    # 類型與區域可同時指定：上游查詢同時帶上 TYPE 與 AREA 參數，
+    # 一次請求即可取得交集，毋須各抓一份再於本地合併
+    if type_name:
+        return await asyncio.to_thread(parking_api.get_parking_lots_by_type, type_name, area)
+    return await asyncio.to_thread(parking_api.get_parking_lots, area)
 
 @app.get("/parking/lot/{parking_id}")
-def get_parking_lot_by_id(parking_id: str):
-    try:
-        return parking_api.get_parking_lot_by_id(parking_id)
-    except APIError as e:
-        logger.error(f"獲取停車場詳細資訊失敗: {e.message}")
-        return {"error": e.message, "status_code": e.status_code}
+@cached(ttl=300)
+@handle_api_errors("獲取停車場詳細資訊失敗")
+async def get_parking_lot_by_id(parking_id: str):
+    return await asyncio.to_thread(parking_api.get_parking_lot_by_id, parking_id)
 
 @app.get("/parking/available")
-def get_available_parking_lots(min_spaces: Optional[int] = None):
-    try:
-        return parking_api.get_available_parking_lots(min_spaces)
-    except APIError as e:
-        logger.error(f"獲取有空位的停車場失敗: {e.message}")
-        return {"error": e.message, "status_code": e.status_code}
+@cached(ttl=15)
+@handle_api_errors("獲取有空位的停車場失敗")
+async def get_available_parking_lots(min_spaces: Optional[int] = None):
+    return await asyncio.to_thread(parking_api.get_available_parking_lots, min_spaces)
 
 @app.get("/parking/nearby")
-def find_nearby_parking(longitude: float, latitude: float, radius: Optional[int] = None):
-    try:
-        return parking_api.find_nearby_parking(longitude, latitude, radius)
-    except APIError as e:
-        logger.error(f"搜尋附近停車場失敗: {e.message}")
-        return {"error": e.message, "status_code": e.status_code}
+@cached(ttl=60)
+@handle_api_errors("搜尋附近停車場失敗")
+async def find_nearby_parking(longitude: float, latitude: float, radius: Optional[int] = None):
+    return await asyncio.to_thread(parking_api.find_nearby_parking, longitude, latitude, radius)
 
 # 自行車相關 API
 @app.get("/bike/youbike")
-def get_youbike_stations(area: Optional[str] = None):
-    try:
-        return bike_api.get_youbike_stations(area)
-    except APIError as e:
-        logger.error(f"獲取 YouBike 站點資訊失敗: {e.message}")
-        return {"error": e.message, "status_code": e.status_code}
+@cached(ttl=60)
+@handle_api_errors("獲取 YouBike 站點資訊失敗")
+async def get_youbike_stations(area: Optional[str] = None):
+    return await asyncio.to_thread(bike_api.get_youbike_stations, area)
 
 @app.get("/bike/available-bikes")
-def get_available_youbikes(min_bikes: int = 1):
-    try:
-        return bike_api.get_available_youbikes(min_bikes)
-    except APIError as e:
-        logger.error(f"獲取有可借車輛的 YouBike 站點失敗: {e.message}")
-        return {"error": e.message, "status_code": e.status_code}
+@cached(ttl=15)
+@handle_api_errors("獲取有可借車輛的 YouBike 站點失敗")
+async def get_available_youbikes(min_bikes: int = 1):
+    return await asyncio.to_thread(bike_api.get_available_youbikes, min_bikes)
 
 @app.get("/bike/nearby-youbike")
-def find_nearby_youbike(latitude: float, longitude: float, radius: int = 500):
-    try:
-        return bike_api.find_nearby_youbike(latitude, longitude, radius)
-    except APIError as e:
-        logger.error(f"搜尋附近 YouBike 站點失敗: {e.message}")
-        return {"error": e.message, "status_code": e.status_code}
+@cached(ttl=60)
+@handle_api_errors("搜尋附近 YouBike 站點失敗")
+async def find_nearby_youbike(latitude: float, longitude: float, radius: int = 500):
+    return await asyncio.to_thread(bike_api.find_nearby_youbike, latitude, longitude, radius)
 
 @app.get("/bike/bike-racks")
-def get_bike_racks(area: Optional[str] = None, near_mrt: bool = False):
-    try:
-        return bike_api.get_bike_racks(area, near_mrt)
-    except APIError as e:
-        logger.error(f"獲取自行車架資訊失敗: {e.message}")
-        return {"error": e.message, "status_code": e.status_code}
+@cached(ttl=3600)
+@handle_api_errors("獲取自行車架資訊失敗")
+async def get_bike_racks(area: Optional[str] = None, near_mrt: bool = False):
+    return await asyncio.to_thread(bike_api.get_bike_racks, area, near_mrt)
 
 @app.get("/bike/bike-lanes")
-def get_bike_lanes():
-    try:
-        return bike_api.get_bike_lanes()
-    except APIError as e:
-        logger.error(f"獲取自行車道建設統計資料失敗: {e.message}")
-        return {"error": e.message, "status_code": e.status_code}
+@cached(ttl=3600)
+@handle_api_errors("獲取自行車道建設統計資料失敗")
+async def get_bike_lanes():
+    return await asyncio.to_thread(bike_api.get_bike_lanes)
 
 # 其他交通服務相關 API
 @app.get("/misc-traffic/taxi-services")
-def get_taxi_services():
-    try:
-        return misc_traffic_api.get_taxi_services()
-    except APIError as e:
-        logger.error(f"獲取計程車客運服務業者資訊失敗: {e.message}")
-        return {"error": e.message, "status_code": e.status_code}
+@cached(ttl=3600)
+@handle_api_errors("獲取計程車客運服務業者資訊失敗")
+async def get_taxi_services():
+    return await asyncio.to_thread(misc_traffic_api.get_taxi_services)
 
 @app.get("/misc-traffic/search-taxi")
-def search_taxi_service(keyword: str):
-    try:
-        return misc_traffic_api.search_taxi_service(keyword)
-    except APIError as e:
-        logger.error(f"關鍵字搜尋計程車服務失敗: {e.message}")
-        return {"error": e.message, "status_code": e.status_code}
+@cached(ttl=3600)
+@handle_api_errors("關鍵字搜尋計程車服務失敗")
+async def search_taxi_service(keyword: str):
+    return await asyncio.to_thread(misc_traffic_api.search_taxi_service, keyword)
 
 @app.get("/misc-traffic/towing-storage")
-def get_towing_storage_info():
-    try:
-        return misc_traffic_api.get_towing_storage_info()
-    except APIError as e:
-        logger.error(f"獲取拖吊保管場資訊失敗: {e.message}")
-        return {"error": e.message, "status_code": e.status_code}
+@cached(ttl=3600)
+@handle_api_errors("獲取拖吊保管場資訊失敗")
+async def get_towing_storage_info():
+    return await asyncio.to_thread(misc_traffic_api.get_towing_storage_info)
 
 @app.get("/misc-traffic/nearest-towing")
-def find_nearest_towing_storage(latitude: float, longitude: float):
-    try:
-        return misc_traffic_api.find_nearest_towing_storage(latitude, longitude)
-    except APIError as e:
-        logger.error(f"搜尋最近的拖吊保管場失敗: {e.message}")
-        return {"error": e.message, "status_code": e.status_code}
+@cached(ttl=300)
+@handle_api_errors("搜尋最近的拖吊保管場失敗")
+async def find_nearest_towing_storage(latitude: float, longitude: float):
+    return await asyncio.to_thread(misc_traffic_api.find_nearest_towing_storage, latitude, longitude)
 
 @app.get("/misc-traffic/impact-assessment")
-def get_traffic_impact_assessment():
-    try:
-        return misc_traffic_api.get_traffic_impact_assessment()
-    except APIError as e:
-        logger.error(f"獲取建築物交通影響評估資訊失敗: {e.message}")
-        return {"error": e.message, "status_code": e.status_code}
-
-def _is_bus_query(self, query: str) -> bool:
-    """判斷是否為公車相關查詢"""
-    bus_keywords = {
-        "路線": ["公車", "巴士", "路線", "幾號", "班次", "路線圖", "路線時刻"],
-        "站點": ["站牌", "站點", "車站", "站", "下車", "上車"],
-        "到站": ["幾分鐘", "到站", "進站", "抵達", "還要多久", "什麼時候到"],
-        "時刻": ["發車", "末班", "首班", "班次", "時刻表", "幾點"],
-        "業者": ["公車處", "客運", "業者", "哪家"],
-        "優惠": ["轉乘", "優惠", "票價", "多少錢", "費用"]
-    }
-    
-    # 檢查是否包含路線號碼
-    route_patterns = [
-        r'\d+[a-zA-Z]?(?:路|線|公車|號)',  # 一般路線，如 307, 307A
-        r'[藍紅綠橘棕]\d+',                # 藍線等，如 藍1
-        r'F\d+',                          # F開頭路線，如 F501
-    ]
-    
-    # 檢查關鍵字
-    for category, keywords in bus_keywords.items():
-        if any(keyword in query for keyword in keywords):
-            return True
-            
-    # 檢查路線號碼
-    for pattern in route_patterns:
-        if re.search(pattern, query):
-            return True
-            
-    return False
-
-def _is_bike_query(self, query: str) -> bool:
-    """判斷是否為自行車相關查詢"""
-    bike_keywords = {
-        "系統": ["youbike", "ubike", "微笑單車", "共享單車"],
-        "設施": ["自行車道", "腳踏車道", "單車道", "自行車架", "單車架", "停車架"],
-        "狀態": ["可以借", "有車", "可借", "可還", "車位", "空位"],
-        "位置": ["在哪", "附近", "哪裡有", "距離", "多遠"]
-    }
-    
-    # 檢查自行車相關詞
-    base_terms = ["自行車", "腳踏車", "單車", "bike"]
-    if any(term in query.lower() for term in base_terms):
-        return True
-        
-    # 檢查關鍵字組合
-    for category, keywords in bike_keywords.items():
-        if any(keyword.lower() in query.lower() for keyword in keywords):
-            return True
-            
-    return False
-
-def _is_parking_query(self, query: str) -> bool:
-    """判斷是否為停車場相關查詢"""
-    parking_keywords = {
-        "一般": ["停車場", "停車", "泊車", "車位", "停車格"],
-        "費用": ["收費", "費率", "計費", "票價", "多少錢"],
-        "狀態": ["有位子", "有空位", "滿了", "客滿", "可以停"],
-        "特殊": ["婦幼", "身障", "殘障", "機車", "汽車"],
-        "緊急": ["颱風", "防災", "臨時", "緊急"]
-    }
-    
-    # 檢查關鍵字組合
-    for category, keywords in parking_keywords.items():
-        if any(keyword in query for keyword in keywords):
-            return True
-            
-    # 檢查問句模式
-    parking_patterns = [
-        r'停車.*在哪',
-        r'哪裡.*停車',
-        r'可以停.*車',
-        r'車.*停在哪'
-    ]
-    
-    for pattern in parking_patterns:
-        if re.search(pattern, query):
-            return True
-            
-    return False
-
-def _is_traffic_query(self, query: str) -> bool:
-    """判斷是否為交通狀況相關查詢"""
-    traffic_keywords = {
-        "路況": ["塞車", "壅塞", "順暢", "車多", "車流", "車速"],
-        "監控": ["監視器", "攝影機", "即時影像", "路況", "etag"],
-        "施工": ["施工", "封路", "改道", "維修", "工程"],
-        "事件": ["事故", "車禍", "故障", "拋錨", "事件"],
-        "限制": ["限高", "限重", "禁行", "單行"]
-    }
-    
-    # 檢查關鍵字組合
-    for category, keywords in traffic_keywords.items():
-        if any(keyword in query for keyword in keywords):
-            return True
-            
-    # 檢查問句模式
-    traffic_patterns = [
-        r'路況.*如何',
-        r'交通.*狀況',
-        r'好不好走',
-        r'塞不塞'
-    ]
-    
-    for pattern in traffic_patterns:
-        if re.search(pattern, query):
-            return True
-            
-    return False
-
-def _is_misc_traffic_query(self, query: str) -> bool:
-    """判斷是否為其他交通服務相關查詢"""
-    misc_keywords = {
-        "計程車": ["計程車", "taxi", "叫車", "車行"],
-        "拖吊": ["拖吊", "保管場", "被拖", "領車"],
-        "評估": ["交通影響", "評估", "交評", "影響評估"]
-    }
-    
-    # 檢查關鍵字組合
-    for category, keywords in misc_keywords.items():
-        if any(keyword.lower() in query.lower() for keyword in keywords):
-            return True
-            
-    return False
-
-def _get_help_message(self) -> str:
-    """獲取幫助信息"""
-    return """### 新北市交通局開放資料查詢助手
+@cached(ttl=3600)
+@handle_api_errors("獲取建築物交通影響評估資訊失敗")
+async def get_traffic_impact_assessment():
+    return await asyncio.to_thread(misc_traffic_api.get_traffic_impact_assessment)
 
-我可以協助您查詢以下交通相關資訊：
+@functools.lru_cache(maxsize=8192)
+def _categories_normalized(query: str) -> frozenset:
+    """單次掃描取得已正規化查詢命中的所有類別
 
-🚌 公車資訊
-- 路線查詢：「307公車怎麼走？」
-- 到站時間：「307公車什麼時候到捷運板橋站？」
-- 站點查詢：「捷運板橋站有哪些公車？」
-- 路線類型：「板橋有哪些快速公車？」
-- 轉乘優惠：「哪些公車有轉乘優惠？」
+    自動機一趟掃描收集全部命中的類別，路線編號與句型的正規
+    表示式各補掃一次；聊天介面的查詢字面高度重複，結果以
+    LRU 快取。
 
-🚲 自行車資訊
-- YouBike站點：「板橋火車站附近有YouBike嗎？」
-- 即時車位：「哪些YouBike站還有車可以借？」
-- 自行車道：「板橋區的自行車道在哪裡？」
-- 停車架：「捷運站附近有自行車架嗎？」
+    Args:
+        query: 已正規化（壓縮空白、轉小寫）的查詢內容
 
-🅿️ 停車資訊
-- 停車場查詢：「板橋車站附近有停車場嗎？」
-- 即時空位：「板橋哪些停車場還有空位？」
-- 收費標準：「板橋停車場要收多少錢？」
-- 特殊車位：「板橋區有哪些婦幼停車位？」
+    Returns:
+        命中類別名稱的 frozenset，可能為空
+    """
+    categories = set()
+    for _, (_, category) in _CATEGORY_AUTOMATON.iter(query):
+        categories.add(category)
+    if _BUS_ROUTE_RE.search(query):
+        categories.add("bus")
+    if _PARKING_PATTERN_RE.search(query):
+        categories.add("parking")
+    if _TRAFFIC_PATTERN_RE.search(query):
+        categories.add("traffic")
+    return frozenset(categories)
 
-🚦 交通狀況
-- 即時路況：「板橋往台北現在塞車嗎？」
-- 施工資訊：「板橋區最近有哪裡在施工？」
-- 交通事件：「板橋區有發生車禍嗎？」
-- 監視器：「板橋區有哪些交通監視器？」
 
-🚕 其他服務
-- 計程車：「板橋區有哪些合法計程車行？」
-- 拖吊服務：「我的車被拖吊了要去哪裡領？」
-- 交通評估：「新板特區的交通影響評估如何？」
+def classify_query(query: str) -> frozenset:
+    """回傳查詢命中的所有類別
 
-您可以用自然的方式詢問，我會協助您找到需要的資訊。
-需要範例可以輸入「範例」或「使用說明」。"""
+    需要同時處理多面向查詢（如「板橋停車場附近的公車站」）的
+    呼叫端可直接檢查回傳集合，文字只會被掃描一次。
+
+    Args:
+        query: 用戶查詢內容
+
+    Returns:
+        命中類別名稱的 frozenset，可能為空
+    """
+    return _categories_normalized(" ".join(query.split()).lower())
+
+
+def _classify_query(query: str) -> Optional[str]:
+    """判斷查詢的單一主要類別
+
+    取命中類別中優先順序最高者；路線編號命中視同公車關鍵字。
 
-def _format_no_result_message(self, query_type: str, area: Optional[str] = None) -> str:
+    Args:
+        query: 用戶查詢內容
+
+    Returns:
+        類別名稱，無法分類時為 None
+    """
+    categories = classify_query(query)
+    if not categories:
+        return None
+    return min(categories, key=_CATEGORY_PRIORITY.__getitem__)
+
+def _get_help_message() -> str:
+    """獲取幫助信息"""
+    return _HELP_MESSAGE
+
+def _format_no_result_message(query_type: str, area: Optional[str] = None) -> str:
     """格式化無結果時的提示訊息"""
-    messages = {
-        "bus": f"抱歉，找不到相關的公車資訊。您可以：\n"
-              f"1. 確認路線號碼是否正確\n"
-              f"2. 使用較寬鬆的搜尋條件\n"
-              f"3. 改用站點名稱搜尋\n"
-              f"4. 查詢附近的其他站點",
-        
-        "bike": f"抱歉，找不到相關的自行車資訊。您可以：\n"
-               f"1. 擴大搜尋範圍\n"
-               f"2. 查詢附近的其他站點\n"
-               f"3. 使用座標搜尋附近站點",
-        
-        "parking": f"抱歉，找不到相關的停車場資訊。您可以：\n"
-                  f"1. 查詢附近的其他停車場\n"
-                  f"2. 嘗試不同類型的停車場\n"
-                  f"3. 查詢路邊停車格",
-        
-        "traffic": f"抱歉，找不到相關的交通狀況資訊。您可以：\n"
-                  f"1. 查詢主要道路的狀況\n"
-                  f"2. 使用交通監視器查看即時狀況\n"
-                  f"3. 查詢特定路段的施工資訊",
-        
-        "misc": f"抱歉，找不到相關的交通服務資訊。您可以：\n"
-               f"1. 使用其他關鍵字搜尋\n"
-               f"2. 查詢鄰近區域的服務\n"
-               f"3. 聯繫交通局詢問更多資訊"
-    }
-    
-    base_message = messages.get(query_type, "抱歉，找不到相關資訊。")
+    base_message = _NO_RESULT_MESSAGES.get(query_type, "抱歉，找不到相關資訊。")
     if area:
-        base_message = f"{area}地區：{base_message}"
-        
+        return f"{area}地區：{base_message}"
     return base_message
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # 以匯入字串啟動，讓 uvicorn 能依 WEB_CONCURRENCY 複製多個
+    # 工作行程；loop 與 http 維持 auto，環境裝有 uvloop/httptools
+    # 時會自動採用
+    uvicorn.run(
+        "server:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        # 逐請求的存取日誌在高 QPS 下成本可觀，預設關閉，
+        # 需要時以 ACCESS_LOG=1 開啟
+        access_log=os.getenv("ACCESS_LOG", "0") == "1",
+    )